@@ -15,6 +15,10 @@ from app.core.database import Base
 # সব মডেল অবশ্যই এখানে ইমপোর্ট করতে হবে যাতে Alembic মেটাডাটা চিনতে পারে
 from app.models.user import User
 from app.models.course import Course  # <--- এই লাইনটি যোগ করুন
+from app.models.email import OutboundEmail
+from app.models.token_revocation import TokenRevocation
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson, LessonProgress
 
 # ভবিষ্যতে আরও মডেল আসলে এখানে যোগ করতে হবে (যেমন: Lesson, Module)
 # ----------------- CUSTOM IMPORTS END -------------------
@@ -29,6 +33,20 @@ if config.config_file_name is not None:
 # টার্গেট মেটাডাটা সেট করা (যাতে Alembic টেবিল চিনতে পারে)
 target_metadata = Base.metadata
 
+# Search objects created by hand in the search migration (tsvector column,
+# GIN/trigram indexes) aren't on the models; keep autogenerate from dropping them
+SEARCH_OBJECTS = {
+    "search_vector",
+    "ix_courses_search_vector",
+    "ix_courses_title_trgm",
+    "ix_users_email_trgm",
+    "ix_users_username_trgm",
+    "ix_users_full_name_trgm",
+}
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in SEARCH_OBJECTS)
+
 # .env থেকে ডাটাবেস URL নেওয়া
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
@@ -40,13 +58,18 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
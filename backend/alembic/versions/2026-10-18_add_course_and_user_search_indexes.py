@@ -0,0 +1,57 @@
+"""add course and user search indexes
+
+Revision ID: 9e1a6c3f5b20
+Revises: 4b8f2d9c1e73
+Create Date: 2026-10-18 09:41:37.205118+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1a6c3f5b20'
+down_revision: Union[str, None] = '4b8f2d9c1e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Full-text and trigram search are Postgres features; other databases
+    # use the in-memory fallback in app.services.search_service.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Title ranks above description (weights A/B) in ts_rank_cd
+    op.execute(
+        """
+        ALTER TABLE courses ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index('ix_courses_search_vector', 'courses', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # Trigram indexes make the existing ILIKE '%...%' substring filters indexable
+    op.execute("CREATE INDEX ix_courses_title_trgm ON courses USING gin (title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_username_trgm ON users USING gin (username gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index('ix_users_full_name_trgm', table_name='users')
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_courses_title_trgm', table_name='courses')
+    op.drop_index('ix_courses_search_vector', table_name='courses')
+    op.drop_column('courses', 'search_vector')
@@ -0,0 +1,33 @@
+"""add keyset pagination indexes
+
+Revision ID: 4b8f2d9c1e73
+Revises: c33567958871
+Create Date: 2026-10-18 09:20:11.482913+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8f2d9c1e73'
+down_revision: Union[str, None] = 'c33567958871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination compares (created_at, id) tuples, so NULL timestamps
+    # would drop rows out of the listing. Backfill them first.
+    op.execute("UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.execute("UPDATE courses SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_courses_published_created_at_id', 'courses', ['is_published', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_courses_published_created_at_id', table_name='courses')
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,4 @@
+from app.core.server import main
+
+# python -m app [--workers N] [--port 8000] ...
+main()
\ No newline at end of file
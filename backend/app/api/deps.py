@@ -1,50 +1,157 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterator, Optional
+from fastapi import Depends, HTTPException, Query, Request, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from pydantic import ValidationError
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, read_engine, recent_writers, replica_session
+from app.core.dataloader import DataLoader
+from app.core.security import decode_token
 from app.models.user import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import Principal, TokenData
+from app.services.token_revocation import token_revocations
+from app.services.user_cache import PRINCIPAL_FIELDS, user_cache
+from app.services.user_loader import user_loader
 
 # টোকেন রিসিভ করার জন্য OAuth2 স্কিম (Token URL টি auth রাউটার এর সাথে মিল থাকতে হবে)
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_PREFIX}/auth/login"
 )
 
-async def get_current_user(
-    token: Annotated[str, Depends(reusable_oauth2)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    credentials_exception = HTTPException(
+def _request_subject(request: Request) -> Optional[str]:
+    """Token subject, for routing only (the signature is checked below)."""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+@asynccontextmanager
+async def _primary_session(request: Request) -> AsyncIterator[AsyncSession]:
+    # One primary session per request: get_db and get_read_db's fallback
+    # (e.g. get_current_user's lookup before a write) share it
+    session = getattr(request.state, "db", None)
+    if session is not None:
+        yield session
+        return
+    async with AsyncSessionLocal() as session:
+        if read_engine is not None:
+            # Remembered on commit for read-your-writes
+            session.info["subject"] = _request_subject(request)
+        request.state.db = session
+        try:
+            yield session
+        finally:
+            request.state.db = None
+
+async def get_db(request: Request):
+    async with _primary_session(request) as session:
+        yield session
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints.
+
+    Uses the replica when one is configured and reachable, except for a
+    caller who wrote within the last DB_READ_YOUR_WRITES_SECONDS. Otherwise
+    it is the request's primary session.
+    """
+    if read_engine is not None and recent_writers.get(_request_subject(request)) is None:
+        async with replica_session() as session:
+            if session is not None:
+                yield session
+                return
+    async with _primary_session(request) as session:
+        yield session
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_token_claims(
+    token: Annotated[str, Depends(reusable_oauth2)],
+) -> dict:
+    # টোকেন ডিকোড করা
+    payload = decode_token(token, "access")
+    if payload is None or token_revocations.is_revoked(payload):
+        raise _credentials_exception()
+    return payload
+
+async def get_current_user(
+    claims: Annotated[dict, Depends(get_token_claims)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> User:
+    credentials_exception = _credentials_exception()
     try:
-        # টোকেন ডিকোড করা
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
-    except (JWTError, ValidationError):
+        token_data = TokenData(email=claims["sub"])
+    except ValidationError:
         raise credentials_exception
 
+    # Cached principal (no DB round trip) if we've seen this subject recently
+    user = await user_cache.get(token_data.email)
+    if user is not None:
+        return user
+
     # ডাটাবেস থেকে ইউজার খুঁজে বের করা (Async)
-    result = await db.execute(select(User).filter(User.email == token_data.email))
+    # Principal columns only; hashed_password is never needed past login
+    result = await db.execute(
+        select(User)
+        .options(load_only(*(getattr(User, name) for name in PRINCIPAL_FIELDS)))
+        .filter(User.email == token_data.email)
+    )
     user = result.scalars().first()
 
     if user is None:
         raise credentials_exception
+    await user_cache.set(token_data.email, user)
+    # Detach from the read session so handlers can db.add() it to their own
+    db.expunge(user)
     return user
 
+async def get_current_principal(
+    claims: Annotated[dict, Depends(get_token_claims)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> Principal:
+    """
+    The caller as described by the access token: id, role and active flag
+    come from the claims, so this needs no cache or DB lookup.
+    """
+    if "uid" in claims and "role" in claims:
+        return Principal(
+            id=claims["uid"],
+            email=claims["sub"],
+            role=claims["role"],
+            is_active=claims.get("active", True),
+            token_version=claims.get("ver", 0),
+        )
+    # Tokens issued before role/active were embedded: look the user up
+    user = await get_current_user(claims, db)
+    return Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        is_active=user.is_active,
+        token_version=user.token_version or 0,
+    )
+
+async def get_current_active_principal(
+    principal: Annotated[Principal, Depends(get_current_principal)],
+) -> Principal:
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -54,11 +161,39 @@ async def get_current_active_user(
 
 
 async def get_current_active_superuser(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_active_principal)],
+) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_user_loader(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> DataLoader:
+    # FastAPI resolves a dependency once per request, so every instructor
+    # lookup in the request goes through this one loader (and its session)
+    return user_loader(db)
+
+async def get_websocket_principal(
+    token: Annotated[str, Query(description="Access token; browsers can't set headers on a WebSocket")],
+) -> Principal:
+    # Claims only: there's no Request (so no read session) on a WebSocket route
+    payload = decode_token(token, "access")
+    if (
+        payload is None
+        or token_revocations.is_revoked(payload)
+        or "uid" not in payload
+        or "role" not in payload
+        or not payload.get("active", True)
+    ):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+    return Principal(
+        id=payload["uid"],
+        email=payload["sub"],
+        role=payload["role"],
+        is_active=True,
+        token_version=payload.get("ver", 0),
+    )
\ No newline at end of file
@@ -1,9 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, courses, admin 
+from app.api.v1.endpoints import auth, users, courses, lessons, tutor, admin 
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
+api_router.include_router(tutor.router, prefix="/courses", tags=["tutor"])
+api_router.include_router(lessons.router, prefix="/lessons", tags=["lessons"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
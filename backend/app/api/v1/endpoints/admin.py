@@ -1,88 +1,248 @@
-from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException, status
-from fastapi.encoders import jsonable_encoder
+from typing import Any, List, Literal, Union
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, update
+from sqlalchemy.orm import load_only
 from uuid import UUID
 
 from app.api import deps
-from app.core.database import get_db
+from app.api.deps import get_db, get_read_db
+from app.core.database import engine, pool_status, read_engine
+from app.core.config import settings
+from app.core.pagination import keyset_page, paginate_keyset
+from app.core.response_cache import response_cache
+from app.core.serialization import (
+    FastJSONResponse,
+    parse_fields,
+    row_content,
+    select_response_columns,
+)
 from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdateAdmin
-from app.core.security import get_password_hash
+from app.schemas.auth import Principal
+from app.schemas.pagination import CursorPage
+from app.schemas.user import (
+    UserBulkUpdate,
+    UserBulkUpdateResult,
+    UserImportJob,
+    UserResponse,
+    UserUpdateAdmin,
+)
+from app.core.hashing import password_hasher
+from app.services.export_service import ExportFormat, export_response
+from app.services.search_service import search_users
+from app.services.token_revocation import bump_token_version, token_revocations
+from app.services.user_cache import user_cache
+from app.services.user_import import user_import_jobs
+from app.services.write_service import update_returning
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/users", response_model=Union[CursorPage[UserResponse], List[UserResponse]])
 async def read_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     search: str | None = None,
-    current_user: User = Depends(deps.get_current_active_superuser),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,email"),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
-    Retrieve all users (Admin only).
+    Retrieve all users (Admin only), newest first.
     Optional: Search by email or username.
+    `fields` returns (and reads from the database) only the listed columns.
+    Pass `pagination=cursor` (or a `cursor` from a previous page) for keyset pagination.
     """
-    query = select(User)
+    # Never load hashed_password (or anything else UserResponse doesn't show)
+    query = select(User).options(load_only(*(getattr(User, name) for name in UserResponse.model_fields)))
+    rank = None
+    field_list = parse_fields(fields, UserResponse)
+    fast = settings.FAST_JSON_RESPONSES or field_list is not None
     
     if search:
-        query = query.filter(
-            or_(
-                User.email.ilike(f"%{search}%"),
-                User.username.ilike(f"%{search}%"),
-                User.full_name.ilike(f"%{search}%")
-            )
-        )
+        query, rank = search_users(db, query, search)
+    if fast:
+        query = select_response_columns(query, User, UserResponse, field_list)
         
+    if pagination == "cursor" or cursor:
+        query = paginate_keyset(query, User.created_at, User.id, cursor, limit, id_type=UUID)
+        result = await db.execute(query)
+        if fast:
+            page = keyset_page(result.all(), limit)
+            page["items"] = row_content(page["items"], field_list)
+            return FastJSONResponse(page)
+        return keyset_page(result.scalars().all(), limit)
+
+    if rank is not None:
+        query = query.order_by(rank.desc())
+    query = query.order_by(User.created_at.desc(), User.id.desc())
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
+    if fast:
+        return FastJSONResponse(row_content(result.all(), field_list))
     users = result.scalars().all()
     return users
 
+@router.get("/users/export")
+async def export_users(
+    format: ExportFormat = "ndjson",
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream every user as NDJSON or CSV (Admin only).
+    """
+    query = select(
+        User.id, User.email, User.username, User.full_name,
+        User.role, User.is_active, User.is_verified, User.created_at,
+    ).order_by(User.created_at, User.id)
+    return export_response(query, format, "users")
+
+@router.post("/users/import", response_model=UserImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_users_csv(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Bulk-create users from a CSV upload (Admin only).
+    Columns: email, username, password, and optionally full_name, role, is_verified.
+    At most USER_IMPORT_MAX_ROWS rows; larger files go through scripts/import_users.py.
+
+    The file is checked and queued, then imported in the background; poll the
+    Location URL for progress. Invalid or duplicate rows are skipped and
+    reported by line number.
+    """
+    job = await user_import_jobs.submit(file.file)
+    response.headers["Location"] = str(request.url_for("get_user_import", job_id=job.id))
+    return job
+
+@router.get("/users/import/{job_id}", response_model=UserImportJob)
+async def get_user_import(
+    job_id: str,
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Status and running counts of a CSV import (Admin only).
+    """
+    job = await user_import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+@router.patch("/users/bulk", response_model=UserBulkUpdateResult)
+async def bulk_update_users(
+    data: UserBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Change role / active / verified flags of many users at once (Admin only).
+    """
+    values = data.model_dump(exclude={"user_ids"}, exclude_none=True)
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nothing to update"
+        )
+
+    revoke = bump_token_version(values)
+
+    # One set-based UPDATE; RETURNING gives the emails to evict from the
+    # user cache and the new token versions to revoke older tokens with
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(data.user_ids))
+        .values(**values)
+        .returning(User.id, User.email, User.token_version)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    if revoke:
+        token_revocations.revoke_users(db, [(row.id, row.token_version) for row in rows])
+    await db.commit()
+    await user_cache.invalidate(*(row.email for row in rows))
+    return {"updated": len(rows)}
+
 @router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user_by_admin(
     user_id: str,
     user_in: UserUpdateAdmin,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Update a user by Admin (Change role, Block user, etc).
     """
-    # 1. ইউজার খোঁজা
     try:
         uuid_obj = UUID(user_id)
-        result = await db.execute(select(User).filter(User.id == uuid_obj))
-        user = result.scalars().first()
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid user ID format"
         )
 
+    # ডাটা আপডেট করা
+    update_data = user_in.model_dump(exclude_unset=True)
+    
+    # যদি পাসওয়ার্ড আপডেট করতে চায়, তাহলে হ্যাশ করতে হবে
+    password = update_data.pop("password", None)
+    if password:
+        update_data["hashed_password"] = await password_hasher.hash(password)
+
+    # Role / activation / password / email changes revoke existing tokens
+    revoke = bump_token_version(update_data)
+
+    # The user cache is keyed by email, so an email change also needs the old one
+    old_email = None
+    if "email" in update_data:
+        old_email = await db.scalar(select(User.email).where(User.id == uuid_obj))
+
+    # Single UPDATE ... RETURNING; no row back means the user doesn't exist
+    if update_data:
+        user = await update_returning(
+            db,
+            User,
+            User.id == uuid_obj,
+            update_data,
+            conflict_detail="Email already registered",
+        )
+    else:
+        user = await db.get(User, uuid_obj)
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    # 2. ডাটা আপডেট করা
-    user_data = jsonable_encoder(user)
-    update_data = user_in.model_dump(exclude_unset=True)
-    
-    # যদি পাসওয়ার্ড আপডেট করতে চায়, তাহলে হ্যাশ করতে হবে
-    if update_data.get("password"):
-        hashed_password = get_password_hash(update_data["password"])
-        del update_data["password"]
-        user.hashed_password = hashed_password
+    if revoke:
+        token_revocations.revoke_users(db, [(user.id, user.token_version)])
+    await db.commit()
+    await user_cache.invalidate(old_email, user.email)
+    if "full_name" in update_data:
+        # Cached course responses embed the instructor's name
+        await response_cache.invalidate("courses")
+    return user
 
-    for field in user_data:
-        if field in update_data:
-            setattr(user, field, update_data[field])
+@router.get("/stats/password-hasher")
+async def read_password_hasher_stats(
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Password hashing pool metrics: queue depth, rejections and hash latency (Admin only).
+    """
+    return password_hasher.stats()
 
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    return user
\ No newline at end of file
+@router.get("/stats/db-pool")
+async def read_db_pool_stats(
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Database connection pool metrics: checked out, overflow and checkout wait time (Admin only).
+    """
+    stats = {"primary": pool_status(engine)}
+    if read_engine is not None:
+        stats["replica"] = pool_status(read_engine)
+    return stats
\ No newline at end of file
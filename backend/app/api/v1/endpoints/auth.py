@@ -1,18 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 from datetime import timedelta
 from jose import jwt, JWTError
 
-from app.core.database import get_db
+from app.api import deps
+from app.api.deps import get_db
 from app.models.user import User
-from app.schemas.auth import Token, UserRegister, PasswordResetRequest, PasswordResetConfirm
+from app.schemas.auth import (
+    LogoutRequest,
+    PasswordResetConfirm,
+    PasswordResetRequest,
+    RefreshRequest,
+    Token,
+    UserRegister,
+)
 from app.schemas.user import UserResponse
 from app.services.auth_service import AuthService
 from app.services.email_service import EmailService
+from app.services.user_cache import user_cache
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash
+from app.core.security import create_access_token, create_token_pair, decode_token
+from app.core.hashing import password_hasher
+from app.services.token_revocation import bump_token_version, token_revocations
+from app.services.write_service import update_returning
 
 router = APIRouter()
 email_service = EmailService()
@@ -34,8 +48,10 @@ async def register(
         expires_delta=timedelta(hours=24)
     )
     
-    # Send verification email in background
-    await email_service.send_verification_email([user.email], verify_token)
+    # Queue verification email (sent by the email dispatcher, not inline).
+    # One commit for the user and the email: no user without its email
+    await email_service.send_verification_email(db, [user.email], verify_token)
+    await db.commit()
     
     return user
 
@@ -57,41 +73,87 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+    # Access token carries role/active/version claims; refresh token renews it
+    return create_token_pair(user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(
+    data: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+    Each refresh token works once; the old one is revoked.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    claims = decode_token(data.refresh_token, "refresh")
+    if claims is None:
+        raise invalid
+
+    # Role / active / version are re-read here, so changes take effect on refresh
+    result = await db.execute(
+        select(User)
+        .options(load_only(User.id, User.email, User.role, User.is_active, User.token_version))
+        .filter(User.id == UUID(claims["uid"]))
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    user = result.scalars().first()
+    if not user or not user.is_active or user.token_version != claims.get("ver"):
+        raise invalid
+
+    # Revoking the jti is also the reuse check: a second use conflicts
+    if not await token_revocations.revoke_token(db, claims):
+        raise invalid
+    await db.commit()
+    return create_token_pair(user)
+
+
+@router.post("/logout", status_code=200)
+async def logout(
+    data: LogoutRequest = Body(default=LogoutRequest()),
+    claims: dict = Depends(deps.get_token_claims),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Revoke the current access token (and the refresh token, if sent).
+    """
+    if claims.get("jti"):
+        await token_revocations.revoke_token(db, claims)
+    if data.refresh_token:
+        refresh_claims = decode_token(data.refresh_token, "refresh")
+        if refresh_claims and refresh_claims.get("uid") == claims.get("uid"):
+            await token_revocations.revoke_token(db, refresh_claims)
+    await db.commit()
+    return {"message": "Logged out"}
 
 
 @router.post("/forgot-password", status_code=200)
 async def forgot_password(
     data: PasswordResetRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Request password reset link.
     """
-    result = await db.execute(select(User).filter(User.email == data.email))
-    user = result.scalars().first()
+    user_exists = await db.scalar(select(User.id).filter(User.email == data.email))
     
     # Return success even if user doesn't exist to prevent email enumeration
-    if not user:
+    if not user_exists:
         return {"message": "If the email exists, a reset link has been sent."}
 
     # Generate reset token (valid for 15 mins)
     reset_token = create_access_token(
-        data={"sub": user.email, "type": "reset"},
+        data={"sub": data.email, "type": "reset"},
         expires_delta=timedelta(minutes=15)
     )
     
-    # Send email in background
-    background_tasks.add_task(
-        email_service.send_password_reset_email, 
-        [data.email], 
-        reset_token
-    )
+    # Queue email (sent by the email dispatcher)
+    await email_service.send_password_reset_email(db, [data.email], reset_token)
+    await db.commit()
     
     return {"message": "If the email exists, a reset link has been sent."}
 
@@ -117,16 +179,18 @@ async def reset_password(
     except JWTError:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
         
-    result = await db.execute(select(User).filter(User.email == email))
-    user = result.scalars().first()
+    # Update password (one UPDATE ... RETURNING; no row back means no such user).
+    # Bumping token_version signs out every existing session.
+    values = {"hashed_password": await password_hasher.hash(data.new_password)}
+    bump_token_version(values)
+    user = await update_returning(db, User, User.email == email, values)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
-    # Update password
-    user.hashed_password = get_password_hash(data.new_password)
-    db.add(user)
+    token_revocations.revoke_users(db, [(user.id, user.token_version)])
     await db.commit()
+    await user_cache.invalidate(user.email)
     
     return {"message": "Password has been reset successfully."}
 
@@ -169,29 +233,30 @@ async def verify_email(
             detail="Invalid or expired verification token"
         )
         
-    # Find user by email
-    result = await db.execute(select(User).filter(User.email == email))
-    user = result.scalars().first()
+    # Update verification status in one statement. Only an unverified user
+    # matches, so no row back means "already verified" or "not found".
+    user = await update_returning(
+        db,
+        User,
+        (User.email == email) & (User.is_verified == False),
+        {"is_verified": True},
+    )
     
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-        
-    # Check if already verified
-    if user.is_verified:
+        is_verified = await db.scalar(select(User.is_verified).filter(User.email == email))
+        if is_verified is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
         return {
             "success": True,
             "message": "Email already verified",
-            "email": user.email
+            "email": email
         }
         
-    # Update verification status
-    user.is_verified = True
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
+    await user_cache.invalidate(user.email)
     
     print(f"✅ Email verified for user: {user.email}")
     
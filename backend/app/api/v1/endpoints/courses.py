@@ -1,33 +1,94 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Literal, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, literal, select
 
 from app.api import deps
-from app.core.database import get_db
+from app.api.deps import get_db, get_read_db
+from app.core.dataloader import DataLoader
+from app.core.config import settings
+from app.core.pagination import keyset_page, paginate_keyset
+from app.core.response_cache import response_cache
+from app.core.serialization import (
+    FastJSONResponse,
+    parse_fields,
+    row_content,
+    select_response_columns,
+)
 from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson, LessonProgress
 from app.models.user import User
-from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse
+from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, CourseSearchResult
+from app.schemas.auth import Principal
+from app.schemas.enrollment import EnrollmentResponse
+from app.schemas.lesson import LessonCreate, LessonProgressResponse, LessonResponse
+from app.schemas.pagination import CursorPage
+from app.services.enrollment_counter import enrollment_counter
+from app.services.export_service import ExportFormat, export_response
+from app.services.progress_buffer import progress_access, progress_buffer
+from app.services.search_service import index_course, search_courses
+from app.services.semantic_search import index_course_vector, semantic_search_courses, similar_courses
+from app.services.user_loader import attach_instructors, with_instructor
+from app.services.write_service import insert_ignoring_conflicts, insert_returning
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CourseResponse])
+async def _fast_items(rows, field_list, users: DataLoader):
+    # `instructor` isn't a column: filled in for the whole page with one query
+    if field_list is None or "instructor" in field_list:
+        rows = await attach_instructors(users, rows)
+    return row_content(rows, field_list)
+
+@router.get("/", response_model=Union[CursorPage[CourseResponse], List[CourseResponse]])
 async def read_courses(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     search: str | None = None,
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated fields to return, e.g. id,title,slug"),
+    users: DataLoader = Depends(deps.get_user_loader),
 ) -> Any:
     """
-    Retrieve all published courses (Public).
+    Retrieve all published courses (Public), newest first.
+    `fields` returns (and reads from the database) only the listed columns.
+    With `search`, offset pages are ordered by relevance instead.
+    Pass `pagination=cursor` (or a `cursor` from a previous page) to get a
+    `{items, next_cursor}` envelope instead of a plain list.
     """
     query = select(Course).filter(Course.is_published == True)
+    rank = None
+    field_list = parse_fields(fields, CourseResponse)
+    fast = settings.FAST_JSON_RESPONSES or field_list is not None
     
     if search:
-        query = query.filter(Course.title.ilike(f"%{search}%"))
+        query, rank = await search_courses(db, query, search)
+    if fast:
+        query = select_response_columns(
+            query, Course, CourseResponse, field_list, keep=("id", "created_at", "instructor_id"),
+        )
+    else:
+        query = query.options(with_instructor())
+
+    if pagination == "cursor" or cursor:
+        # Keyset order can't follow relevance, so cursor pages only filter
+        query = paginate_keyset(query, Course.created_at, Course.id, cursor, limit)
+        result = await db.execute(query)
+        if fast:
+            page = keyset_page(result.all(), limit)
+            page["items"] = await _fast_items(page["items"], field_list, users)
+            return FastJSONResponse(page)
+        return keyset_page(result.scalars().all(), limit)
         
+    if rank is not None:
+        query = query.order_by(rank.desc())
+    query = query.order_by(Course.created_at.desc(), Course.id.desc())
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
+    if fast:
+        return FastJSONResponse(await _fast_items(result.all(), field_list, users))
     return result.scalars().all()
 
 @router.post("/", response_model=CourseResponse)
@@ -35,7 +96,8 @@ async def create_course(
     *,
     db: AsyncSession = Depends(get_db),
     course_in: CourseCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+    users: DataLoader = Depends(deps.get_user_loader),
 ) -> Any:
     """
     Create new course (Instructor/Admin only).
@@ -46,27 +108,212 @@ async def create_course(
             detail="Not enough permissions to create a course"
         )
         
-    # Check if slug exists
-    result = await db.execute(select(Course).filter(Course.slug == course_in.slug))
-    if result.scalars().first():
-        raise HTTPException(
-            status_code=400,
-            detail="Course slug already exists"
+    # Slug uniqueness is enforced by the INSERT itself (ON CONFLICT DO NOTHING)
+    course = await insert_returning(
+        db,
+        Course,
+        {**course_in.model_dump(), "instructor_id": current_user.id},
+        conflict_detail="Course slug already exists",
+    )
+    await db.commit()
+    index_course(course)
+    await index_course_vector(course)
+    await response_cache.invalidate("courses")
+    await attach_instructors(users, [course])
+    return course
+
+# Declared before /{slug} so "export" isn't taken for a slug
+@router.get("/export")
+async def export_courses(
+    format: ExportFormat = "ndjson",
+    current_user: Principal = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream every course, published or not, as NDJSON or CSV (Admin only).
+    """
+    query = select(
+        Course.id, Course.title, Course.slug, Course.description, Course.price,
+        Course.is_published, Course.enrollment_count, Course.instructor_id, Course.created_at, Course.updated_at,
+    ).order_by(Course.created_at, Course.id)
+    return export_response(query, format, "courses")
+
+# Declared before /{slug} so "semantic-search" isn't taken for a slug
+@router.get("/semantic-search", response_model=List[CourseSearchResult])
+async def semantic_search(
+    q: str = Query(..., min_length=2, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    users: DataLoader = Depends(deps.get_user_loader),
+) -> Any:
+    """
+    Published courses ranked by similarity to a free-text query (Public).
+    Matches related wording, not only exact title words.
+    """
+    hits = await semantic_search_courses(db, q, limit)
+    await attach_instructors(users, [course for course, _ in hits])
+    return [{**CourseResponse.model_validate(course).model_dump(), "score": score} for course, score in hits]
+
+@router.get("/{slug}/similar", response_model=List[CourseSearchResult])
+async def read_similar_courses(
+    slug: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    users: DataLoader = Depends(deps.get_user_loader),
+) -> Any:
+    """
+    Published courses most similar to this one (Public).
+    """
+    result = await db.execute(select(Course).filter(Course.slug == slug))
+    course = result.scalars().first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    hits = await similar_courses(db, course, limit)
+    await attach_instructors(users, [course for course, _ in hits])
+    return [{**CourseResponse.model_validate(course).model_dump(), "score": score} for course, score in hits]
+
+@router.post("/{slug}/enroll", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+async def enroll_in_course(
+    slug: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Enroll the current user in a published course.
+    """
+    # INSERT ... SELECT: finding the course and enrolling is one statement
+    stmt = (
+        insert_ignoring_conflicts(db, Enrollment)
+        .from_select(
+            ["user_id", "course_id"],
+            select(literal(current_user.id, Enrollment.user_id.type), Course.id)
+            .where(Course.slug == slug, Course.is_published == True),
+        )
+        .returning(Enrollment)
+    )
+    enrollment = (await db.execute(stmt)).scalars().first()
+    if enrollment is None:
+        # Nothing inserted: either no such course or already enrolled
+        course_id = (await db.execute(
+            select(Course.id).where(Course.slug == slug, Course.is_published == True)
+        )).scalar()
+        if course_id is None:
+            raise HTTPException(status_code=404, detail="Course not found")
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    await db.commit()
+    # Counted in memory, written by the batched flush
+    enrollment_counter.increment(enrollment.course_id)
+    return enrollment
+
+@router.delete("/{slug}/enroll", status_code=status.HTTP_204_NO_CONTENT)
+async def unenroll_from_course(
+    slug: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+):
+    """
+    Leave a course.
+    """
+    stmt = (
+        delete(Enrollment)
+        .where(
+            Enrollment.user_id == current_user.id,
+            Enrollment.course_id == select(Course.id).where(Course.slug == slug).scalar_subquery(),
         )
+        .returning(Enrollment.course_id)
+    )
+    course_id = (await db.execute(stmt)).scalar()
+    if course_id is None:
+        raise HTTPException(status_code=404, detail="Not enrolled in this course")
+    await db.commit()
+    enrollment_counter.increment(course_id, -1)
+    progress_access.delete((current_user.id, course_id))
 
-    course = Course(
-        **course_in.model_dump(),
-        instructor_id=current_user.id
+@router.get("/{slug}/lessons", response_model=List[LessonResponse])
+async def read_lessons(
+    slug: str,
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
+    """
+    Lessons of a published course, in order (Public).
+    """
+    result = await db.execute(
+        select(Lesson)
+        .join(Course, Lesson.course_id == Course.id)
+        .where(Course.slug == slug, Course.is_published == True)
+        .order_by(Lesson.position, Lesson.id)
     )
-    db.add(course)
+    return result.scalars().all()
+
+@router.post("/{slug}/lessons", response_model=LessonResponse, status_code=status.HTTP_201_CREATED)
+async def create_lesson(
+    slug: str,
+    lesson_in: LessonCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Add a lesson to a course (the course's instructor or an admin).
+    """
+    result = await db.execute(select(Course.id, Course.instructor_id).filter(Course.slug == slug))
+    course = result.first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    if current_user.role != "admin" and course.instructor_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to edit this course"
+        )
+    lesson = Lesson(**lesson_in.model_dump(), course_id=course.id)
+    db.add(lesson)
     await db.commit()
-    await db.refresh(course)
-    return course
+    await db.refresh(lesson)
+    await response_cache.invalidate("courses")
+    return lesson
+
+@router.get("/{slug}/progress", response_model=List[LessonProgressResponse])
+async def read_course_progress(
+    slug: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    The current user's position in each lesson of a course they have started.
+    Includes heartbeats this worker hasn't flushed yet.
+    """
+    lesson_ids = (await db.execute(
+        select(Lesson.id)
+        .join(Course, Lesson.course_id == Course.id)
+        .where(Course.slug == slug)
+        .order_by(Lesson.position, Lesson.id)
+    )).scalars().all()
+    stored = {
+        row.lesson_id: row
+        for row in (await db.execute(
+            select(LessonProgress).where(
+                LessonProgress.user_id == current_user.id,
+                LessonProgress.lesson_id.in_(lesson_ids),
+            )
+        )).scalars()
+    } if lesson_ids else {}
+
+    progress = []
+    for lesson_id in lesson_ids:
+        row = stored.get(lesson_id)
+        buffered = progress_buffer.get(current_user.id, lesson_id)
+        if buffered is not None:
+            progress.append({
+                **buffered,
+                "completed": buffered["completed"] or (row is not None and row.completed),
+            })
+        elif row is not None:
+            progress.append(row)
+    return progress
 
 @router.get("/{slug}", response_model=CourseResponse)
 async def read_course(
     slug: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    users: DataLoader = Depends(deps.get_user_loader),
 ) -> Any:
     """
     Get course by slug (Public).
@@ -75,4 +322,5 @@ async def read_course(
     course = result.scalars().first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
+    await attach_instructors(users, [course])
     return course
\ No newline at end of file
@@ -0,0 +1,32 @@
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.deps import get_read_db
+from app.schemas.auth import Principal
+from app.schemas.lesson import ProgressHeartbeat
+from app.services.progress_buffer import can_record_progress, lesson_course_id, progress_buffer
+
+router = APIRouter()
+
+@router.post("/{lesson_id}/progress", status_code=status.HTTP_202_ACCEPTED)
+async def record_progress(
+    lesson_id: int,
+    heartbeat: ProgressHeartbeat,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Video player heartbeat: the current position in a lesson.
+    Buffered in memory and written in batches, so this never waits on a write.
+    """
+    # Cached lookups; only the first heartbeat for a lesson (and for a
+    # student in its course) touches the database
+    course_id = await lesson_course_id(db, lesson_id)
+    if course_id is None:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    if not await can_record_progress(db, current_user, course_id):
+        raise HTTPException(status_code=403, detail="Not enrolled in this course")
+    progress_buffer.record(current_user.id, lesson_id, heartbeat.position_seconds, heartbeat.completed)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
\ No newline at end of file
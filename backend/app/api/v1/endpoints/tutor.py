@@ -0,0 +1,138 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.api import deps
+from app.core.admission import AdmissionRejected
+from app.core.config import settings
+from app.api.deps import get_read_db
+from app.core.database import AsyncReadSessionLocal, AsyncSessionLocal
+from app.schemas.auth import Principal
+from app.schemas.tutor import TutorQuestion
+from app.services.tutor import CourseContext, Generation, TutorError, course_context, start_generation
+
+router = APIRouter()
+
+BUSY_DETAIL = "The tutor is busy, please try again shortly"
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+async def _sse_events(generation: Generation):
+    try:
+        async for text in generation.stream():
+            yield _sse("token", {"text": text})
+    except TutorError as e:
+        yield _sse("error", {"detail": e.detail})
+        return
+    yield _sse("done", generation.stats())
+
+@router.post("/{slug}/tutor")
+async def ask_tutor(
+    slug: str,
+    body: TutorQuestion,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Ask the course's AI tutor a question. The answer streams back as
+    Server-Sent Events: `token` events with `{"text": ...}`, then one
+    `done` event with `{tokens, ttft_ms, tokens_per_sec}` (or `error`).
+    503 with Retry-After when this worker's generation slots are taken.
+    """
+    context = await course_context(db, slug)
+    if context is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    # Don't keep a pooled connection checked out for the whole answer
+    await db.close()
+
+    try:
+        generation = await start_generation(context, body.question)
+    except AdmissionRejected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=BUSY_DETAIL,
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+    return StreamingResponse(
+        _sse_events(generation),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Frees the slot even if the client left before the stream started
+        background=BackgroundTask(generation.release),
+    )
+
+async def _answer(send: Callable[[dict], Awaitable[None]], context: CourseContext, question: str):
+    try:
+        generation = await start_generation(context, question)
+    except AdmissionRejected:
+        await send({"type": "error", "detail": BUSY_DETAIL})
+        return
+    try:
+        async for text in generation.stream():
+            await send({"type": "token", "text": text})
+    except TutorError as e:
+        await send({"type": "error", "detail": e.detail})
+        return
+    finally:
+        generation.release()
+    await send({"type": "done", **generation.stats()})
+
+@router.websocket("/{slug}/tutor/ws")
+async def tutor_websocket(
+    websocket: WebSocket,
+    slug: str,
+    current_user: Principal = Depends(deps.get_websocket_principal),
+):
+    """
+    The tutor over a WebSocket, for several questions on one connection.
+    Send `{"question": ...}` and receive `{"type": "token", "text": ...}`
+    messages, then `{"type": "done", ...}` or `{"type": "error", ...}`.
+    `{"type": "cancel"}` stops the current answer; disconnecting stops it too.
+    """
+    async with (AsyncReadSessionLocal or AsyncSessionLocal)() as db:
+        context = await course_context(db, slug)
+    if context is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Course not found")
+        return
+    await websocket.accept()
+
+    # Answers and replies from this loop share the socket
+    lock = asyncio.Lock()
+
+    async def send(message: dict):
+        async with lock:
+            await websocket.send_bytes(orjson.dumps(message))
+
+    answering: Optional[asyncio.Task] = None
+    try:
+        while True:
+            message = orjson.loads(await websocket.receive_text())
+            busy = answering is not None and not answering.done()
+            if isinstance(message, dict) and message.get("type") == "cancel":
+                if busy:
+                    answering.cancel()
+                    await asyncio.gather(answering, return_exceptions=True)
+                    await send({"type": "cancelled"})
+                continue
+            if busy:
+                await send({"type": "error", "detail": "Wait for the current answer or cancel it first"})
+                continue
+            try:
+                question = TutorQuestion.model_validate(message)
+            except ValidationError:
+                await send({"type": "error", "detail": "Expected {\"question\": \"...\"}"})
+                continue
+            answering = asyncio.create_task(_answer(send, context, question.question))
+    except (WebSocketDisconnect, orjson.JSONDecodeError):
+        pass
+    finally:
+        if answering is not None and not answering.done():
+            answering.cancel()
+            await asyncio.gather(answering, return_exceptions=True)
\ No newline at end of file
@@ -1,15 +1,49 @@
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.api import deps
-from app.core.database import get_db
+from app.core.config import settings
+from app.api.deps import get_db, get_read_db
+from app.core.response_cache import response_cache
+from app.models.enrollment import Enrollment
 from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdate
+from app.schemas.auth import Principal
+from app.schemas.enrollment import EnrollmentWithCourse
+from app.schemas.user import UserResponse, UserSummary, UserUpdate
+from app.services.token_revocation import bump_token_version, token_revocations
+from app.services.user_cache import user_cache
+from app.services.user_loader import SUMMARY_FIELDS, with_instructor
+from app.services.write_service import update_returning
 
 router = APIRouter()
 
+@router.get("/batch", response_model=List[UserSummary])
+async def read_users_batch(
+    ids: str = Query(..., description="Comma-separated user ids"),
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
+    """
+    Public profiles (id, username, full name) of several users in one call,
+    e.g. every instructor on a course listing (Public). Returned in the
+    order asked for; unknown ids are left out.
+    """
+    try:
+        user_ids = list(dict.fromkeys(UUID(value.strip()) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID format")
+    if not user_ids or len(user_ids) > settings.USERS_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Pass between 1 and {settings.USERS_BATCH_MAX_IDS} ids",
+        )
+    result = await db.execute(select(*SUMMARY_FIELDS).where(User.id.in_(user_ids)))
+    found = {row.id: row for row in result}
+    return [found[user_id] for user_id in user_ids if user_id in found]
+
 @router.get("/me", response_model=UserResponse)
 async def read_user_me(
     current_user: User = Depends(deps.get_current_active_user),
@@ -30,16 +64,58 @@ async def update_user_me(
     Update own user.
     """
     # ইউজারের পাঠানো ডাটা দিয়ে ফিল্ডগুলো আপডেট করা
+    update_data = {}
     if user_in.full_name is not None:
-        current_user.full_name = user_in.full_name
+        update_data["full_name"] = user_in.full_name
     if user_in.email is not None:
-        # ইমেইল ইউনিক কিনা চেক করা উচিত (যদি ইমেইল চেঞ্জ এলাউ করেন)
-        # সিম্পলিসিটির জন্য আপাতত সরাসরি বসাচ্ছি, তবে প্রোডাকশনে চেক করা ভালো
-        current_user.email = user_in.email
+        # Uniqueness is enforced by the unique index on users.email
+        update_data["email"] = user_in.email
     
     # পাসওয়ার্ড আপডেট লজিক এখানে আলাদাভাবে হ্যান্ডেল করা ভালো, তাই বাদ রাখা হলো
-    
-    db.add(current_user)
+    if not update_data:
+        return current_user
+    # An email change revokes tokens issued for the old address
+    revoke = bump_token_version(update_data)
+    renamed = update_data.get("full_name", current_user.full_name) != current_user.full_name
+
+    # Single UPDATE ... RETURNING instead of commit + refresh
+    user = await update_returning(
+        db,
+        User,
+        User.id == current_user.id,
+        update_data,
+        conflict_detail="Email already registered",
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if revoke:
+        token_revocations.revoke_users(db, [(user.id, user.token_version)])
     await db.commit()
-    await db.refresh(current_user)
-    return current_user
\ No newline at end of file
+    await user_cache.invalidate(current_user.email, user.email)
+    if renamed:
+        # Cached course responses embed the owner's name, and any role
+        # (admins too) can own courses
+        await response_cache.invalidate("courses")
+    return user
+
+@router.get("/me/enrollments", response_model=List[EnrollmentWithCourse])
+async def read_my_enrollments(
+    skip: int = 0,
+    limit: int = Query(100, le=500),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Courses the current user is enrolled in, most recent first.
+    """
+    # Course comes in the same query (JOIN), not one SELECT per enrollment,
+    # and all the instructors in one more
+    result = await db.execute(
+        select(Enrollment)
+        .options(joinedload(Enrollment.course).options(with_instructor()))
+        .where(Enrollment.user_id == current_user.id)
+        .order_by(Enrollment.enrolled_at.desc(), Enrollment.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
\ No newline at end of file
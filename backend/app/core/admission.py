@@ -0,0 +1,163 @@
+import asyncio
+import json
+import re
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from app.core.metrics import Counter, Gauge, Histogram, registry
+
+# Admission control: every request takes a slot from its route's concurrency
+# budget before it reaches the app. A request that finds its budget full
+# waits in a short bounded queue. If the queue is full, or the wait exceeds
+# the queue timeout, it gets a 503 with Retry-After right away, so a slow
+# database or a login storm shows up as fast rejections on one budget
+# instead of unbounded latency everywhere.
+
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+admission_rejected = registry.register(Counter(
+    "admission_rejected_total", "Requests shed by admission control", ["budget", "reason"],
+))
+admission_queue_wait = registry.register(Histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot", ["budget"],
+    buckets=QUEUE_WAIT_BUCKETS,
+))
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, budget: str, reason: str):
+        super().__init__(f"{budget}: {reason}")
+        self.budget = budget
+        self.reason = reason
+
+
+class ConcurrencyBudget:
+    """
+    At most `limit` requests in flight, up to `max_queue` more waiting for at
+    most `queue_timeout` seconds each.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created on first use, inside the worker's event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+        return self._slots
+
+    async def acquire(self):
+        slots = self._get_slots()
+        if not slots.locked():
+            await slots.acquire()  # free slot: returns without suspending
+            self.in_flight += 1
+            return
+
+        if self.waiting >= self.max_queue:
+            admission_rejected.inc(self.name, "queue_full")
+            raise AdmissionRejected(self.name, "queue_full")
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            admission_rejected.inc(self.name, "timeout")
+            raise AdmissionRejected(self.name, "timeout")
+        finally:
+            self.waiting -= 1
+        admission_queue_wait.observe(time.perf_counter() - queued_at, self.name)
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_queue,
+        }
+
+
+# Budgets of the running middleware, for the gauges below
+active_budgets: Dict[str, ConcurrencyBudget] = {}
+
+
+def _budget_samples(field: str):
+    return lambda: [({"budget": name}, budget.stats()[field]) for name, budget in active_budgets.items()]
+
+
+for _field, _help in (
+    ("in_flight", "Requests currently holding an admission slot"),
+    ("queue_depth", "Requests waiting for an admission slot"),
+    ("limit", "Concurrency limit of the admission budget"),
+):
+    registry.register(Gauge(f"admission_{_field}", _help, _budget_samples(_field)))
+
+
+class AdmissionControlMiddleware:
+    """
+    Routes each HTTP request to the first budget whose pattern fully matches
+    its path, else to `default`. `exempt` paths (probes, metrics) skip
+    admission entirely so they keep answering under overload.
+    """
+
+    def __init__(
+        self,
+        app,
+        budgets: Iterable[Tuple[str, ConcurrencyBudget]],
+        default: ConcurrencyBudget,
+        exempt: Sequence[str] = (),
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.budgets = [(re.compile(pattern), budget) for pattern, budget in budgets]
+        self.default = default
+        self.exempt = [re.compile(pattern) for pattern in exempt]
+        self.rejection_headers = [
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(retry_after).encode()),
+        ]
+        for budget in [b for _, b in self.budgets] + [default]:
+            active_budgets[budget.name] = budget
+
+    def _budget(self, path: str) -> Optional[ConcurrencyBudget]:
+        for pattern in self.exempt:
+            if pattern.fullmatch(path):
+                return None
+        for pattern, budget in self.budgets:
+            if pattern.fullmatch(path):
+                return budget
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self._budget(scope["path"])
+        if budget is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await budget.acquire()
+        except AdmissionRejected as e:
+            body = json.dumps({"detail": "Server is busy, please try again shortly", "budget": e.budget}).encode()
+            headers = self.rejection_headers + [(b"content-length", str(len(body)).encode())]
+            await send({"type": "http.response.start", "status": 503, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        # The slot is held until the response (including a streamed body) is done
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.release()
@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    In-process LRU cache with a per-entry time-to-live.
+
+    Not thread-safe; it's meant to be used from a single event loop.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Any):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SharedCache(Protocol):
+    """The subset of the Redis API the shared cache tier relies on."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> Any: ...
+
+    async def delete(self, *keys: str) -> Any: ...
+
+
+class InMemorySharedCache:
+    """Local stand-in for Redis, for tests and single-process setups."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[Optional[float], bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (expires_at, value)
+        return True
+
+    async def delete(self, *keys: str):
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+
+def create_shared_cache(url: Optional[str]) -> Optional[SharedCache]:
+    """
+    Build the shared cache tier from a URL.
+    `memory://` gives the in-process fake; anything else is handed to redis-py.
+    """
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemorySharedCache()
+    try:
+        from redis import asyncio as aioredis
+    except ImportError as e:
+        raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+    return aioredis.from_url(url)
+
+
+# Shared tier used by the caches that need to agree across workers (None = local only)
+shared_cache = create_shared_cache(settings.REDIS_URL)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # App
@@ -8,13 +8,140 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     API_V1_PREFIX: str = "/api/v1"
     
+    # Server (`python -m app`)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1  # 0 = one per CPU
+    SERVER_LOOP: str = "auto"  # auto picks uvloop when installed
+    SERVER_HTTP: str = "auto"  # auto picks httptools when installed
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_BACKLOG: int = 2048
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_PRELOAD: bool = True
+    SERVER_ACCESS_LOG: bool = False
+    
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg per-connection statement cache
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # SQLAlchemy asyncpg dialect cache
+
+    # Optional read replica for GET endpoints
+    DATABASE_READ_URL: Optional[str] = None
+    DB_READ_RETRY_SECONDS: int = 30  # how long a failed replica is skipped
+    DB_READ_YOUR_WRITES_SECONDS: int = 5  # reads go to primary this long after a write
     
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0  # how often each process reloads revocations
+
+    # Password hashing (bcrypt runs in a worker pool, off the event loop)
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+    PASSWORD_HASH_BULK_WORKERS: int = 2  # hash_many() jobs in flight; keep below WORKERS so logins get one
+    # Scheme/cost for new hashes; weaker stored hashes are upgraded at login.
+    # Pick the cost with scripts/calibrate_password_hash.py
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" or "argon2" (needs argon2-cffi)
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 2
+
+    # Caching
+    # Invalidations only reach other worker processes through REDIS_URL.
+    # Without it, `python -m app` with SERVER_WORKERS != 1 turns the user and
+    # response caches off; other multi-process launchers must set it (or
+    # disable both caches) themselves.
+    REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0, or memory:// for a local fake
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_AGE: int = 30  # Cache-Control max-age sent to clients
+    
+    # Serve list endpoints as Core rows encoded by orjson, skipping
+    # per-row response_model validation
+    FAST_JSON_RESPONSES: bool = False
+    
+    # Semantic search (hashed TF-IDF embeddings, memory-mapped and shared by workers)
+    SEMANTIC_INDEX_DIR: str = "data/semantic_index"
+    SEMANTIC_INDEX_DIM: int = 256
+    SEMANTIC_INDEX_BUILD_ON_STARTUP: bool = True  # in the background if missing; searches get 503 until it's done
+    SEMANTIC_SEARCH_OVERSAMPLE: int = 3  # candidates fetched per result (unpublished ones are dropped)
+    SEMANTIC_SEARCH_MIN_SCORE: float = 0.05
+    
+    # Enrollment counters (Course.enrollment_count changes are batched in memory)
+    ENROLLMENT_COUNT_FLUSH_SECONDS: float = 1.0
+    ENROLLMENT_COUNT_MAX_PENDING: int = 1000  # flush early once this many courses are waiting
+    ENROLLMENT_COUNT_CACHE_SECONDS: float = 10.0  # at most one "courses" response cache invalidation per this many seconds
+    
+    # AI tutor (answers about a course, streamed over SSE / WebSocket)
+    TUTOR_BACKEND: str = "stub"  # "stub" (deterministic, offline), "openai" (any OpenAI-compatible server) or "package.module:factory"
+    TUTOR_API_BASE: str = "http://localhost:11434/v1"
+    TUTOR_API_KEY: Optional[str] = None
+    TUTOR_MODEL: str = "llama3.1"
+    TUTOR_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    TUTOR_MAX_TOKENS: int = 512
+    TUTOR_MAX_CONCURRENT: int = 4  # generations per worker
+    TUTOR_MAX_QUEUE: int = 16  # waiting for a generation slot; beyond that -> 503
+    TUTOR_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    TUTOR_STREAM_BUFFER_TOKENS: int = 64  # generated but not yet sent, per stream
+    TUTOR_SLOW_CLIENT_TIMEOUT_SECONDS: float = 10.0  # buffer full this long -> generation aborted
+    TUTOR_CONTEXT_LESSONS: int = 50  # lesson titles included in the prompt
+    TUTOR_STUB_TOKEN_DELAY: float = 0.02  # seconds per token from the stub backend
+    
+    # Lesson progress heartbeats (latest position per user+lesson, flushed as multi-row upserts)
+    PROGRESS_FLUSH_SECONDS: float = 5.0
+    PROGRESS_FLUSH_BATCH_SIZE: int = 1000  # rows per INSERT ... ON CONFLICT statement
+    PROGRESS_MAX_PENDING: int = 50000  # flush early once this many (user, lesson) pairs are buffered
+    
+    # Bulk export (rows fetched per server-side cursor batch)
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Bulk user import (CSV rows validated / hashed / inserted per chunk)
+    USER_IMPORT_CHUNK_SIZE: int = 1000
+    USER_IMPORT_MAX_ERRORS: int = 1000  # per-row errors reported back; the rest are only counted
+    USER_IMPORT_MAX_ROWS: int = 50000  # per upload (bigger files: scripts/import_users.py)
+    USER_IMPORT_JOB_TTL_SECONDS: int = 86400  # how long a finished import's status can be polled
+    
+    # GET /users/batch
+    USERS_BATCH_MAX_IDS: int = 100
+    
+    # Admission control (per-process concurrency budgets; over budget -> 503 + Retry-After)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 8  # login/register/refresh (bcrypt)
+    ADMISSION_AUTH_QUEUE: int = 16
+    ADMISSION_COURSES_CONCURRENCY: int = 200  # course catalogue
+    ADMISSION_COURSES_QUEUE: int = 400
+    ADMISSION_DEFAULT_CONCURRENCY: int = 64  # everything else
+    ADMISSION_DEFAULT_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Startup / readiness (GET /ready)
+    STARTUP_WARM_CONNECTIONS: int = 5  # pool connections opened before serving (capped at DB_POOL_SIZE)
+    STARTUP_PRIME_PATHS: List[str] = ["/courses/"]  # GETs (under API_V1_PREFIX) replayed to fill caches
+    READY_DB_TIMEOUT_SECONDS: float = 2.0
+    READY_MAX_DB_LATENCY_MS: float = 250.0
+    READY_MAX_POOL_UTILIZATION: float = 0.9  # share of pool_size + max_overflow checked out
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # Server-Timing headers, request logs and /metrics
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_EXPLAIN: bool = False  # log the EXPLAIN plan with slow queries (one at a time)
+    SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS: float = 300.0  # per statement
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
@@ -30,6 +157,16 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = True
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+
+    # Outbound email queue
+    EMAIL_TRANSPORT: str = "smtp"  # "smtp", "file" (writes .eml files) or "memory"
+    EMAIL_FILE_DIR: str = "outbox"
+    EMAIL_WORKER_ENABLED: bool = True  # run the queue dispatcher inside the API process
+    EMAIL_SMTP_POOL_SIZE: int = 2
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_POLL_INTERVAL: float = 5.0
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 30
     
     class Config:
         env_file = ".env"
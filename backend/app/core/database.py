@@ -1,12 +1,142 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.metrics import Gauge, registry
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-)
+logger = logging.getLogger(__name__)
+
+
+class PoolCheckoutStats:
+    """How long requests wait to get a connection out of the pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / (self.checkouts or 1) * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time and timeouts."""
+
+    stats: PoolCheckoutStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - started)
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """
+    Create an async engine with the pool settings from `Settings`.
+
+    SQLite (tests/dev) keeps SQLAlchemy's defaults; Postgres gets a sized,
+    pre-pinged, recycled and instrumented queue pool, plus asyncpg
+    statement-cache tuning (set both caches to 0 behind pgbouncer in
+    transaction mode).
+    """
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite":
+        return create_async_engine(db_url, echo=settings.DEBUG)
+
+    connect_args = {}
+    if db_url.get_driver_name() == "asyncpg":
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        db_url = db_url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+
+    # Each engine gets its own pool subclass so stats survive pool.recreate()
+    pool_class = type(
+        "InstrumentedQueuePool", (InstrumentedQueuePool,), {"stats": PoolCheckoutStats()}
+    )
+    return create_async_engine(
+        db_url,
+        echo=settings.DEBUG,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Snapshot of an engine's pool: size, checked out, overflow, wait times."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    stats: Optional[PoolCheckoutStats] = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.as_dict())
+    return status
+
+
+engine = build_engine(settings.DATABASE_URL)
+read_engine = build_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+
+if settings.METRICS_ENABLED:
+    for _engine in (engine, read_engine):
+        if _engine is not None:
+            instrument_engine(_engine)
+
+
+def _pool_samples(field: str):
+    def collect():
+        engines = {"primary": engine, "replica": read_engine}
+        for name, db_engine in engines.items():
+            if db_engine is not None:
+                yield {"engine": name}, pool_status(db_engine).get(field)
+    return collect
+
+
+for _field, _help in (
+    ("checked_out", "Connections currently checked out of the pool"),
+    ("overflow", "Connections open beyond pool_size (negative while the pool is not full)"),
+    ("timeouts", "Pool checkout timeouts since start"),
+    ("max_wait_ms", "Longest pool checkout wait since start, in ms"),
+    ("avg_wait_ms", "Average pool checkout wait, in ms"),
+):
+    registry.register(Gauge(f"db_pool_{_field}", _help, _pool_samples(_field)))
 
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -14,8 +144,64 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+) if read_engine is not None else None
+
 Base = declarative_base()
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+
+# Read-your-writes: subjects that committed a write recently read from the primary
+recent_writers = TTLCache(max_size=100_000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+_replica_down_until = 0.0
+
+
+def mark_recent_write(*subjects: Optional[str]):
+    for subject in subjects:
+        if subject:
+            recent_writers.set(subject, True)
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_orm_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    if session.info.pop("wrote", False):
+        mark_recent_write(session.info.get("subject"))
+
+
+@asynccontextmanager
+async def replica_session() -> AsyncIterator[Optional[AsyncSession]]:
+    """
+    Session on the read replica, or None when none is configured or it is
+    marked down after a failed connect (then the primary serves reads for
+    DB_READ_RETRY_SECONDS before the replica is tried again).
+    """
+    global _replica_down_until
+
+    if AsyncReadSessionLocal is None or time.monotonic() < _replica_down_until:
+        yield None
+        return
+    async with AsyncReadSessionLocal() as session:
+        try:
+            # Check out the connection up front so a dead replica is
+            # detected here, while we can still fall back
+            await session.connection()
+        except (OSError, exc.DBAPIError, exc.TimeoutError) as e:
+            logger.warning("Read replica unavailable, using primary: %s", e)
+            _replica_down_until = time.monotonic() + settings.DB_READ_RETRY_SECONDS
+        else:
+            yield session
+            return
+    yield None
\ No newline at end of file
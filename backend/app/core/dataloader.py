@@ -0,0 +1,81 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Request-scoped batching: every load(key) made while handling one request
+# is queued, and once the event loop gets a turn the queued keys go out as
+# a single batch_fn(keys) call (one `WHERE id IN (...)`). Results are cached
+# for the loader's lifetime, so asking twice for the same key is free.
+# Create one loader per request (see deps.get_user_loader); it shares the
+# request's session, so batches run one at a time: a single dispatch task
+# drains the queue and picks up keys that arrive while a batch is in flight.
+
+
+class DataLoader(Generic[K, V]):
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 1000,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        """Future for `key`'s value (None if batch_fn didn't return it)."""
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            self._queue.append(key)
+            if self._task is None or self._task.done():
+                # The task's first step runs on the loop's next turn, so the
+                # rest of this turn queues its keys first. Holding it here
+                # keeps it from being garbage collected mid-batch.
+                self._task = loop.create_task(self._dispatch())
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V):
+        """Seed the cache with a value that is already known."""
+        if key not in self._cache:
+            future = self._cache[key] = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+
+    async def _dispatch(self):
+        keys: List[K] = []
+        try:
+            while self._queue:
+                keys, self._queue = self._queue, []
+                for start in range(0, len(keys), self.max_batch_size):
+                    chunk = keys[start:start + self.max_batch_size]
+                    self.batches += 1
+                    try:
+                        values = await self.batch_fn(chunk)
+                    except Exception as e:
+                        for key in chunk:
+                            future = self._cache.pop(key)
+                            if not future.done():
+                                future.set_exception(e)
+                        continue
+                    for key in chunk:
+                        future = self._cache[key]
+                        if not future.done():
+                            future.set_result(values.get(key))
+        finally:
+            # Cancellation (of batch_fn or this task) skips the handler above;
+            # cancel whatever is still pending so no waiter hangs, and drop
+            # it from the cache so a later load() asks again.
+            pending, self._queue = keys + self._queue, []
+            for key in pending:
+                future = self._cache.get(key)
+                if future is not None and not future.done():
+                    del self._cache[key]
+                    future.cancel()
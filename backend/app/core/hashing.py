@@ -0,0 +1,183 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import Gauge, registry
+from app.core.security import get_password_hash, verify_and_update_password, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a job waited too long for a worker."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing/verification in a bounded worker pool so the event loop
+    never blocks on it.
+
+    At most `workers` jobs run at once; up to `max_pending` more wait for a slot.
+    Anything beyond that (or a job that waits longer than `queue_timeout`) is
+    rejected with PasswordHasherBusy, which the app turns into a 503.
+    Bulk jobs (hash_many) are never rejected: they wait for a worker instead.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        executor: str = "thread",
+        max_pending: int = 64,
+        queue_timeout: float = 5.0,
+        bulk_workers: Optional[int] = None,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError("executor must be 'thread' or 'process'")
+        self.workers = workers
+        self.executor_kind = executor
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.bulk_workers = max(1, min(bulk_workers or workers, workers))
+
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._running = 0
+
+        # Metrics
+        self._completed = 0
+        self._rejected = 0
+        self._total_hash_time = 0.0
+        self._total_wait_time = 0.0
+        self._recent_hash_times = deque(maxlen=1024)
+
+    def _get_executor(self) -> Executor:
+        # Pools are created lazily so importing this module stays cheap
+        # (and forked server workers don't inherit an idle process pool).
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="pwd-hash"
+                )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+    async def _run(self, func, *args, wait: bool = False):
+        if not wait and self._pending >= self.workers + self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        self._pending += 1
+        queued_at = time.perf_counter()
+        try:
+            slots = self._get_slots()
+            if wait:
+                await slots.acquire()
+            else:
+                try:
+                    await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+                except asyncio.TimeoutError:
+                    self._rejected += 1
+                    raise PasswordHasherBusy("Timed out waiting for a password hashing worker")
+
+            started_at = time.perf_counter()
+            self._total_wait_time += started_at - queued_at
+            self._running += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            finally:
+                elapsed = time.perf_counter() - started_at
+                self._running -= 1
+                self._completed += 1
+                self._total_hash_time += elapsed
+                self._recent_hash_times.append(elapsed)
+                slots.release()
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """verify(), plus a fresh hash when the stored one uses an outdated scheme/cost."""
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Hash a batch of passwords in parallel.
+
+        At most `bulk_workers` jobs are queued at a time, so a bulk import
+        leaves the other workers (and the queue) to interactive logins and
+        registrations. These jobs skip admission control and wait as long
+        as it takes: shedding one midway would leave a bulk import half done.
+        """
+        limit = asyncio.Semaphore(self.bulk_workers)
+
+        async def hash_one(password: str) -> str:
+            async with limit:
+                return await self._run(get_password_hash, password, wait=True)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+    def stats(self) -> dict:
+        recent = sorted(self._recent_hash_times)
+
+        def percentile(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            index = min(len(recent) - 1, int(round(p * (len(recent) - 1))))
+            return round(recent[index] * 1000, 2)
+
+        completed = self._completed or 1
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "running": self._running,
+            "queue_depth": self._pending - self._running,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_hash_ms": round(self._total_hash_time / completed * 1000, 2),
+            "avg_wait_ms": round(self._total_wait_time / completed * 1000, 2),
+            "p50_hash_ms": percentile(0.50),
+            "p95_hash_ms": percentile(0.95),
+            "p99_hash_ms": percentile(0.99),
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+    bulk_workers=settings.PASSWORD_HASH_BULK_WORKERS,
+)
+
+
+def _hasher_samples(field: str):
+    return lambda: [({}, password_hasher.stats()[field])]
+
+
+for _field, _help in (
+    ("queue_depth", "Password hashing jobs waiting for a worker"),
+    ("running", "Password hashing jobs currently running"),
+    ("rejected", "Password hashing jobs rejected by admission control since start"),
+    ("p95_hash_ms", "p95 bcrypt hash/verify latency over recent jobs, in ms"),
+):
+    registry.register(Gauge(f"password_hash_{_field}", _help, _hasher_samples(_field)))
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, registry
+
+logger = logging.getLogger("app.requests")
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+# EXPLAIN runs on its own pool connection. Only one at a time, and each
+# statement at most once per cooldown, so a slow database under load isn't
+# handed one extra connection per slow query
+_explain_semaphore: Optional[asyncio.Semaphore] = None
+_explained = TTLCache(max_size=1000, ttl=settings.SLOW_QUERY_EXPLAIN_COOLDOWN_SECONDS)
+_explain_tasks: set = set()
+
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"],
+))
+request_db_time = registry.register(Histogram(
+    "http_request_db_seconds", "Time spent in the database per request", ["method", "route"],
+))
+request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "Database statements per request", ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+))
+slow_queries = registry.register(Counter(
+    "db_slow_queries_total", "Statements slower than SLOW_QUERY_THRESHOLD_MS", ["route"],
+))
+
+
+class RequestDBStats:
+    __slots__ = ("scope", "query_count", "db_time", "slowest_time", "slowest_statement")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float):
+        self.query_count += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+# Set by DBTimingMiddleware for the duration of a request. SQLAlchemy runs
+# cursor events in a greenlet that inherits this context.
+current_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Attach query timing / slow-query hooks to an engine."""
+    sync_engine = engine.sync_engine
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if elapsed >= threshold and not statement.lstrip().upper().startswith("EXPLAIN"):
+            slow_queries.inc(_route_label(stats.scope) if stats else "<background>")
+            _report_slow_query(engine, statement, parameters, elapsed, executemany)
+
+
+def _report_slow_query(engine: AsyncEngine, statement, parameters, elapsed, executemany):
+    details = {"duration_ms": round(elapsed * 1000, 2), "statement": statement}
+    global _explain_semaphore
+    explainable = statement.lstrip().upper().startswith(EXPLAINABLE)
+    if _explain_semaphore is None:
+        _explain_semaphore = asyncio.Semaphore(1)
+    if (
+        not settings.SLOW_QUERY_EXPLAIN or executemany or not explainable
+        # A queued task hasn't taken the semaphore yet, so check both
+        or _explain_tasks or _explain_semaphore.locked()
+        or _explained.get(statement) is not None
+    ):
+        slow_query_logger.warning("Slow query %s", json.dumps(details, default=str))
+        return
+    _explained.set(statement, True)
+    # Event hooks are synchronous; run the EXPLAIN on its own connection
+    # without holding up the request that issued the statement
+    task = asyncio.get_running_loop().create_task(_explain(engine, statement, parameters, details))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(engine: AsyncEngine, statement, parameters, details):
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    async with _explain_semaphore:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + statement, parameters)
+                details["plan"] = [" ".join(str(col) for col in row) for row in result]
+        except Exception as e:
+            details["plan_error"] = str(e)
+    slow_query_logger.warning("Slow query %s", json.dumps(details, default=str))
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths are collapsed so random URLs can't explode label cardinality
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class DBTimingMiddleware:
+    """
+    Per-request DB accounting.
+
+    Adds a `Server-Timing` header (db time + query count, total app time),
+    logs one structured line per request and feeds the per-route
+    histograms behind /metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats(scope)
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.query_count} queries", '
+                    f"app;dur={total_ms:.2f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", server_timing.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            route = _route_label(scope)
+            method = scope["method"]
+            request_duration.observe(elapsed, method, route, str(status_code))
+            request_db_time.observe(stats.db_time, method, route)
+            request_db_queries.observe(stats.query_count, method, route)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({
+                    "method": method,
+                    "path": scope["path"],
+                    "route": route,
+                    "status": status_code,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "db_queries": stats.query_count,
+                    "db_time_ms": round(stats.db_time * 1000, 2),
+                    "slowest_query_ms": round(stats.slowest_time * 1000, 2),
+                    "slowest_query": stats.slowest_statement,
+                }))
@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+
+def encode_cursor(created_at: datetime, id_: Any) -> str:
+    """Opaque, URL-safe cursor pointing at the last row of a page."""
+    raw = json.dumps([created_at.isoformat(), str(id_)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, id_type: Callable[[str], Any] = int) -> tuple[datetime, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), id_type(id_)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def paginate_keyset(
+    query: Select,
+    created_at_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    id_type: Callable[[str], Any] = int,
+) -> Select:
+    """
+    Newest-first keyset pagination over (created_at, id).
+
+    The composite index on the same columns lets the database seek straight
+    to the cursor position, so deep pages cost the same as the first one.
+    One extra row is fetched to know whether there is a next page.
+    """
+    if cursor:
+        created_at, id_ = decode_cursor(cursor, id_type)
+        query = query.where(tuple_(created_at_column, id_column) < tuple_(created_at, id_))
+    return query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def keyset_page(rows: Sequence[Any], limit: int) -> dict:
+    """Build the `{items, next_cursor}` envelope from a paginate_keyset() result."""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": items, "next_cursor": next_cursor}
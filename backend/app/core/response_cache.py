@@ -0,0 +1,175 @@
+import hashlib
+import re
+import uuid
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.cache import SharedCache, TTLCache, shared_cache
+from app.core.config import settings
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "content_type")
+
+    def __init__(self, body: bytes, etag: str, content_type: str):
+        self.body = body
+        self.etag = etag
+        self.content_type = content_type
+
+    def dumps(self) -> bytes:
+        return b"\n".join([self.etag.encode(), self.content_type.encode(), self.body])
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        etag, content_type, body = raw.split(b"\n", 2)
+        return cls(body, etag.decode(), content_type.decode())
+
+
+class ResponseCache:
+    """
+    Serialized-response cache with namespace invalidation.
+
+    Entries are keyed by namespace version + path + normalized query string.
+    Invalidating a namespace just rotates its version token, so stale entries
+    are never read again and age out of the LRU. With a shared tier, the
+    version token and entries live there too, so every worker sees writes.
+    """
+
+    key_prefix = "response-cache:"
+
+    def __init__(self, local: TTLCache, shared: Optional[SharedCache] = None):
+        self.local = local
+        self.shared = shared
+        self._versions: dict[str, str] = {}
+
+    async def _version(self, namespace: str) -> str:
+        if self.shared is not None:
+            raw = await self.shared.get(f"{self.key_prefix}version:{namespace}")
+            if raw is not None:
+                return raw.decode()
+        return self._versions.setdefault(namespace, uuid.uuid4().hex)
+
+    async def key(self, namespace: str, path: str, query_string: bytes) -> str:
+        query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+        return f"{namespace}:{await self._version(namespace)}:{path}?{query}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            raw = await self.shared.get(self.key_prefix + key)
+            if raw is not None:
+                entry = CachedResponse.loads(raw)
+                self.local.set(key, entry)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse):
+        self.local.set(key, entry)
+        if self.shared is not None:
+            await self.shared.set(self.key_prefix + key, entry.dumps(), ex=int(self.local.ttl))
+
+    async def invalidate(self, namespace: str):
+        token = uuid.uuid4().hex
+        self._versions[namespace] = token
+        if self.shared is not None:
+            await self.shared.set(f"{self.key_prefix}version:{namespace}", token.encode())
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware that serves cached GET responses for the configured routes.
+
+    Hits are answered without running the endpoint (so without touching the
+    DB), and `If-None-Match` on a current ETag gets a bodyless 304.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache: ResponseCache,
+        rules: Iterable[tuple[str, str]],
+        max_age: int = 30,
+    ):
+        self.app = app
+        self.cache = cache
+        self.rules = [(re.compile(pattern), namespace) for pattern, namespace in rules]
+        self.cache_control = f"public, max-age={max_age}".encode()
+
+    def _namespace(self, path: str) -> Optional[str]:
+        for pattern, namespace in self.rules:
+            if pattern.fullmatch(path):
+                return namespace
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        namespace = self._namespace(scope["path"])
+        if namespace is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        key = await self.cache.key(namespace, scope["path"], scope["query_string"])
+
+        entry = await self.cache.get(key)
+        if entry is not None:
+            await self._send_entry(send, entry, if_none_match, hit=True)
+            return
+
+        # Miss: run the endpoint and buffer its response so we can hash it
+        start_message = {}
+        chunks = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(chunks)
+        if start_message.get("status") != 200:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        response_headers = dict(start_message.get("headers", []))
+        content_type = response_headers.get(b"content-type", b"application/json").decode("latin-1")
+        entry = CachedResponse(body, f'"{hashlib.sha1(body).hexdigest()}"', content_type)
+        await self.cache.set(key, entry)
+        await self._send_entry(send, entry, if_none_match, hit=False)
+
+    async def _send_entry(self, send, entry: CachedResponse, if_none_match: str, hit: bool):
+        headers = [
+            (b"etag", entry.etag.encode()),
+            (b"cache-control", self.cache_control),
+            (b"x-cache", b"HIT" if hit else b"MISS"),
+        ]
+        if _etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (b"content-type", entry.content_type.encode()),
+            (b"content-length", str(len(entry.body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+response_cache = ResponseCache(
+    TTLCache(max_size=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL_SECONDS),
+    shared_cache,
+)
@@ -1,14 +1,52 @@
+import importlib.util
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_password_context() -> CryptContext:
+    """
+    CryptContext for the configured PASSWORD_HASH_SCHEME and cost.
+
+    New hashes use the configured scheme. Hashes from the other scheme, or
+    bcrypt hashes below BCRYPT_ROUNDS, still verify but are reported by
+    needs_update(), so the login path upgrades them. Stronger hashes are
+    left alone.
+    """
+    argon2_available = importlib.util.find_spec("argon2") is not None
+    if settings.PASSWORD_HASH_SCHEME == "argon2":
+        if not argon2_available:
+            raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 needs the argon2-cffi package")
+        schemes = ["argon2", "bcrypt"]
+    elif settings.PASSWORD_HASH_SCHEME == "bcrypt":
+        # Keep verifying argon2 hashes after switching back, if we can
+        schemes = ["bcrypt", "argon2"] if argon2_available else ["bcrypt"]
+    else:
+        raise ValueError(f"Unknown PASSWORD_HASH_SCHEME: {settings.PASSWORD_HASH_SCHEME}")
+
+    options = {
+        "bcrypt__rounds": settings.BCRYPT_ROUNDS,
+        "bcrypt__min_rounds": settings.BCRYPT_ROUNDS,
+    }
+    if "argon2" in schemes:
+        options.update(
+            argon2__time_cost=settings.ARGON2_TIME_COST,
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+            argon2__parallelism=settings.ARGON2_PARALLELISM,
+        )
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+pwd_context = build_password_context()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when the stored hash is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -25,3 +63,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         algorithm=settings.JWT_ALGORITHM
     )
     return encoded_jwt
+
+
+
+def _user_token(user, token_type: str, expires_delta: timedelta, **claims) -> tuple:
+    jti = uuid.uuid4().hex
+    token = create_access_token(
+        data={
+            "sub": user.email,
+            "uid": str(user.id),
+            "ver": user.token_version or 0,
+            "jti": jti,
+            "type": token_type,
+            **claims,
+        },
+        expires_delta=expires_delta,
+    )
+    return token, jti
+
+def create_token_pair(user) -> dict:
+    """
+    Short-lived access token + long-lived refresh token for a user.
+
+    The access token carries everything authorization needs (role, active
+    flag, token version), so requests can be authorized from the token and
+    the in-memory revocation list alone.
+    """
+    access_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token, _ = _user_token(
+        user, "access", access_expires, role=user.role, active=bool(user.is_active)
+    )
+    refresh_token, _ = _user_token(
+        user, "refresh", timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": int(access_expires.total_seconds()),
+    }
+
+def decode_token(token: str, token_type: str) -> Optional[dict]:
+    """Verified claims of a `token_type` token, or None if it is invalid/expired/another type."""
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("sub") is None:
+        return None
+    # Access tokens issued before typed tokens had no "type" claim
+    if payload.get("type", "access") != token_type:
+        return None
+    return payload
\ No newline at end of file
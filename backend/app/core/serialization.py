@@ -0,0 +1,90 @@
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import Select
+
+# Fast JSON path for large list endpoints (FAST_JSON_RESPONSES=True).
+#
+# By default a list endpoint loads ORM objects, FastAPI validates each one
+# against the response_model (from_attributes) and then encodes the result
+# again. With the fast path the endpoint selects only the response schema's
+# columns as Core rows and returns a FastJSONResponse, which orjson encodes
+# directly. Returning a Response bypasses response_model validation, so the
+# selected columns *are* the response shape.
+#
+# The same path serves sparse fieldsets (`?fields=id,title`): only the
+# requested columns are read from the database and returned.
+
+
+def _default(obj: Any):
+    if isinstance(obj, Row):
+        return obj._asdict()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded response that also accepts SQLAlchemy Core rows."""
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z matches pydantic's "Z" suffix for UTC datetimes
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Parse a `fields=a,b,c` query parameter against the fields `schema` exposes.
+
+    Returns None when no fieldset was requested; unknown names are a 400.
+    """
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(schema.model_fields)}",
+        )
+    return requested or None
+
+
+def select_response_columns(
+    query: Select,
+    model: Type[Any],
+    schema: Type[BaseModel],
+    fields: Optional[Sequence[str]] = None,
+    keep: Iterable[str] = ("id", "created_at"),
+) -> Select:
+    """
+    Swap the selected entity for just the columns `schema` exposes, or only
+    `fields` of them. `keep` columns are always selected (keyset cursors
+    are built from them) and trimmed again by row_content(). Fields that
+    aren't columns (nested objects) are left for the endpoint to fill in.
+    """
+    names = list(schema.model_fields) if fields is None else list(dict.fromkeys([*fields, *keep]))
+    columns = model.__table__.c
+    return query.with_only_columns(
+        *(getattr(model, name) for name in names if name in columns),
+        maintain_column_froms=True,
+    )
+
+
+def row_content(rows: Sequence[Row], fields: Optional[Sequence[str]] = None):
+    """Rows (or dicts) as-is for FastJSONResponse, or trimmed to a sparse fieldset."""
+    if fields is None:
+        return rows
+    return [
+        {name: row[name] if isinstance(row, dict) else getattr(row, name) for name in fields}
+        for row in rows
+    ]
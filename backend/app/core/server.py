@@ -0,0 +1,245 @@
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import signal
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.server")
+
+# Production entry point (`python -m app`).
+#
+# The supervisor imports the app once, binds the listening socket, then
+# forks the workers. Each worker serves the shared socket with its own
+# uvicorn event loop. Because the app is imported before the fork, the
+# workers share the imported modules and settings copy-on-write. Connection
+# pools, executors and background tasks are created lazily or in the
+# startup hooks, so each worker gets its own.
+
+
+def _pick(module: str, preferred: str, fallback: str) -> str:
+    return preferred if importlib.util.find_spec(module) is not None else fallback
+
+
+def resolve_loop(loop: str) -> str:
+    return _pick("uvloop", "uvloop", "asyncio") if loop == "auto" else loop
+
+
+def resolve_http(http: str) -> str:
+    return _pick("httptools", "httptools", "h11") if http == "auto" else http
+
+
+def resolve_workers(workers: int) -> int:
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the LMS API server")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS,
+                        help="worker processes (0 = one per CPU)")
+    parser.add_argument("--loop", default=settings.SERVER_LOOP, choices=["auto", "uvloop", "asyncio"])
+    parser.add_argument("--http", default=settings.SERVER_HTTP, choices=["auto", "httptools", "h11"])
+    parser.add_argument("--keepalive", type=int, default=settings.SERVER_KEEPALIVE_SECONDS,
+                        help="idle keep-alive timeout in seconds")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT,
+                        help="seconds to drain open connections on shutdown")
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--limit-concurrency", type=int, default=settings.SERVER_LIMIT_CONCURRENCY)
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=settings.SERVER_PRELOAD,
+                        help="import the app in each worker instead of once before forking")
+    parser.add_argument("--access-log", action="store_true", default=settings.SERVER_ACCESS_LOG)
+    return parser.parse_args(argv)
+
+
+def build_config(args: argparse.Namespace, workers: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=resolve_loop(args.loop),
+        http=resolve_http(args.http),
+        lifespan="on",
+        timeout_keep_alive=args.keepalive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency,
+        access_log=args.access_log,
+        proxy_headers=True,
+        server_header=False,
+    )
+
+
+def _disable_local_caches(workers: int):
+    """
+    Cache invalidations only reach other workers through the shared tier.
+    Without REDIS_URL each worker would keep serving its own stale course
+    pages and user principals after a write handled by another one, so
+    those caches are turned off before the app is imported.
+    """
+    if workers == 1 or settings.REDIS_URL:
+        return
+    disabled = []
+    for name in ("RESPONSE_CACHE_ENABLED", "USER_CACHE_ENABLED"):
+        if getattr(settings, name):
+            setattr(settings, name, False)
+            # For workers that load their own settings (no fork)
+            os.environ[name] = "False"
+            disabled.append(name)
+    if disabled:
+        logger.warning(
+            "%d workers and no REDIS_URL: %s turned off, set REDIS_URL to share the caches",
+            workers, ", ".join(disabled),
+        )
+    if settings.DATABASE_READ_URL:
+        logger.warning(
+            "%d workers and no REDIS_URL: read-your-writes only holds within a worker; "
+            "a read served by another worker may hit the replica before it has the write",
+            workers,
+        )
+
+
+def _reset_after_fork():
+    # Never reuse pooled connections a parent might have opened
+    from app.core.database import engine, read_engine
+
+    for db_engine in (engine, read_engine):
+        if db_engine is not None:
+            db_engine.sync_engine.dispose(close=False)
+
+
+class Supervisor:
+    """
+    Forks `workers` uvicorn servers on one shared socket and keeps them alive.
+
+    SIGTERM/SIGINT are forwarded to every worker; uvicorn stops accepting,
+    drains in-flight requests for up to `graceful_timeout` seconds and runs
+    the shutdown hooks. Workers that are still alive after that are killed.
+    A worker that dies on its own is replaced.
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int, graceful_timeout: int):
+        self.config = config
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.children: Dict[int, int] = {}  # pid -> worker number
+        self.stopping = False
+
+    def spawn(self, number: int, sock):
+        pid = os.fork()
+        if pid == 0:
+            # Own process group: a terminal Ctrl+C reaches only the
+            # supervisor, which then stops the workers with one SIGTERM each
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                _reset_after_fork()
+                uvicorn.Server(self.config).run(sockets=[sock])
+            except BaseException:
+                logger.exception("Worker %d crashed", number)
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = number
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def run(self, sock):
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        for number in range(self.workers):
+            self.spawn(number, sock)
+
+        while not self.stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid and pid in self.children and not self.stopping:
+                number = self.children.pop(pid)
+                logger.warning("Worker %d (pid %d) exited with status %d; restarting", number, pid, status)
+                time.sleep(0.5)  # don't spin if the app can't start at all
+                self.spawn(number, sock)
+                continue
+            time.sleep(0.2)
+
+        self.shutdown()
+        sock.close()
+
+    def shutdown(self):
+        logger.info("Stopping %d workers (draining up to %ds)", len(self.children), self.graceful_timeout)
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Worker pid %d did not drain in time; killing it", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def main(argv: Optional[List[str]] = None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = parse_args(argv)
+    workers = resolve_workers(args.workers)
+    _disable_local_caches(workers)
+    config = build_config(args, workers)
+    logger.info(
+        "Starting %d worker(s) on %s:%d (loop=%s, http=%s, keepalive=%ds, preload=%s)",
+        workers, args.host, args.port, config.loop, config.http, args.keepalive, args.preload,
+    )
+
+    if not hasattr(os, "fork"):
+        # No fork (Windows): let uvicorn spawn workers that import the app themselves
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            loop=config.loop,
+            http=config.http,
+            timeout_keep_alive=args.keepalive,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            limit_concurrency=args.limit_concurrency,
+            access_log=args.access_log,
+        )
+        return
+
+    if args.preload:
+        # Import app.main and the protocol classes once, in the supervisor
+        config.load()
+        # Move everything imported so far out of the GC's reach, so
+        # collections in the workers don't write to (and un-share) those pages
+        gc.freeze()
+
+    sock = config.bind_socket()
+    if workers == 1:
+        uvicorn.Server(config).run(sockets=[sock])
+        return
+    Supervisor(config, workers, args.graceful_timeout).run(sock)
+
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.database import engine, pool_status, read_engine
+
+logger = logging.getLogger(__name__)
+
+# Startup work run from the app's lifespan, before a process is marked
+# ready: open pool connections, replay a few hot GETs so the response cache,
+# SQLAlchemy's compiled-statement cache and the pydantic serializers are warm,
+# plus the checks behind GET /ready.
+
+
+def _engines():
+    return {"primary": engine, "replica": read_engine}
+
+
+async def warm_pool(db_engine: AsyncEngine, connections: int) -> int:
+    """
+    Open up to `connections` pooled connections at once (capped at the
+    pool size) and return them to the pool. Returns how many were opened.
+    """
+    if isinstance(db_engine.pool, QueuePool):
+        connections = min(connections, db_engine.pool.size())
+    else:
+        connections = min(connections, 1)
+    if connections <= 0:
+        return 0
+
+    async def ping(conn):
+        await conn.execute(text("SELECT 1"))
+
+    # Held open together, otherwise the pool would hand back the same one
+    opened = await asyncio.gather(*(db_engine.connect() for _ in range(connections)), return_exceptions=True)
+    conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+    try:
+        await asyncio.gather(*(ping(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
+    for error in opened:
+        if isinstance(error, BaseException):
+            logger.warning("Pool warm-up connection failed: %s", error)
+    return len(conns)
+
+
+async def warm_pools(connections: int) -> dict:
+    warmed = {}
+    for name, db_engine in _engines().items():
+        if db_engine is None:
+            continue
+        try:
+            warmed[name] = await warm_pool(db_engine, connections)
+        except Exception as e:
+            logger.warning("Could not warm the %s pool: %s", name, e)
+            warmed[name] = 0
+    return warmed
+
+
+async def prime_paths(app, paths: Iterable[str]) -> dict:
+    """
+    Send internal GET requests through the whole middleware stack, so the
+    responses land in the response cache exactly as a client would get them.
+    Returns the status code per path (None if the request raised).
+    """
+    statuses = {}
+    for path in paths:
+        url = settings.API_V1_PREFIX + path
+        route, _, query = url.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": route,
+            "raw_path": route.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"startup")],
+            "client": None,
+            "server": None,
+        }
+        response = {}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+
+        try:
+            await app(scope, receive, send)
+        except Exception as e:
+            logger.warning("Priming %s failed: %s", url, e)
+        statuses[path] = response.get("status")
+    return statuses
+
+
+def _pool_utilization(db_engine: AsyncEngine) -> Optional[float]:
+    status = pool_status(db_engine)
+    if "checked_out" not in status or status["max_overflow"] < 0:
+        return None  # not a bounded queue pool
+    capacity = status["size"] + status["max_overflow"]
+    return round(status["checked_out"] / capacity, 3) if capacity else None
+
+
+async def _ping(db_engine: AsyncEngine) -> float:
+    started = time.perf_counter()
+    async with db_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+
+async def check_database(name: str, db_engine: AsyncEngine) -> dict:
+    # Utilization first: the ping itself checks a connection out
+    utilization = _pool_utilization(db_engine)
+    check = {"pool_utilization": utilization}
+    problems: List[str] = []
+    try:
+        latency = await asyncio.wait_for(_ping(db_engine), timeout=settings.READY_DB_TIMEOUT_SECONDS)
+        check["latency_ms"] = round(latency, 2)
+        if latency > settings.READY_MAX_DB_LATENCY_MS:
+            problems.append(f"latency {latency:.0f}ms > {settings.READY_MAX_DB_LATENCY_MS:.0f}ms")
+    except asyncio.TimeoutError:
+        problems.append(f"no answer within {settings.READY_DB_TIMEOUT_SECONDS}s")
+    except Exception as e:
+        problems.append(f"unreachable: {type(e).__name__}")
+    if utilization is not None and utilization >= settings.READY_MAX_POOL_UTILIZATION:
+        problems.append(f"pool {utilization:.0%} checked out")
+    check["ok"] = not problems
+    if problems:
+        logger.warning("Readiness: %s database %s", name, ", ".join(problems))
+        check["problems"] = problems
+    return check
+
+
+async def readiness() -> dict:
+    """Database checks for GET /ready; a replica is reported but never fails it."""
+    checks = {}
+    for name, db_engine in _engines().items():
+        if db_engine is not None:
+            checks[name] = await check_database(name, db_engine)
+    return {"ready": checks["primary"]["ok"], "checks": checks}
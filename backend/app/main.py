@@ -1,11 +1,73 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+import time
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.admission import AdmissionControlMiddleware, ConcurrencyBudget
+from app.core.hashing import PasswordHasherBusy, password_hasher
+from app.core.instrumentation import DBTimingMiddleware
+from app.core.metrics import registry
+from app.core.response_cache import ResponseCacheMiddleware, response_cache
+from app.core.startup import prime_paths, readiness, warm_pools
+from app.services.enrollment_counter import enrollment_counter
+from app.services.progress_buffer import progress_buffer
+from app.services.semantic_search import start_semantic_index_build
+from app.services.token_revocation import token_revocations
+from app.services.tutor import tutor_backend
+from app.services.user_import import user_import_jobs
+
+logger = logging.getLogger("app.startup")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    app.state.ready = False
+
+    if settings.EMAIL_WORKER_ENABLED:
+        # Imported here: processes that don't deliver mail never load the transports
+        from app.services.email_queue import email_dispatcher
+        email_dispatcher.start()
+    # First round loads the live revocations right away, then every few seconds
+    token_revocations.start()
+    enrollment_counter.start()
+    progress_buffer.start()
+    if settings.SEMANTIC_INDEX_BUILD_ON_STARTUP:
+        start_semantic_index_build()
+
+    warmed = await warm_pools(settings.STARTUP_WARM_CONNECTIONS)
+    primed = await prime_paths(app, settings.STARTUP_PRIME_PATHS)
+    app.state.ready = True
+    logger.info(
+        "Ready in %.0fms (pool connections opened: %s, primed: %s)",
+        (time.perf_counter() - started) * 1000, warmed, primed,
+    )
+
+    yield
+
+    # Fail /ready first so load balancers stop routing here while we drain
+    app.state.ready = False
+    # Committed chunks stay; the job status records where to resume
+    await user_import_jobs.stop()
+    await token_revocations.stop()
+    # Writes out the enrollment counts still buffered
+    await enrollment_counter.stop()
+    # ...and the lesson positions
+    await progress_buffer.stop()
+    if settings.EMAIL_WORKER_ENABLED:
+        await email_dispatcher.stop()
+    await tutor_backend.close()
+    password_hasher.shutdown(wait=False)
+
 
 app = FastAPI(
     title=settings.APP_NAME,
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -13,6 +75,63 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
+# Per-route concurrency budgets; requests over budget get a fast 503.
+# Inside the response cache, so cache hits never take a slot.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        budgets=[
+            # bcrypt-bound: a small budget keeps a login storm from starving everything else
+            (
+                rf"{settings.API_V1_PREFIX}/auth/(login|register|refresh)",
+                ConcurrencyBudget(
+                    "auth",
+                    settings.ADMISSION_AUTH_CONCURRENCY,
+                    settings.ADMISSION_AUTH_QUEUE,
+                    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                ),
+            ),
+            (
+                rf"{settings.API_V1_PREFIX}/courses/.*",
+                ConcurrencyBudget(
+                    "courses",
+                    settings.ADMISSION_COURSES_CONCURRENCY,
+                    settings.ADMISSION_COURSES_QUEUE,
+                    settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                ),
+            ),
+        ],
+        default=ConcurrencyBudget(
+            "default",
+            settings.ADMISSION_DEFAULT_CONCURRENCY,
+            settings.ADMISSION_DEFAULT_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        ),
+        # The tutor stream has its own (much smaller) budget, held for the whole answer
+        exempt=[r"/health", r"/ready", r"/metrics", rf"{settings.API_V1_PREFIX}/courses/[^/]+/tutor"],
+        retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
+
+# Public, rarely-changing GET endpoints served from the response cache.
+# Added before CORS so cached responses still get CORS headers.
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=response_cache,
+        rules=[
+            (rf"{settings.API_V1_PREFIX}/courses/", "courses"),
+            (rf"{settings.API_V1_PREFIX}/courses/(?!export$)[^/]+", "courses"),
+            (rf"{settings.API_V1_PREFIX}/courses/[^/]+/similar", "courses"),
+            (rf"{settings.API_V1_PREFIX}/courses/[^/]+/lessons", "courses"),
+        ],
+        max_age=settings.RESPONSE_CACHE_MAX_AGE,
+    )
+
+# Per-request query count / DB time (Server-Timing header, logs, /metrics).
+# Outside the response cache so cache hits are measured too.
+if settings.METRICS_ENABLED:
+    app.add_middleware(DBTimingMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +141,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Login/registration storms queue in the hasher; past its limit we shed load
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -35,4 +163,25 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving."""
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """Readiness: startup finished, the database answers quickly and the pool has room."""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting"},
+        )
+    report = await readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if report["ready"] else "degraded", "checks": report["checks"]},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
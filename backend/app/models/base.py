@@ -1,3 +1,10 @@
 # File: backend/app/models/base.py
 # এই ফাইলে আমরা ডাটাবেস বেস ক্লাস ইমপোর্ট করছি
-from app.core.database import Base
\ No newline at end of file
+from datetime import datetime, timezone
+
+from app.core.database import Base
+
+
+def utcnow():
+    """Timezone-aware now, used for column defaults and timestamps written in code."""
+    return datetime.now(timezone.utc)
\ No newline at end of file
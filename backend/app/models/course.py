@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Float, DateTime
-from sqlalchemy.dialects.postgresql import UUID  # এটি ইমপোর্ট করতে হবে
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Float, DateTime, Index
+from sqlalchemy.types import Uuid  # native UUID on Postgres, CHAR(32) on SQLite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.models.base import utcnow
 
 class Course(Base):
     __tablename__ = "courses"
@@ -13,13 +14,27 @@ class Course(Base):
     description = Column(Text, nullable=True)
     price = Column(Float, default=0.0)
     is_published = Column(Boolean, default=False)
+    # Denormalized COUNT of enrollments; increments are batched by EnrollmentCounterBuffer
+    enrollment_count = Column(Integer, default=0, server_default="0", nullable=False)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python so it keeps microseconds: SQLite's CURRENT_TIMESTAMP is
+    # whole seconds, and keyset cursors need created_at to tie-break on id
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Foreign Keys (FIXED: Integer -> UUID)
     # যেহেতু users টেবিলের id UUID, তাই এখানেও UUID হতে হবে
-    instructor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    instructor_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"))
 
     # Relationships
-    instructor = relationship("User", back_populates="courses")
\ No newline at end of file
+    instructor = relationship("User", back_populates="courses")
+    enrollments = relationship("Enrollment", back_populates="course", passive_deletes=True)
+    lessons = relationship("Lesson", back_populates="course", order_by="Lesson.position", passive_deletes=True)
+
+    __table_args__ = (
+        # Keyset pagination of the public catalogue (newest published first)
+        Index("ix_courses_published_created_at_id", "is_published", "created_at", "id"),
+    )
+
+from app.models.enrollment import Enrollment  # noqa: E402,F401
+from app.models.lesson import Lesson  # noqa: E402,F401
\ No newline at end of file
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from app.core.database import Base
+from app.models.base import utcnow
+
+
+class OutboundEmail(Base):
+    """Outbound email queue. Rows are written by request handlers and drained by EmailDispatcher."""
+    __tablename__ = "outbound_emails"
+
+    id = Column(Integer, primary_key=True)
+    recipients = Column(JSON, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    subtype = Column(String, default="html")
+
+    # Status: pending -> sending -> sent / failed
+    status = Column(String, default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # When the row may next be claimed (also serves as the lease for "sending" rows)
+    next_attempt_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbound_emails_status_next_attempt_at", "status", "next_attempt_at"),
+    )
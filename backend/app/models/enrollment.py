@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.types import Uuid
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.models.base import utcnow
+
+
+class Enrollment(Base):
+    """
+    A student enrolled in a course. Course.enrollment_count is the
+    denormalized count of these rows, kept up to date by
+    EnrollmentCounterBuffer rather than in the enroll transaction.
+    """
+    __tablename__ = "enrollments"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    enrolled_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    student = relationship("User", back_populates="enrollments")
+    course = relationship("Course", back_populates="enrollments")
+
+    __table_args__ = (
+        # One enrollment per student and course; also serves "my enrollments"
+        UniqueConstraint("user_id", "course_id", name="uq_enrollments_user_id_course_id"),
+        # Recounts and per-course listings
+        Index("ix_enrollments_course_id", "course_id"),
+    )
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, Float, DateTime, ForeignKey, Index
+from sqlalchemy.types import Uuid
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.models.base import utcnow
+
+
+class Lesson(Base):
+    __tablename__ = "lessons"
+
+    id = Column(Integer, primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    title = Column(String, nullable=False)
+    content = Column(Text, nullable=True)
+    video_url = Column(String, nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+    # Order within the course
+    position = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+    course = relationship("Course", back_populates="lessons")
+
+    __table_args__ = (
+        Index("ix_lessons_course_id_position", "course_id", "position"),
+    )
+
+
+class LessonProgress(Base):
+    """
+    Latest playback position per student and lesson. Written in batches by
+    ProgressBuffer (multi-row upsert on the primary key), not per heartbeat.
+    """
+    __tablename__ = "lesson_progress"
+
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True)
+    position_seconds = Column(Float, default=0.0, nullable=False)
+    # Sticky: once a lesson is completed a later heartbeat can't undo it
+    completed = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
\ No newline at end of file
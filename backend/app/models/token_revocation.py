@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.types import Uuid
+from app.core.database import Base
+from app.models.base import utcnow
+
+
+class TokenRevocation(Base):
+    """
+    Revoked JWTs. Read by TokenRevocationList, which keeps the live
+    "access" rows in memory so request authentication needs no query.
+
+    - kind="access", user_id + token_version: every access token of that user
+      with a lower `ver` claim is revoked (deactivation, password reset, ...)
+    - kind="access"/"refresh", jti: one specific token (logout, refresh rotation)
+
+    Rows are only needed until the tokens they cover expire.
+    """
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(16), nullable=False)
+    jti = Column(String(64), unique=True, nullable=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    token_version = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
\ No newline at end of file
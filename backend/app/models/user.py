@@ -1,14 +1,14 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.types import Uuid
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -19,10 +19,21 @@ class User(Base):
     
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+
+    # Embedded in JWTs as `ver`; bumping it revokes every token issued before
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Future relationships placeholders (Uncomment when creating those models)
     courses = relationship("Course", back_populates="instructor")
-    # enrollments = relationship("Enrollment", back_populates="student")
\ No newline at end of file
+    enrollments = relationship("Enrollment", back_populates="student", passive_deletes=True)
+
+    __table_args__ = (
+        # Keyset pagination of the admin user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
+# Registers Enrollment for the relationship above, whichever model is imported first
+from app.models.enrollment import Enrollment  # noqa: E402,F401
\ No newline at end of file
@@ -1,16 +1,34 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
+from uuid import UUID
 from app.schemas.user import UserCreate
 
 # Token response schema
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # access token lifetime in seconds
+
+# Refresh / logout request schema
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 # Token data decode schema
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+# Authenticated caller, built from access token claims (no DB lookup)
+class Principal(BaseModel):
+    id: UUID
+    email: str
+    role: str
+    is_active: bool
+    token_version: int = 0
+
 # Login request schema
 class Login(BaseModel):
     username: str  # In OAuth2 standard, email is often used as username
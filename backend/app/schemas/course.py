@@ -3,6 +3,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID  # 👈 এই লাইনটি যোগ করুন
 
+from app.schemas.user import UserSummary
+
 # Shared properties
 class CourseBase(BaseModel):
     title: Optional[str] = None
@@ -26,10 +28,16 @@ class CourseInDBBase(CourseBase):
     instructor_id: UUID  # 👈 আগে এটি int ছিল, এখন UUID করে দিন
     created_at: datetime
     updated_at: Optional[datetime] = None
+    enrollment_count: int = 0
 
     class Config:
         from_attributes = True
 
 # Properties to return to client
 class CourseResponse(CourseInDBBase):
-    pass
\ No newline at end of file
+    # Loaded in batch (with_instructor() / attach_instructors()), never lazily
+    instructor: Optional[UserSummary] = None
+
+# Semantic search / similar courses: the course plus its cosine similarity
+class CourseSearchResult(CourseResponse):
+    score: float
\ No newline at end of file
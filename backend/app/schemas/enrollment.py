@@ -0,0 +1,18 @@
+from datetime import datetime
+from uuid import UUID
+from pydantic import BaseModel
+
+from app.schemas.course import CourseResponse
+
+class EnrollmentResponse(BaseModel):
+    id: int
+    user_id: UUID
+    course_id: int
+    enrolled_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# "My enrollments": each enrollment with its course
+class EnrollmentWithCourse(EnrollmentResponse):
+    course: CourseResponse
\ No newline at end of file
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class LessonCreate(BaseModel):
+    title: str
+    content: Optional[str] = None
+    video_url: Optional[str] = None
+    duration_seconds: Optional[int] = Field(None, ge=0)
+    position: int = 0
+
+class LessonResponse(LessonCreate):
+    id: int
+    course_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Sent by the video player every few seconds while a lesson is playing
+class ProgressHeartbeat(BaseModel):
+    position_seconds: float = Field(..., ge=0)
+    completed: bool = False
+
+class LessonProgressResponse(BaseModel):
+    lesson_id: int
+    position_seconds: float
+    completed: bool
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,4 @@
+from pydantic import BaseModel, Field
+
+class TutorQuestion(BaseModel):
+    question: str = Field(..., min_length=1, max_length=2000)
\ No newline at end of file
@@ -1,6 +1,6 @@
 # File: backend/app/schemas/user.py
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -30,10 +30,57 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
         
+# Public profile: what course pages show about an instructor
+class UserSummary(BaseModel):
+    id: UUID
+    username: str
+    full_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
 class UserUpdateAdmin(BaseModel):
     full_name: Optional[str] = None
     email: Optional[EmailStr] = None
     password: Optional[str] = None
     role: Optional[str] = None       # অ্যাডমিন রোল চেঞ্জ করতে পারবে
     is_active: Optional[bool] = None # অ্যাডমিন ব্লক/আনব্লক করতে পারবে
-    is_verified: Optional[bool] = None
\ No newline at end of file
+    is_verified: Optional[bool] = None
+
+# Bulk import / bulk update
+UserRole = Literal["student", "instructor", "admin"]
+
+class UserImportRow(BaseModel):
+    email: EmailStr
+    username: str = Field(min_length=1)
+    password: str = Field(min_length=1)
+    full_name: Optional[str] = None
+    role: UserRole = "student"
+    is_verified: bool = False
+
+class UserImportError(BaseModel):
+    row: int  # line number in the CSV (header is line 1)
+    email: Optional[str] = None
+    error: str
+
+class UserImportResult(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    errors: List[UserImportError]  # capped at USER_IMPORT_MAX_ERRORS
+
+class UserImportJob(UserImportResult):
+    """A background import; the counts grow as chunks are committed."""
+    id: str
+    status: Literal["pending", "running", "completed", "failed", "cancelled"]
+    last_line: int = 0  # CSV line of the last processed row: a stopped import resumes after it
+    detail: Optional[str] = None
+
+class UserBulkUpdate(BaseModel):
+    user_ids: List[UUID] = Field(min_length=1, max_length=10000)
+    role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+
+class UserBulkUpdateResult(BaseModel):
+    updated: int
\ No newline at end of file
@@ -1,10 +1,13 @@
 # File: backend/app/services/auth_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
 from sqlalchemy.future import select
-from fastapi import HTTPException, status
+from sqlalchemy.orm import load_only
 from app.models.user import User
 from app.schemas.auth import UserRegister
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import create_access_token
+from app.core.hashing import password_hasher
+from app.services.write_service import insert_returning
 from datetime import timedelta
 from app.core.config import settings
 
@@ -13,41 +16,54 @@ class AuthService:
         self.db = db
 
     async def register_user(self, user_data: UserRegister):
-        # চেক করি ইমেইল বা ইউজারনেম অলরেডি আছে কিনা
-        result = await self.db.execute(select(User).filter((User.email == user_data.email) | (User.username == user_data.username)))
-        existing_user = result.scalars().first()
-        
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email or Username already registered"
-            )
-
         # নতুন ইউজার তৈরি
-        new_user = User(
-            email=user_data.email,
-            username=user_data.username,
-            full_name=user_data.full_name,
-            hashed_password=get_password_hash(user_data.password),
-            role="student",  # ডিফল্ট রোল স্টুডেন্ট
-            is_active=True
+        # Duplicate email/username is caught by the unique indexes in the
+        # same INSERT ... RETURNING statement (no pre-check SELECT, no refresh)
+        new_user = await insert_returning(
+            self.db,
+            User,
+            {
+                "email": user_data.email,
+                "username": user_data.username,
+                "full_name": user_data.full_name,
+                "hashed_password": await password_hasher.hash(user_data.password),
+                "role": "student",  # ডিফল্ট রোল স্টুডেন্ট
+                "is_active": True,
+            },
+            conflict_detail="Email or Username already registered",
         )
-        
-        self.db.add(new_user)
-        await self.db.commit()
-        await self.db.refresh(new_user)
+        # Not committed yet: the caller commits it together with the
+        # verification email
         return new_user
 
     async def authenticate_user(self, email: str, password: str):
         # ইমেইল দিয়ে ইউজার খুঁজি
-        result = await self.db.execute(select(User).filter(User.email == email))
+        result = await self.db.execute(
+            select(User)
+            .options(load_only(
+                User.id, User.email, User.hashed_password, User.role, User.is_active, User.token_version
+            ))
+            .filter(User.email == email)
+        )
         user = result.scalars().first()
 
         if not user:
             return None
         
         # পাসওয়ার্ড চেক করি
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             return None
+
+        # Stored hash uses an old scheme/cost: replace it while we have the
+        # plaintext. Same password, so tokens stay valid (no version bump)
+        if new_hash is not None:
+            await self.db.execute(
+                update(User)
+                .where(User.id == user.id, User.hashed_password == user.hashed_password)
+                .values(hashed_password=new_hash)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
             
         return user
\ No newline at end of file
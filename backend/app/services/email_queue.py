@@ -0,0 +1,298 @@
+# File: backend/app/services/email_queue.py
+import asyncio
+import logging
+from datetime import timedelta
+from email.message import EmailMessage
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from sqlalchemy import bindparam, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.base import utcnow
+from app.models.email import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_email(
+    db: AsyncSession,
+    recipients: List[str],
+    subject: str,
+    body: str,
+    subtype: str = "html",
+) -> OutboundEmail:
+    """
+    Add a message to the outbound queue in the caller's transaction.
+
+    Nothing is committed here: the row goes in with the caller's own writes
+    (e.g. the new user it's addressed to), and the dispatcher is woken once
+    that transaction commits.
+    """
+    email = OutboundEmail(
+        recipients=[str(r) for r in recipients],
+        subject=subject,
+        body=body,
+        subtype=subtype,
+    )
+    db.add(email)
+    db.info["emails_queued"] = True
+    return email
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("emails_queued", False):
+        email_dispatcher.notify()
+
+
+def build_message(email: OutboundEmail) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = f"{settings.MAIL_FROM_NAME} <{settings.MAIL_FROM}>"
+    message["To"] = ", ".join(email.recipients)
+    message["Subject"] = email.subject
+    message.set_content(email.body, subtype=email.subtype or "plain")
+    return message
+
+
+# --- Transports ---------------------------------------------------------------
+
+class MemoryTransport:
+    """Keeps sent messages in a list (tests)."""
+
+    def __init__(self):
+        self.outbox: List[EmailMessage] = []
+
+    async def send(self, message: EmailMessage):
+        self.outbox.append(message)
+
+    async def close(self):
+        pass
+
+
+class FileTransport:
+    """Writes each message as an .eml file (local development)."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._counter = 0
+
+    async def send(self, message: EmailMessage):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._counter += 1
+        name = f"{utcnow():%Y%m%d-%H%M%S-%f}-{self._counter}.eml"
+        await asyncio.to_thread((self.directory / name).write_bytes, bytes(message))
+
+    async def close(self):
+        pass
+
+
+class SMTPTransport:
+    """
+    Pool of persistent SMTP connections.
+
+    Connections are opened (TLS handshake + login) on first use and then
+    reused for later messages; a connection that errors is closed and
+    reopened on its next use.
+    """
+
+    def __init__(self, pool_size: int = 2):
+        self.pool_size = pool_size
+        self._idle: Optional[asyncio.Queue] = None
+
+    def _new_client(self):
+        # Imported lazily; the mail stack is only needed once something is sent
+        import aiosmtplib
+
+        return aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            username=settings.MAIL_USERNAME if settings.USE_CREDENTIALS else None,
+            password=settings.MAIL_PASSWORD if settings.USE_CREDENTIALS else None,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+            validate_certs=settings.VALIDATE_CERTS,
+        )
+
+    def _pool(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._idle.put_nowait(self._new_client())
+        return self._idle
+
+    async def send(self, message: EmailMessage):
+        pool = self._pool()
+        client = await pool.get()
+        try:
+            if not client.is_connected:
+                await client.connect()
+            await client.send_message(message)
+        except Exception:
+            client.close()
+            raise
+        finally:
+            pool.put_nowait(client)
+
+    async def close(self):
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+        self._idle = None
+
+
+def create_transport(kind: str):
+    if kind == "memory":
+        return MemoryTransport()
+    if kind == "file":
+        return FileTransport(settings.EMAIL_FILE_DIR)
+    if kind == "smtp":
+        return SMTPTransport(pool_size=settings.EMAIL_SMTP_POOL_SIZE)
+    raise ValueError(f"Unknown EMAIL_TRANSPORT: {kind}")
+
+
+# --- Dispatcher -----------------------------------------------------------------
+
+class EmailDispatcher:
+    """
+    Background worker draining `outbound_emails`.
+
+    Each round claims a batch of due rows (FOR UPDATE SKIP LOCKED on
+    Postgres, so several workers can run side by side), leases them by
+    pushing next_attempt_at forward, sends them concurrently over the
+    transport's pooled connections and records the outcome in one
+    executemany UPDATE. Failures retry with exponential backoff until
+    EMAIL_MAX_ATTEMPTS.
+    """
+
+    lease = timedelta(minutes=5)
+
+    def __init__(self, transport, batch_size: int = 50, poll_interval: float = 5.0):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="email-dispatcher")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.transport.close()
+
+    async def _run(self):
+        while True:
+            try:
+                sent = await self.dispatch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email dispatch round failed")
+                sent = 0
+            if sent >= self.batch_size:
+                continue  # more may be waiting
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, db: AsyncSession) -> Sequence[OutboundEmail]:
+        now = utcnow()
+        result = await db.execute(
+            select(OutboundEmail)
+            .where(
+                or_(OutboundEmail.status == "pending", OutboundEmail.status == "sending"),
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboundEmail.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        emails = result.scalars().all()
+        for email in emails:
+            email.status = "sending"
+            email.next_attempt_at = now + self.lease
+        await db.commit()
+        return emails
+
+    async def _send(self, email: OutboundEmail) -> Optional[str]:
+        try:
+            await self.transport.send(build_message(email))
+            return None
+        except Exception as e:
+            logger.warning("Failed to send email %s to %s: %s", email.id, email.recipients, e)
+            return str(e) or type(e).__name__
+
+    async def dispatch_once(self) -> int:
+        """Send one batch; returns how many rows were claimed."""
+        async with AsyncSessionLocal() as db:
+            emails = await self._claim(db)
+            if not emails:
+                return 0
+
+            errors = await asyncio.gather(*(self._send(email) for email in emails))
+
+            now = utcnow()
+            outcomes = []
+            for email, error in zip(emails, errors):
+                attempts = email.attempts + 1
+                if error is None:
+                    status, next_attempt_at, sent_at = "sent", email.next_attempt_at, now
+                elif attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    status, next_attempt_at, sent_at = "failed", email.next_attempt_at, None
+                else:
+                    backoff = settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+                    status, next_attempt_at, sent_at = "pending", now + timedelta(seconds=backoff), None
+                outcomes.append({
+                    "email_id": email.id,
+                    "status": status,
+                    "attempts": attempts,
+                    "next_attempt_at": next_attempt_at,
+                    "last_error": error,
+                    "sent_at": sent_at,
+                })
+
+            await db.execute(
+                update(OutboundEmail.__table__)
+                .where(OutboundEmail.__table__.c.id == bindparam("email_id"))
+                .values(
+                    status=bindparam("status"),
+                    attempts=bindparam("attempts"),
+                    next_attempt_at=bindparam("next_attempt_at"),
+                    last_error=bindparam("last_error"),
+                    sent_at=bindparam("sent_at"),
+                ),
+                outcomes,
+            )
+            await db.commit()
+            return len(emails)
+
+
+email_dispatcher = EmailDispatcher(
+    create_transport(settings.EMAIL_TRANSPORT),
+    batch_size=settings.EMAIL_BATCH_SIZE,
+    poll_interval=settings.EMAIL_POLL_INTERVAL,
+)
@@ -1,24 +1,15 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from pydantic import EmailStr
-from app.core.config import settings
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-# Email Configuration Setup
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS
-)
-
 class EmailService:
-    async def send_verification_email(self, email: List[EmailStr], token: str):
-        """Send account verification email"""
+    """
+    Renders account emails and puts them on the outbound queue; the
+    caller commits them with the rest of its transaction. Delivery (pooled SMTP, retries) happens in app.services.email_queue.
+    """
+
+    async def send_verification_email(self, db: AsyncSession, email: List[EmailStr], token: str):
+        """Queue account verification email"""
         verify_url = f"http://localhost:3000/verify-email?token={token}"
         
         html = f"""
@@ -30,25 +21,13 @@ class EmailService:
         <p>{verify_url}</p>
         """
 
-        message = MessageSchema(
-            subject="Verify your Account - AI LMS",
-            recipients=email,
-            body=html,
-            subtype=MessageType.html
-        )
-
-        fm = FastMail(conf)
-        
-        # 👇 PRINT LOGS ADDED HERE
-        print(f"➡️ Attempting to send verification email to: {email}")
-        try:
-            await fm.send_message(message)
-            print(f"✅ Verification email sent successfully to: {email}")
-        except Exception as e:
-            print(f"❌ Failed to send verification email. Error: {str(e)}")
+        # The queue/transport stack is only imported once an email is actually sent
+        from app.services.email_queue import enqueue_email
+        await enqueue_email(db, email, "Verify your Account - AI LMS", html)
+        print(f"➡️ Verification email queued for: {email}")
 
-    async def send_password_reset_email(self, email: List[EmailStr], token: str):
-        """Send password reset email"""
+    async def send_password_reset_email(self, db: AsyncSession, email: List[EmailStr], token: str):
+        """Queue password reset email"""
         reset_url = f"http://localhost:3000/reset-password?token={token}"
         
         html = f"""
@@ -59,19 +38,6 @@ class EmailService:
         <p>If you didn't request this, please ignore this email.</p>
         """
 
-        message = MessageSchema(
-            subject="Reset Your Password - AI LMS",
-            recipients=email,
-            body=html,
-            subtype=MessageType.html
-        )
-
-        fm = FastMail(conf)
-
-        # 👇 PRINT LOGS ADDED HERE
-        print(f"➡️ Attempting to send password reset email to: {email}")
-        try:
-            await fm.send_message(message)
-            print(f"✅ Password reset email sent successfully to: {email}")
-        except Exception as e:
-            print(f"❌ Failed to send password reset email. Error: {str(e)}")
\ No newline at end of file
+        from app.services.email_queue import enqueue_email
+        await enqueue_email(db, email, "Reset Your Password - AI LMS", html)
+        print(f"➡️ Password reset email queued for: {email}")
@@ -0,0 +1,180 @@
+# File: backend/app/services/enrollment_counter.py
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import Counter, Gauge, registry
+from app.core.response_cache import response_cache
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+
+logger = logging.getLogger(__name__)
+
+enrollment_count_flushes = registry.register(Counter(
+    "enrollment_count_flushes_total", "Batched enrollment_count UPDATEs", ["outcome"],
+))
+
+
+class EnrollmentCounterBuffer:
+    """
+    Coalesces Course.enrollment_count changes in memory and writes them in
+    batches.
+
+    Updating the counter inside every enroll transaction would make all
+    enrollments in a popular course queue on that one row lock. Instead,
+    enroll/unenroll only record a +1/-1 here. Every `flush_interval`
+    seconds (sooner once `max_pending` courses are waiting) the net delta
+    per course goes out as one executemany `SET enrollment_count =
+    enrollment_count + :delta`. Each process holds one short row lock per
+    course per interval, whatever the enrollment rate. Courses are updated
+    in id order, so concurrent flushes from several workers can't deadlock.
+
+    Cached course responses embed the count, so a flush that changed counts
+    invalidates the "courses" response cache, at most once every
+    `cache_interval` seconds so a steady stream of enrollments doesn't keep
+    the catalogue cache permanently cold.
+
+    Counts therefore lag by up to one interval (plus `cache_interval` for
+    cached responses), and deltas still in memory
+    when a process is killed are lost. recount() rebuilds the counts from
+    the enrollments table.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_pending: int = 1000, cache_interval: float = 10.0):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.cache_interval = cache_interval
+        self._cache_stale = False
+        self._cache_invalidated_at = float("-inf")
+        self._deltas: Dict[int, int] = defaultdict(int)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def increment(self, course_id: int, delta: int = 1):
+        self._deltas[course_id] += delta
+        if len(self._deltas) >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._deltas)
+
+    async def flush(self) -> int:
+        """Write out the buffered deltas; returns how many courses were updated."""
+        deltas, self._deltas = self._deltas, defaultdict(int)
+        params = [
+            {"course_id": course_id, "delta": delta}
+            for course_id, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not params:
+            await self._invalidate_cache()
+            return 0
+        courses = Course.__table__
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(courses)
+                    .where(courses.c.id == bindparam("course_id"))
+                    # updated_at kept as is: a counter bump isn't an edit of the course
+                    .values(
+                        enrollment_count=courses.c.enrollment_count + bindparam("delta"),
+                        updated_at=courses.c.updated_at,
+                    ),
+                    params,
+                )
+                await db.commit()
+        except BaseException:
+            # Put them back (also when cancelled); the next round retries
+            for row in params:
+                self._deltas[row["course_id"]] += row["delta"]
+            enrollment_count_flushes.inc("error")
+            raise
+        enrollment_count_flushes.inc("ok")
+        self._cache_stale = True
+        await self._invalidate_cache()
+        return len(params)
+
+    async def _invalidate_cache(self, force: bool = False):
+        # A later (possibly empty) round invalidates what this one had to skip
+        if not self._cache_stale:
+            return
+        now = time.monotonic()
+        if force or now - self._cache_invalidated_at >= self.cache_interval:
+            self._cache_stale = False
+            self._cache_invalidated_at = now
+            await response_cache.invalidate("courses")
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="enrollment-counter-flush")
+
+    async def stop(self):
+        if self._task is not None:
+            # Not cancelled: a flush in progress is allowed to finish
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        # Last chance for whatever is still buffered
+        try:
+            await self.flush()
+            await self._invalidate_cache(force=True)
+        except Exception:
+            logger.exception("Final enrollment count flush failed; %d course(s) not updated", self.pending())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Enrollment count flush failed")
+
+
+async def recount(db: AsyncSession, course_ids=None):
+    """Reset enrollment_count from the enrollments table (all courses, or just `course_ids`)."""
+    count = (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Course)
+        .values(enrollment_count=count, updated_at=Course.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    if course_ids is not None:
+        stmt = stmt.where(Course.id.in_(course_ids))
+    await db.execute(stmt)
+    await db.commit()
+
+
+enrollment_counter = EnrollmentCounterBuffer(
+    flush_interval=settings.ENROLLMENT_COUNT_FLUSH_SECONDS,
+    max_pending=settings.ENROLLMENT_COUNT_MAX_PENDING,
+    cache_interval=settings.ENROLLMENT_COUNT_CACHE_SECONDS,
+)
+
+registry.register(Gauge(
+    "enrollment_count_pending",
+    "Courses with enrollment_count changes waiting to be flushed",
+    lambda: [({}, enrollment_counter.pending())],
+))
@@ -0,0 +1,214 @@
+# File: backend/app/services/progress_buffer.py
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, case, exists, not_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import Counter, Gauge, registry
+from app.models.base import utcnow
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.lesson import Lesson, LessonProgress
+from app.schemas.auth import Principal
+from app.services.write_service import upsert
+
+logger = logging.getLogger(__name__)
+
+ProgressKey = Tuple[UUID, int]  # (user_id, lesson_id)
+
+progress_heartbeats = registry.register(Counter(
+    "progress_heartbeats_total", "Lesson progress heartbeats accepted",
+))
+progress_rows_written = registry.register(Counter(
+    "progress_rows_written_total", "lesson_progress rows upserted by the buffer",
+))
+progress_flushes = registry.register(Counter(
+    "progress_flushes_total", "Progress buffer flushes", ["outcome"],
+))
+
+
+class ProgressBuffer:
+    """
+    Write-coalescing buffer for video progress heartbeats.
+
+    A heartbeat only replaces the (user, lesson) entry in memory; the latest
+    position wins and `completed` is sticky. Every `flush_interval` seconds
+    (sooner once `max_pending` pairs are buffered) the entries go out as
+    multi-row INSERT ... ON CONFLICT DO UPDATE statements of up to
+    `batch_size` rows each, in key order. Database writes therefore scale
+    with the number of users actively watching, not with the heartbeat
+    rate: a user sending a heartbeat every 5s costs one row per flush.
+
+    Unflushed positions are served by get() for read-your-writes, and a
+    killed process loses at most one interval of positions.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, batch_size: int = 1000, max_pending: int = 50000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._entries: Dict[ProgressKey, dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+    def record(self, user_id: UUID, lesson_id: int, position_seconds: float, completed: bool = False):
+        key = (user_id, lesson_id)
+        previous = self._entries.get(key)
+        self._entries[key] = {
+            "user_id": user_id,
+            "lesson_id": lesson_id,
+            "position_seconds": position_seconds,
+            "completed": completed or (previous is not None and previous["completed"]),
+            "updated_at": utcnow(),
+        }
+        progress_heartbeats.inc()
+        if len(self._entries) >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    def get(self, user_id: UUID, lesson_id: int) -> Optional[dict]:
+        return self._entries.get((user_id, lesson_id))
+
+    def pending(self) -> int:
+        return len(self._entries)
+
+    async def _write(self, rows: List[dict]):
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(rows), self.batch_size):
+                stmt = upsert(db, LessonProgress).values(rows[start:start + self.batch_size])
+                # Workers flush independently, so a row can arrive older than
+                # what's stored: it may still set `completed`, never move the
+                # position back
+                newer = stmt.excluded.updated_at > LessonProgress.updated_at
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[LessonProgress.user_id, LessonProgress.lesson_id],
+                    set_={
+                        "position_seconds": case(
+                            (newer, stmt.excluded.position_seconds), else_=LessonProgress.position_seconds,
+                        ),
+                        "completed": or_(LessonProgress.completed, stmt.excluded.completed),
+                        "updated_at": case((newer, stmt.excluded.updated_at), else_=LessonProgress.updated_at),
+                    },
+                    where=or_(newer, and_(stmt.excluded.completed, not_(LessonProgress.completed))),
+                )
+                await db.execute(stmt)
+            await db.commit()
+
+    async def flush(self) -> int:
+        """Upsert everything buffered; returns the number of rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            entries, self._entries = self._entries, {}
+            if not entries:
+                return 0
+            # Key order keeps row locks in the same order across workers
+            rows = [entries[key] for key in sorted(entries, key=lambda k: (str(k[0]), k[1]))]
+            try:
+                await self._write(rows)
+            except BaseException:
+                # Also on cancellation: the rows were swapped out and must not be lost.
+                # Re-buffer unless a newer heartbeat has replaced the entry meanwhile
+                for key, row in entries.items():
+                    current = self._entries.get(key)
+                    if current is None:
+                        self._entries[key] = row
+                    elif row["completed"]:
+                        current["completed"] = True
+                progress_flushes.inc("error")
+                raise
+            progress_flushes.inc("ok")
+            progress_rows_written.inc(amount=len(rows))
+            return len(rows)
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="progress-flush")
+
+    async def stop(self):
+        if self._task is not None:
+            # Not cancelled: a flush in progress is allowed to finish
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        # Whatever arrived while the last round was writing
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final progress flush failed; %d position(s) lost", self.pending())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Progress flush failed")
+
+
+progress_buffer = ProgressBuffer(
+    flush_interval=settings.PROGRESS_FLUSH_SECONDS,
+    batch_size=settings.PROGRESS_FLUSH_BATCH_SIZE,
+    max_pending=settings.PROGRESS_MAX_PENDING,
+)
+
+registry.register(Gauge(
+    "progress_buffer_pending",
+    "(user, lesson) positions waiting to be flushed",
+    lambda: [({}, progress_buffer.pending())],
+))
+
+
+# lesson_id -> course_id. Heartbeats for unknown lessons are rejected here,
+# so one bad id can't fail a whole batched upsert on the foreign key
+lesson_courses = TTLCache(max_size=100_000, ttl=300)
+
+
+async def lesson_course_id(db: AsyncSession, lesson_id: int) -> Optional[int]:
+    course_id = lesson_courses.get(lesson_id)
+    if course_id is None:
+        course_id = (await db.execute(select(Lesson.course_id).where(Lesson.id == lesson_id))).scalar()
+        if course_id is not None:
+            lesson_courses.set(lesson_id, course_id)
+    return course_id
+
+
+
+# (user_id, course_id) pairs allowed to record progress: students enrolled in
+# the course and its instructor (admins skip the lookup). Only grants are
+# cached, so progress is accepted right after enrolling; unenrolling evicts
+# the pair here, and the TTL bounds it on other workers
+progress_access = TTLCache(max_size=100_000, ttl=300)
+
+
+async def can_record_progress(db: AsyncSession, user: Principal, course_id: int) -> bool:
+    if user.role == "admin":
+        return True
+    key = (user.id, course_id)
+    if progress_access.get(key):
+        return True
+    allowed = (await db.execute(select(or_(
+        exists().where(Enrollment.user_id == user.id, Enrollment.course_id == course_id),
+        exists().where(Course.id == course_id, Course.instructor_id == user.id),
+    )))).scalar()
+    if allowed:
+        progress_access.set(key, True)
+    return bool(allowed)
\ No newline at end of file
@@ -0,0 +1,157 @@
+# File: backend/app/services/search_service.py
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Optional
+
+from sqlalchemy import Select, case, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.user import User
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Generated tsvector column created by the search migration (Postgres only,
+# not mapped on the model so SQLite can still create the schema).
+course_search_vector = literal_column("courses.search_vector")
+search_config = literal_column("'english'::regconfig")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class InMemorySearchIndex:
+    """
+    Small inverted index (token -> {doc_id: weighted term frequency}) used
+    when the database has no full-text search (SQLite in tests/dev).
+    Title matches weigh more than description matches, like the
+    setweight('A'/'B') split on the Postgres side.
+    """
+
+    title_weight = 2.0
+    description_weight = 1.0
+
+    def __init__(self):
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self.doc_tokens: dict[int, set[str]] = {}
+        self.loaded = False
+
+    def add(self, doc_id: int, title: Optional[str], description: Optional[str] = None):
+        self.remove(doc_id)
+        weights: Counter = Counter()
+        for token in tokenize(title):
+            weights[token] += self.title_weight
+        for token in tokenize(description):
+            weights[token] += self.description_weight
+        for token, weight in weights.items():
+            self.postings[token][doc_id] = weight
+        self.doc_tokens[doc_id] = set(weights)
+
+    def remove(self, doc_id: int):
+        for token in self.doc_tokens.pop(doc_id, ()):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[token]
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[tuple[int, float]]:
+        """Return (doc_id, score) pairs, best first. All query terms must match."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        candidates: Optional[set[int]] = None
+        for term in terms:
+            docs = set(self.postings.get(term, ()))
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+
+        total = len(self.doc_tokens) or 1
+        scores = {}
+        for doc_id in candidates:
+            score = 0.0
+            for term in terms:
+                docs = self.postings[term]
+                idf = math.log(1 + total / len(docs))
+                score += (1 + math.log(docs[doc_id])) * idf
+            scores[doc_id] = score
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit] if limit else ranked
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if self.loaded:
+            return
+        result = await db.execute(select(Course.id, Course.title, Course.description))
+        for row in result:
+            self.add(row.id, row.title, row.description)
+        self.loaded = True
+
+
+course_search_index = InMemorySearchIndex()
+
+
+def _uses_postgres(db: AsyncSession) -> bool:
+    return db.bind.dialect.name == "postgresql"
+
+
+async def search_courses(db: AsyncSession, query: Select, search: str):
+    """
+    Filter a Course query by a free-text search.
+
+    Returns the filtered query and a rank expression (higher is better, or
+    None when there is nothing to rank by) the caller can order by. On Postgres this is the GIN-indexed tsvector plus a
+    pg_trgm-indexed substring match on the title; elsewhere it falls back to
+    the in-memory inverted index.
+    """
+    pattern = f"%{search}%"
+    if _uses_postgres(db):
+        ts_query = func.websearch_to_tsquery(search_config, search)
+        rank = func.ts_rank_cd(course_search_vector, ts_query)
+        query = query.filter(
+            or_(course_search_vector.op("@@")(ts_query), Course.title.ilike(pattern))
+        )
+        return query, rank
+
+    await course_search_index.ensure_loaded(db)
+    ranked = course_search_index.search(search)
+    if not ranked:
+        return query.filter(Course.title.ilike(pattern)), None
+    rank = case({doc_id: score for doc_id, score in ranked}, value=Course.id, else_=0.0)
+    query = query.filter(
+        or_(Course.id.in_([doc_id for doc_id, _ in ranked]), Course.title.ilike(pattern))
+    )
+    return query, rank
+
+
+def search_users(db: AsyncSession, query: Select, search: str):
+    """
+    Filter a User query by email/username/full name substring.
+
+    The ILIKE patterns are served by pg_trgm GIN indexes on Postgres, ranked
+    by trigram similarity; other databases get no rank (None).
+    """
+    pattern = f"%{search}%"
+    query = query.filter(
+        or_(
+            User.email.ilike(pattern),
+            User.username.ilike(pattern),
+            User.full_name.ilike(pattern),
+        )
+    )
+    if not _uses_postgres(db):
+        return query, None
+    rank = func.greatest(
+        func.similarity(User.email, search),
+        func.similarity(User.username, search),
+        func.similarity(func.coalesce(User.full_name, ""), search),
+    )
+    return query, rank
+
+
+def index_course(course: Course):
+    """Keep the in-memory fallback index in step with writes."""
+    if course_search_index.loaded:
+        course_search_index.add(course.id, course.title, course.description)
@@ -0,0 +1,424 @@
+# File: backend/app/services/semantic_search.py
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.course import Course
+from app.services.search_service import tokenize
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Offline semantic search over course titles + descriptions.
+#
+# Each course becomes a hashed TF-IDF embedding: unigrams and bigrams are
+# hashed (with a random sign) into SEMANTIC_INDEX_DIM buckets, weighted by
+# sublinear term frequency and an IDF taken from a hashed document-frequency
+# table, then L2-normalized. Cosine similarity is then a dot product, so a
+# query is one matrix-vector product over the whole index plus argpartition
+# for the top k. No model server, no network.
+#
+# The index lives in SEMANTIC_INDEX_DIR as memory-mapped files. Every worker
+# maps the same pages from the OS page cache instead of holding its own copy:
+#
+#   meta.json              count, capacity, dim, generation
+#   vectors-<gen>.f32      float32 [capacity, dim], rows 0..count-1 in use
+#   ids-<gen>.i64          course id per row
+#   df-<gen>.i32           hashed document frequencies (for IDF)
+#
+# New courses are appended in place, under an flock. A full rebuild writes a
+# new generation and swaps meta.json atomically. Readers notice either change
+# with one os.stat per query, and search one IndexSnapshot (meta + arrays of
+# the same generation) from start to finish.
+
+DF_BUCKETS = 1 << 18
+TITLE_WEIGHT = 2.0
+BIGRAM_WEIGHT = 0.5
+SCAN_BLOCK_ROWS = 65536  # rows scored per matmul; bounds the temporary score matrix
+
+
+@lru_cache(maxsize=1 << 18)
+def _feature_hash(feature: str) -> int:
+    # crc32 is stable across processes (str hash() is randomized per process)
+    return zlib.crc32(feature.encode())
+
+
+def course_features(title: Optional[str], description: Optional[str] = None) -> Dict[str, float]:
+    """Weighted unigrams + bigrams; title terms count double."""
+    weights: Counter = Counter()
+    for text, weight in ((title, TITLE_WEIGHT), (description, 1.0)):
+        tokens = tokenize(text)
+        for token in tokens:
+            weights[token] += weight
+        for first, second in zip(tokens, tokens[1:]):
+            weights[f"{first} {second}"] += weight * BIGRAM_WEIGHT
+    return weights
+
+
+class HashedEmbedder:
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed(self, features: Dict[str, float], df: np.ndarray, n_docs: int) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in features.items():
+            h = _feature_hash(feature)
+            idf = math.log((1 + n_docs) / (1 + int(df[h % DF_BUCKETS]))) + 1.0
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(weight)) * idf
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def count_df(features: Dict[str, float], df: np.ndarray):
+        for feature in features:
+            df[_feature_hash(feature) % DF_BUCKETS] += 1
+
+
+def top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best `k` rows of `vectors` for each row of `queries` by dot product.
+
+    Scans in blocks of SCAN_BLOCK_ROWS: each block is one matmul for all
+    queries, and argpartition keeps only the block's top k per query, which
+    is merged with the running top k. Returns (rows, scores), each shaped
+    [n_queries, k'], best first (k' = min(k, len(vectors))).
+    """
+    n_queries, n_rows = len(queries), len(vectors)
+    k = min(k, n_rows)
+    if k <= 0:
+        return np.empty((n_queries, 0), dtype=np.int64), np.empty((n_queries, 0), dtype=np.float32)
+
+    best_rows = np.empty((n_queries, 0), dtype=np.int64)
+    best_scores = np.empty((n_queries, 0), dtype=np.float32)
+    for start in range(0, n_rows, SCAN_BLOCK_ROWS):
+        scores = queries @ vectors[start:start + SCAN_BLOCK_ROWS].T  # [n_queries, block]
+        if scores.shape[1] > k:
+            part = np.argpartition(scores, -k, axis=1)[:, -k:]
+        else:
+            part = np.broadcast_to(np.arange(scores.shape[1]), (n_queries, scores.shape[1]))
+        candidate_rows = np.concatenate([best_rows, part + start], axis=1)
+        candidate_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+        if candidate_rows.shape[1] > k:
+            keep = np.argpartition(candidate_scores, -k, axis=1)[:, -k:]
+            candidate_rows = np.take_along_axis(candidate_rows, keep, axis=1)
+            candidate_scores = np.take_along_axis(candidate_scores, keep, axis=1)
+        best_rows, best_scores = candidate_rows, candidate_scores
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+class IndexSnapshot(NamedTuple):
+    """One generation's mapped arrays with the meta that describes them."""
+
+    meta: dict
+    stamp: tuple
+    vectors: np.ndarray
+    ids: np.ndarray
+    df: np.ndarray
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+
+class SemanticIndex:
+    """Memory-mapped course embedding matrix, shared by every worker on the host."""
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.embedder = HashedEmbedder(dim)
+        self.dim = dim
+        # Replaced by a single assignment, never modified: searches running
+        # in threads keep whichever snapshot they started with
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._refresh_lock = threading.Lock()
+
+    # ---- files ---------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _files(self, generation: int) -> Tuple[str, str, str]:
+        return (
+            self._path(f"vectors-{generation}.f32"),
+            self._path(f"ids-{generation}.i64"),
+            self._path(f"df-{generation}.i32"),
+        )
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_meta(self, any_dim: bool = False) -> Optional[dict]:
+        try:
+            with open(self._path("meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Another dim means the index needs a rebuild before it can be used
+        return meta if any_dim or meta.get("dim") == self.dim else None
+
+    def _write_meta(self, meta: dict):
+        tmp = self._path(f"meta.json.{os.getpid()}")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path("meta.json"))
+
+    def _map(self, meta: dict, mode: str = "r"):
+        vectors_path, ids_path, df_path = self._files(meta["generation"])
+        capacity = meta["capacity"]
+        return (
+            np.memmap(vectors_path, dtype=np.float32, mode=mode, shape=(capacity, self.dim)),
+            np.memmap(ids_path, dtype=np.int64, mode=mode, shape=(capacity,)),
+            np.memmap(df_path, dtype=np.int32, mode=mode, shape=(DF_BUCKETS,)),
+        )
+
+    def refresh(self) -> Optional[IndexSnapshot]:
+        """Current index, with appends/rebuilds from other processes picked up. None if there is none yet."""
+        try:
+            stat = os.stat(self._path("meta.json"))
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.stamp == stamp:
+                return snapshot
+            meta = self._read_meta()
+            if meta is None:
+                self._snapshot = None
+                return None
+            if (
+                snapshot is not None
+                and meta["generation"] == snapshot.meta["generation"]
+                and meta["capacity"] == snapshot.meta["capacity"]
+            ):
+                # Appends only: same files, more rows in use
+                arrays = (snapshot.vectors, snapshot.ids, snapshot.df)
+            else:
+                arrays = self._map(meta)
+            self._snapshot = snapshot = IndexSnapshot(meta, stamp, *arrays)
+            return snapshot
+
+    @property
+    def meta(self) -> Optional[dict]:
+        snapshot = self._snapshot
+        return snapshot.meta if snapshot is not None else None
+
+    @property
+    def count(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.count if snapshot is not None else 0
+
+    # ---- writing -------------------------------------------------------
+
+    def build(
+        self,
+        rows: Sequence[Tuple[int, Optional[str], Optional[str]]],
+        headroom: float = 0.25,
+        replace: bool = True,
+    ):
+        """
+        Write a fresh generation from (course_id, title, description) rows and
+        switch to it. With replace=False a usable index is left alone (several
+        workers starting at once build it only once).
+        """
+        with self._locked():
+            old = self._read_meta(any_dim=True)
+            if replace or old is None or old.get("dim") != self.dim:
+                self._write_generation(rows, old, headroom)
+        self.refresh()
+
+    def _write_generation(self, rows, old: Optional[dict], headroom: float):
+        """Called with the lock held."""
+        generation = (old["generation"] + 1) if old else 1
+        capacity = max(1024, int(len(rows) * (1 + headroom)))
+        vectors_path, ids_path, df_path = self._files(generation)
+        for path, size in ((vectors_path, capacity * self.dim * 4), (ids_path, capacity * 8), (df_path, DF_BUCKETS * 4)):
+            with open(path, "wb") as f:
+                f.truncate(size)
+        meta = {"dim": self.dim, "generation": generation, "capacity": capacity, "count": len(rows), "n_docs": len(rows)}
+        vectors, ids, df = self._map(meta, mode="r+")
+
+        # Two passes: document frequencies first, then IDF-weighted vectors
+        df[:] = 0
+        for _, title, description in rows:
+            self.embedder.count_df(course_features(title, description), df)
+        for row, (course_id, title, description) in enumerate(rows):
+            vectors[row] = self.embedder.embed(course_features(title, description), df, len(rows))
+            ids[row] = course_id
+        for array in (vectors, ids, df):
+            array.flush()
+        del vectors, ids, df
+
+        self._write_meta(meta)
+        if old:
+            # Processes still mapping the old files keep them alive until they remap
+            for path in self._files(old["generation"]):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def add(self, course_id: int, title: Optional[str], description: Optional[str] = None) -> bool:
+        """Append one course in place. Returns False if there is no index to append to."""
+        with self._locked():
+            meta = self._read_meta()
+            if meta is None:
+                return False
+            if meta["count"] >= meta["capacity"]:
+                capacity = meta["capacity"] * 2
+                vectors_path, ids_path, _ = self._files(meta["generation"])
+                os.truncate(vectors_path, capacity * self.dim * 4)
+                os.truncate(ids_path, capacity * 8)
+                meta["capacity"] = capacity
+            vectors, ids, df = self._map(meta, mode="r+")
+            features = course_features(title, description)
+            self.embedder.count_df(features, df)
+            meta["n_docs"] += 1
+            row = meta["count"]
+            vectors[row] = self.embedder.embed(features, df, meta["n_docs"])
+            ids[row] = course_id
+            for array in (vectors, ids, df):
+                array.flush()
+            del vectors, ids, df
+            meta["count"] = row + 1
+            self._write_meta(meta)
+        self.refresh()
+        return True
+
+    # ---- reading -------------------------------------------------------
+
+    def embed_query(
+        self, title: Optional[str], description: Optional[str] = None, snapshot: Optional[IndexSnapshot] = None,
+    ) -> np.ndarray:
+        snapshot = snapshot if snapshot is not None else self.refresh()
+        return self.embedder.embed(course_features(title, description), snapshot.df, snapshot.meta["n_docs"])
+
+    def search_vectors(
+        self, queries: np.ndarray, k: int, snapshot: Optional[IndexSnapshot] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: (course_id, cosine score) per query, best first."""
+        snapshot = snapshot if snapshot is not None else self.refresh()
+        if snapshot is None or snapshot.count == 0:
+            return [[] for _ in range(len(queries))]
+        rows, scores = top_k(snapshot.vectors[:snapshot.count], np.asarray(queries, dtype=np.float32), k)
+        ids = snapshot.ids[rows]
+        return [
+            [(int(course_id), float(score)) for course_id, score in zip(id_row, score_row)]
+            for id_row, score_row in zip(ids, scores)
+        ]
+
+    def search(self, text: str, k: int) -> List[Tuple[int, float]]:
+        return self.similar(text, None, k)
+
+    def similar(self, title: Optional[str], description: Optional[str], k: int) -> List[Tuple[int, float]]:
+        snapshot = self.refresh()
+        if snapshot is None:
+            return []
+        return self.search_vectors(self.embed_query(title, description, snapshot)[None, :], k, snapshot)[0]
+
+
+semantic_index = SemanticIndex(settings.SEMANTIC_INDEX_DIR, settings.SEMANTIC_INDEX_DIM)
+
+_build_task: Optional[asyncio.Task] = None
+
+
+async def _build_missing_index():
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Course.id, Course.title, Course.description).order_by(Course.id))
+            rows = [tuple(row) for row in result]
+        logger.info("Building semantic index for %d courses", len(rows))
+        await asyncio.to_thread(semantic_index.build, rows, replace=False)
+    except Exception:
+        logger.exception("Semantic index build failed; run scripts/build_semantic_index.py")
+
+
+def start_semantic_index_build():
+    """
+    Build the index from the courses table in the background if no process
+    has yet (called from the app's lifespan). Searches answer 503 until then.
+    """
+    global _build_task
+    if _build_task is None and semantic_index.refresh() is None:
+        _build_task = asyncio.create_task(_build_missing_index(), name="semantic-index-build")
+
+
+def _require_index():
+    if semantic_index.refresh() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic search index is being built",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+
+async def _published(db: AsyncSession, ranked: Iterable[Tuple[int, float]], limit: int, min_score: float):
+    ranked = [(course_id, score) for course_id, score in ranked if score >= min_score]
+    if not ranked:
+        return []
+    result = await db.execute(
+        select(Course).where(Course.id.in_([course_id for course_id, _ in ranked]), Course.is_published == True)
+    )
+    courses = {course.id: course for course in result.scalars()}
+    hits = [(courses[course_id], score) for course_id, score in ranked if course_id in courses]
+    return hits[:limit]
+
+
+async def semantic_search_courses(db: AsyncSession, text: str, limit: int) -> List[Tuple[Course, float]]:
+    """Published courses closest to a free-text query, as (course, score)."""
+    _require_index()
+    # Over-fetch: unpublished courses are in the index and dropped here
+    ranked = await asyncio.to_thread(semantic_index.search, text, limit * settings.SEMANTIC_SEARCH_OVERSAMPLE)
+    return await _published(db, ranked, limit, settings.SEMANTIC_SEARCH_MIN_SCORE)
+
+
+async def similar_courses(db: AsyncSession, course: Course, limit: int) -> List[Tuple[Course, float]]:
+    _require_index()
+    ranked = await asyncio.to_thread(
+        semantic_index.similar, course.title, course.description, (limit + 1) * settings.SEMANTIC_SEARCH_OVERSAMPLE
+    )
+    ranked = [(course_id, score) for course_id, score in ranked if course_id != course.id]
+    return await _published(db, ranked, limit, settings.SEMANTIC_SEARCH_MIN_SCORE)
+
+
+async def index_course_vector(course: Course):
+    """Append a new course to the shared index (no-op until the index exists)."""
+    try:
+        await asyncio.to_thread(semantic_index.add, course.id, course.title, course.description)
+    except OSError:
+        # The course is already committed; the next rebuild picks it up
+        logger.exception("Could not add course %s to the semantic index", course.id)
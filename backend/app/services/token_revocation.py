@@ -0,0 +1,221 @@
+# File: backend/app/services/token_revocation.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import Gauge, registry
+from app.models.base import utcnow
+from app.models.token_revocation import TokenRevocation
+from app.models.user import User
+from app.services.write_service import insert_ignoring_conflicts
+
+logger = logging.getLogger(__name__)
+
+# Changing any of these makes outstanding tokens wrong (they're embedded as
+# claims, or the change is a password reset), so they bump token_version
+REVOKING_FIELDS = frozenset({"email", "role", "is_active", "hashed_password"})
+
+
+def bump_token_version(values: dict) -> bool:
+    """Add a token_version increment to an UPDATE's values if it changes a revoking field."""
+    if REVOKING_FIELDS.isdisjoint(values):
+        return False
+    values["token_version"] = User.token_version + 1
+    return True
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:  # SQLite hands back naive UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _claim_expiry(claims: dict) -> datetime:
+    return datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+
+
+class TokenRevocationList:
+    """
+    In-memory view of the live "access" rows in `token_revocations`.
+
+    is_revoked() is a couple of dict lookups, so access tokens are checked
+    on every request without touching the database. Each process reloads
+    the table every TOKEN_REVOCATION_SYNC_SECONDS, so a revocation made by
+    another process takes effect within that interval (immediately in the
+    process that made it). The entries only live as long as the access
+    tokens they cover, so the set stays small and is kept exact rather than
+    approximated with a Bloom filter.
+
+    Refresh tokens are only ever checked in /auth/refresh, which goes to
+    the database anyway, so their revocations are never loaded here.
+    """
+
+    # Local revocations survive a reload for this long, covering the gap
+    # between revoking and the caller's transaction becoming visible
+    local_grace_seconds = 60
+
+    def __init__(self, sync_interval: float = 5.0):
+        self.sync_interval = sync_interval
+        self._jtis: Dict[str, float] = {}
+        self._min_versions: Dict[str, Tuple[int, float]] = {}
+        self._local: List[Tuple[float, str, str, int, float]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.last_synced_at: Optional[float] = None
+
+    # ---- lookups -------------------------------------------------------
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        if jti is not None and jti in self._jtis:
+            return True
+        uid = claims.get("uid")
+        if uid is not None:
+            entry = self._min_versions.get(uid)
+            if entry is not None and claims.get("ver", 0) < entry[0]:
+                return True
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "revoked_jtis": len(self._jtis),
+            "revoked_users": len(self._min_versions),
+            "last_synced_at": self.last_synced_at,
+        }
+
+    # ---- revoking ------------------------------------------------------
+
+    def _apply(self, key_kind: str, key: str, version: int, expires: float):
+        if key_kind == "jti":
+            self._jtis[key] = expires
+        else:
+            current = self._min_versions.get(key)
+            if current is None or version > current[0]:
+                self._min_versions[key] = (version, expires)
+
+    def _apply_local(self, key_kind: str, key: str, version: int, expires: float):
+        self._apply(key_kind, key, version, expires)
+        self._local.append((time.monotonic(), key_kind, key, version, expires))
+
+    def revoke_users(self, db: AsyncSession, users: Iterable[Tuple[UUID, int]]):
+        """
+        Revoke every access token issued to `users` before their current
+        token_version. Call after bumping users.token_version in `db`; the
+        rows are committed with the caller's transaction.
+        """
+        expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        rows = [
+            TokenRevocation(kind="access", user_id=user_id, token_version=version, expires_at=expires_at)
+            for user_id, version in users
+        ]
+        db.add_all(rows)
+        for row in rows:
+            self._apply_local("user", str(row.user_id), row.token_version, expires_at.timestamp())
+
+    async def revoke_token(self, db: AsyncSession, claims: dict) -> bool:
+        """
+        Revoke one access/refresh token by its jti.
+
+        Returns False if it was already revoked (a reused refresh token).
+        """
+        kind = claims.get("type", "access")
+        expires_at = _claim_expiry(claims)
+        result = await db.execute(
+            insert_ignoring_conflicts(db, TokenRevocation)
+            .values(
+                kind=kind,
+                jti=claims["jti"],
+                user_id=UUID(claims["uid"]) if claims.get("uid") else None,
+                expires_at=expires_at,
+            )
+            .returning(TokenRevocation.id)
+        )
+        revoked = result.scalar() is not None
+        if revoked and kind == "access":
+            self._apply_local("jti", claims["jti"], 0, expires_at.timestamp())
+        return revoked
+
+    # ---- syncing -------------------------------------------------------
+
+    async def sync(self):
+        now = utcnow()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    TokenRevocation.jti,
+                    TokenRevocation.user_id,
+                    TokenRevocation.token_version,
+                    TokenRevocation.expires_at,
+                ).where(TokenRevocation.kind == "access", TokenRevocation.expires_at > now)
+            )
+            rows = result.all()
+
+        # Rebuild from scratch, then re-apply recent local revocations that
+        # may not have been committed/visible when the query ran
+        self._jtis, self._min_versions = {}, {}
+        for jti, user_id, version, expires_at in rows:
+            if jti is not None:
+                self._apply("jti", jti, 0, _timestamp(expires_at))
+            elif user_id is not None:
+                self._apply("user", str(user_id), version, _timestamp(expires_at))
+        cutoff = time.monotonic() - self.local_grace_seconds
+        self._local = [entry for entry in self._local if entry[0] >= cutoff]
+        for _, key_kind, key, version, expires in self._local:
+            self._apply(key_kind, key, version, expires)
+        self.last_synced_at = time.time()
+
+    async def purge_expired(self):
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= utcnow()))
+            await db.commit()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="token-revocation-sync")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        rounds = 0
+        while True:
+            try:
+                await self.sync()
+                # Expired rows are dead weight; clear them out now and then
+                if rounds % 100 == 0:
+                    await self.purge_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Token revocation sync failed")
+            rounds += 1
+            await asyncio.sleep(self.sync_interval)
+
+
+token_revocations = TokenRevocationList(sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+
+
+registry.register(Gauge(
+    "token_revocations_active",
+    "Live access-token revocations held in memory",
+    lambda: [
+        ({"kind": "jti"}, token_revocations.stats()["revoked_jtis"]),
+        ({"kind": "user"}, token_revocations.stats()["revoked_users"]),
+    ],
+))
\ No newline at end of file
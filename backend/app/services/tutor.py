@@ -0,0 +1,374 @@
+# File: backend/app/services/tutor.py
+import asyncio
+import importlib
+import json
+import logging
+import re
+import time
+import zlib
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import AdmissionRejected, ConcurrencyBudget, active_budgets
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram, registry
+from app.models.course import Course
+from app.models.lesson import Lesson
+
+logger = logging.getLogger(__name__)
+
+TTFT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RATE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+tutor_generations = registry.register(Counter(
+    "tutor_generations_total", "Tutor generations by how they ended", ["outcome"],
+))
+tutor_tokens = registry.register(Counter(
+    "tutor_tokens_total", "Tokens streamed by the tutor",
+))
+tutor_ttft = registry.register(Histogram(
+    "tutor_time_to_first_token_seconds", "Question received until the first token (includes slot wait)",
+    buckets=TTFT_BUCKETS,
+))
+tutor_token_rate = registry.register(Histogram(
+    "tutor_tokens_per_second", "Decode rate of completed generations, after the first token",
+    buckets=RATE_BUCKETS,
+))
+
+
+class TutorError(Exception):
+    """A generation that ended early; `detail` is safe to show the client."""
+
+    def __init__(self, detail: str, outcome: str = "error"):
+        super().__init__(detail)
+        self.detail = detail
+        self.outcome = outcome
+
+
+@dataclass
+class CourseContext:
+    title: str
+    description: Optional[str]
+    lessons: List[str] = field(default_factory=list)
+
+
+# slug -> CourseContext; questions about the same course skip the database
+course_contexts = TTLCache(max_size=1024, ttl=60)
+
+
+async def course_context(db: AsyncSession, slug: str) -> Optional[CourseContext]:
+    """What the tutor knows about a published course (None if there's no such course)."""
+    context = course_contexts.get(slug)
+    if context is not None:
+        return context
+    course = (await db.execute(
+        select(Course.id, Course.title, Course.description)
+        .where(Course.slug == slug, Course.is_published == True)
+    )).first()
+    if course is None:
+        return None
+    lessons = (await db.execute(
+        select(Lesson.title)
+        .where(Lesson.course_id == course.id)
+        .order_by(Lesson.position, Lesson.id)
+        .limit(settings.TUTOR_CONTEXT_LESSONS)
+    )).scalars().all()
+    context = CourseContext(course.title, course.description, list(lessons))
+    course_contexts.set(slug, context)
+    return context
+
+
+def build_messages(context: CourseContext, question: str) -> List[Dict[str, str]]:
+    """Chat messages for the backend: course material as the system prompt."""
+    lines = [
+        "You are a friendly tutor for an online course. Answer the student's question "
+        "using the course material below, briefly and accurately.",
+        f"Course: {context.title}",
+    ]
+    if context.description:
+        lines.append(f"Description: {context.description}")
+    if context.lessons:
+        lines.append("Lessons: " + "; ".join(context.lessons))
+    return [
+        {"role": "system", "content": "\n".join(lines)},
+        {"role": "user", "content": question},
+    ]
+
+
+# --- Backends ---------------------------------------------------------------
+#
+# A backend is any object with
+#     generate(messages, max_tokens) -> async iterator of text pieces
+#     close() -> awaitable
+# Closing the iterator early (client gone) must stop the generation.
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+
+class StubBackend:
+    """
+    Deterministic stand-in for a model (tests, benchmarks, offline
+    development). The same course and question always give the same
+    answer, built from the course material that shares words with the
+    question, at `token_delay` seconds per token.
+    """
+
+    FILLER = (
+        "Try working through the exercises in that lesson , then revisit the examples "
+        "and explain each step in your own words . Practice makes the ideas stick ."
+    ).split()
+
+    def __init__(self, token_delay: float = 0.02):
+        self.token_delay = token_delay
+
+    def answer(self, messages: List[Dict[str, str]], max_tokens: int) -> List[str]:
+        material = messages[0]["content"].splitlines()[1:]
+        question = messages[-1]["content"]
+        asked = {word.lower() for word in re.findall(r"\w{4,}", question)}
+        relevant = [line for line in material if asked & {w.lower() for w in re.findall(r"\w{4,}", line)}]
+
+        words = ["Good", "question", "!"]
+        for line in relevant or material[:1]:
+            # "Description: ..." -> the text after the label, as one sentence
+            words += ["From", "the", "course", ":"] + _WORD.findall(line.split(": ", 1)[-1].rstrip(".")) + ["."]
+        seed = zlib.crc32(question.encode())
+        length = min(max_tokens, len(words) + 20 + seed % 40)
+        while len(words) < length:
+            words += self.FILLER
+        return [word if i == 0 else " " + word for i, word in enumerate(words[:length])]
+
+    async def generate(self, messages: List[Dict[str, str]], max_tokens: int) -> AsyncIterator[str]:
+        for token in self.answer(messages, max_tokens):
+            await asyncio.sleep(self.token_delay)
+            yield token
+
+    async def close(self):
+        pass
+
+
+class OpenAICompatibleBackend:
+    """
+    Streams from any server speaking the OpenAI chat completions API
+    (OpenAI, vLLM, Ollama, llama.cpp server, ...). Connections are pooled;
+    leaving the stream early closes the upstream request, which stops the
+    generation there too.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str], model: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                import httpx
+            except ImportError:
+                raise RuntimeError("TUTOR_BACKEND=openai needs the httpx package")
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(headers=headers, timeout=self.timeout)
+        return self._client
+
+    async def generate(self, messages: List[Dict[str, str]], max_tokens: int) -> AsyncIterator[str]:
+        body = {"model": self.model, "messages": messages, "max_tokens": max_tokens, "stream": True}
+        async with self._get_client().stream("POST", f"{self.base_url}/chat/completions", json=body) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                text = choices[0].get("delta", {}).get("content")
+                if text:
+                    yield text
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_backend(kind: str):
+    if kind == "stub":
+        return StubBackend(token_delay=settings.TUTOR_STUB_TOKEN_DELAY)
+    if kind == "openai":
+        return OpenAICompatibleBackend(
+            settings.TUTOR_API_BASE,
+            settings.TUTOR_API_KEY,
+            settings.TUTOR_MODEL,
+            settings.TUTOR_REQUEST_TIMEOUT_SECONDS,
+        )
+    if ":" in kind:
+        # Anything else: "package.module:factory" returning a backend
+        module, _, name = kind.partition(":")
+        return getattr(importlib.import_module(module), name)()
+    raise ValueError(f"Unknown TUTOR_BACKEND: {kind}")
+
+
+# --- Generations --------------------------------------------------------------
+
+_END = object()
+
+
+class Generation:
+    """
+    One answer being streamed. Holds a slot of the tutor budget from
+    start_generation() until stream() finishes or release() is called.
+
+    The backend runs in its own task and writes into a queue of at most
+    `buffer_size` tokens; stream() reads from it. When the client reads
+    slower than the model writes, the queue fills and the backend is
+    paused. If it stays full for `slow_client_timeout` seconds the
+    generation is aborted, so a stalled client can't keep a slot (and the
+    model) busy. When the client goes away, the consumer is cancelled and
+    takes the backend task down with it.
+    """
+
+    def __init__(self, backend, budget: ConcurrencyBudget, messages, max_tokens: int,
+                 buffer_size: int, slow_client_timeout: float, requested_at: float):
+        self.backend = backend
+        self.budget = budget
+        self.messages = messages
+        self.max_tokens = max_tokens
+        self.slow_client_timeout = slow_client_timeout
+        self.requested_at = requested_at
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.token_count = 0
+        self.outcome = "cancelled"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.budget.release()
+
+    async def _put(self, item) -> bool:
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return True
+        try:
+            await asyncio.wait_for(self._queue.put(item), timeout=self.slow_client_timeout)
+            return True
+        except asyncio.TimeoutError:
+            # Nothing read for a while: drop what's buffered and tell the reader
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(TutorError("Client is not reading the stream fast enough", "slow_client"))
+            return False
+
+    async def _produce(self):
+        try:
+            async with aclosing(self.backend.generate(self.messages, self.max_tokens)) as pieces:
+                async for piece in pieces:
+                    if self.first_token_at is None:
+                        self.first_token_at = time.perf_counter()
+                        tutor_ttft.observe(self.first_token_at - self.requested_at)
+                    if not await self._put(piece):
+                        return
+            await self._put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Tutor backend failed")
+            await self._put(TutorError("The tutor is unavailable right now"))
+
+    async def stream(self) -> AsyncIterator[str]:
+        """
+        Text as it is generated. Tokens that are already buffered when the
+        reader comes back are joined into one chunk, so a client that fell
+        behind catches up in one write instead of one per token. Raises
+        TutorError if the generation is cut short.
+        """
+        producer = asyncio.create_task(self._produce(), name="tutor-generate")
+        pending = None
+        try:
+            while True:
+                item = pending if pending is not None else await self._queue.get()
+                pending = None
+                if item is _END:
+                    self.outcome = "completed"
+                    return
+                if isinstance(item, TutorError):
+                    self.outcome = item.outcome
+                    raise item
+                parts = [item]
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if not isinstance(item, str):
+                        pending = item
+                        break
+                    parts.append(item)
+                self.token_count += len(parts)
+                yield "".join(parts)
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+            self.release()
+            self.finished_at = time.perf_counter()
+            tutor_generations.inc(self.outcome)
+            tutor_tokens.inc(amount=self.token_count)
+            rate = self.tokens_per_second()
+            if self.outcome == "completed" and rate is not None:
+                tutor_token_rate.observe(rate)
+
+    def tokens_per_second(self) -> Optional[float]:
+        if self.first_token_at is None or self.finished_at is None or self.token_count < 2:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        return (self.token_count - 1) / elapsed if elapsed > 0 else None
+
+    def stats(self) -> dict:
+        rate = self.tokens_per_second()
+        return {
+            "tokens": self.token_count,
+            "ttft_ms": round((self.first_token_at - self.requested_at) * 1000, 1) if self.first_token_at else None,
+            "tokens_per_sec": round(rate, 1) if rate is not None else None,
+        }
+
+
+tutor_backend = create_backend(settings.TUTOR_BACKEND)
+
+# Per worker; shows up in the admission_* gauges as budget="tutor"
+tutor_budget = ConcurrencyBudget(
+    "tutor",
+    settings.TUTOR_MAX_CONCURRENT,
+    settings.TUTOR_MAX_QUEUE,
+    settings.TUTOR_QUEUE_TIMEOUT_SECONDS,
+)
+active_budgets[tutor_budget.name] = tutor_budget
+
+
+async def start_generation(context: CourseContext, question: str) -> Generation:
+    """
+    Wait for a generation slot and return the Generation holding it.
+    Raises AdmissionRejected when the tutor is saturated.
+    """
+    requested_at = time.perf_counter()
+    try:
+        await tutor_budget.acquire()
+    except AdmissionRejected:
+        tutor_generations.inc("rejected")
+        raise
+    return Generation(
+        tutor_backend,
+        tutor_budget,
+        build_messages(context, question),
+        settings.TUTOR_MAX_TOKENS,
+        settings.TUTOR_STREAM_BUFFER_TOKENS,
+        settings.TUTOR_SLOW_CLIENT_TIMEOUT_SECONDS,
+        requested_at,
+    )
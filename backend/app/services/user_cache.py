@@ -0,0 +1,105 @@
+# File: backend/app/services/user_cache.py
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import SharedCache, TTLCache, shared_cache
+from app.core.config import settings
+from app.core.database import mark_recent_write
+from app.models.user import User
+
+# Columns kept in the cache. hashed_password is deliberately left out so it
+# never ends up in Redis; it stays expired on cached instances.
+PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "full_name",
+    "role",
+    "is_active",
+    "is_verified",
+    "token_version",
+    "created_at",
+    "updated_at",
+)
+
+
+def _encode(data: dict) -> bytes:
+    return json.dumps(data, default=str).encode()
+
+
+def _decode(raw: bytes) -> dict:
+    data = json.loads(raw)
+    data["id"] = UUID(data["id"])
+    for field in ("created_at", "updated_at"):
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    return data
+
+
+class UserCache:
+    """
+    Cache of active user principals keyed by token subject (email).
+
+    With a shared tier (Redis) configured, it is the only tier: an entry
+    held in one worker's memory couldn't be invalidated by another, which
+    would keep serving a deactivated or renamed principal until its TTL ran
+    out. Without one (single process), the local TTL+LRU tier is used.
+    With neither, nothing is cached. Every hit returns a fresh detached User, so callers can still
+    `db.add(user)` and commit changes as before.
+    """
+
+    key_prefix = "user-principal:"
+
+    def __init__(self, local: Optional[TTLCache], shared: Optional[SharedCache] = None, ttl: int = 30):
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+
+    async def get(self, subject: str) -> Optional[User]:
+        if self.shared is None:
+            data = self.local.get(subject) if self.local is not None else None
+        else:
+            raw = await self.shared.get(self.key_prefix + subject)
+            data = _decode(raw) if raw is not None else None
+        if data is None:
+            return None
+        return self.to_user(data)
+
+    async def set(self, subject: str, user: User):
+        if not user.is_active:
+            return
+        data = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        if self.shared is None:
+            if self.local is not None:
+                self.local.set(subject, data)
+        else:
+            await self.shared.set(self.key_prefix + subject, _encode(data), ex=self.ttl)
+
+    async def invalidate(self, *subjects: Optional[str]):
+        subjects = [s for s in subjects if s]
+        # The next lookup repopulates the cache; make sure it reads the
+        # primary rather than a replica that may not have the change yet
+        mark_recent_write(*subjects)
+        if self.shared is None:
+            for subject in subjects if self.local is not None else ():
+                self.local.delete(subject)
+        elif subjects:
+            await self.shared.delete(*(self.key_prefix + s for s in subjects))
+
+    @staticmethod
+    def to_user(data: dict) -> User:
+        user = User(**data)
+        make_transient_to_detached(user)
+        return user
+
+
+user_cache = UserCache(
+    TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+    if settings.USER_CACHE_ENABLED else None,
+    shared_cache if settings.USER_CACHE_ENABLED else None,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
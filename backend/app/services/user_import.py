@@ -0,0 +1,298 @@
+# File: backend/app/services/user_import.py
+import asyncio
+import csv
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Awaitable, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SharedCache, TTLCache, shared_cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.hashing import password_hasher
+from app.models.user import User
+from app.schemas.user import UserImportError, UserImportJob, UserImportResult, UserImportRow
+from app.services.write_service import insert_ignoring_conflicts
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("email", "username", "password")
+
+
+def _check_columns(reader: csv.DictReader):
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV is missing required columns: {', '.join(missing)}",
+        )
+
+
+def _chunks(reader: csv.DictReader, size: int) -> Iterator[List[Tuple[int, Dict[str, str]]]]:
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+class UserImporter:
+    """
+    Bulk-creates users from a CSV, one chunk at a time.
+
+    Each chunk is validated, checked against existing emails/usernames in a
+    single SELECT, has its passwords hashed in parallel on the hashing pool,
+    then goes in as one batched INSERT ... ON CONFLICT DO NOTHING and is
+    committed. Memory use depends on the chunk size, not on the file size.
+    Bad rows are skipped and reported with their CSV line number.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        chunk_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        on_chunk: Optional[Callable[["UserImporter"], Awaitable[None]]] = None,
+    ):
+        self.db = db
+        self.on_chunk = on_chunk
+        self.chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+        self.max_errors = settings.USER_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.total_rows = 0
+        self.created = 0
+        self.failed = 0
+        self.last_line = 0
+        self.errors: List[UserImportError] = []
+        # Catches duplicates inside the file itself
+        self._seen_emails = set()
+        self._seen_usernames = set()
+
+    def _fail(self, line: int, email: Optional[str], error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(UserImportError(row=line, email=email, error=error))
+
+    async def run(self, csv_file: TextIO) -> UserImportResult:
+        reader = csv.DictReader(csv_file)
+        # File reads and CSV parsing happen in a thread, off the event loop
+        await asyncio.to_thread(lambda: reader.fieldnames)
+        _check_columns(reader)
+
+        chunks = _chunks(reader, self.chunk_size)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            self.total_rows += len(chunk)
+            await self._import_chunk(chunk)
+            self.last_line = chunk[-1][0]
+            if self.on_chunk is not None:
+                await self.on_chunk(self)
+
+        return UserImportResult(
+            total_rows=self.total_rows,
+            created=self.created,
+            failed=self.failed,
+            errors=self.errors,
+        )
+
+    async def _import_chunk(self, chunk: List[Tuple[int, Dict[str, str]]]):
+        rows: List[Tuple[int, UserImportRow]] = []
+        for line, raw in chunk:
+            # Empty cells fall back to the schema defaults
+            data = {key: value for key, value in raw.items() if key and value not in (None, "")}
+            try:
+                row = UserImportRow(**data)
+            except ValidationError as e:
+                self._fail(line, raw.get("email"), _describe(e))
+                continue
+            if row.email in self._seen_emails or row.username in self._seen_usernames:
+                self._fail(line, row.email, "Duplicate email or username in file")
+                continue
+            self._seen_emails.add(row.email)
+            self._seen_usernames.add(row.username)
+            rows.append((line, row))
+
+        if not rows:
+            return
+
+        result = await self.db.execute(
+            select(User.email, User.username).where(
+                or_(
+                    User.email.in_([row.email for _, row in rows]),
+                    User.username.in_([row.username for _, row in rows]),
+                )
+            )
+        )
+        taken_emails, taken_usernames = set(), set()
+        for email, username in result:
+            taken_emails.add(email)
+            taken_usernames.add(username)
+        # Nothing written yet: end the transaction so the connection goes
+        # back to the pool while bcrypt runs
+        await self.db.rollback()
+
+        new_rows = []
+        for line, row in rows:
+            if row.email in taken_emails or row.username in taken_usernames:
+                self._fail(line, row.email, "Email or Username already registered")
+            else:
+                new_rows.append((line, row))
+
+        if not new_rows:
+            return
+
+        hashes = await password_hasher.hash_many([row.password for _, row in new_rows])
+        values = [
+            {
+                "email": row.email,
+                "username": row.username,
+                "full_name": row.full_name,
+                "hashed_password": hashed_password,
+                "role": row.role,
+                "is_active": True,
+                "is_verified": row.is_verified,
+            }
+            for (_, row), hashed_password in zip(new_rows, hashes)
+        ]
+
+        # One executemany; rows that lost a race with a concurrent insert
+        # are skipped by ON CONFLICT and simply don't come back
+        stmt = insert_ignoring_conflicts(self.db, User).returning(User.email)
+        result = await self.db.execute(stmt, values)
+        inserted = set(result.scalars().all())
+        await self.db.commit()
+
+        self.created += len(inserted)
+        for line, row in new_rows:
+            if row.email not in inserted:
+                self._fail(line, row.email, "Email or Username already registered")
+
+
+async def import_users(db: AsyncSession, csv_file: TextIO, **options) -> UserImportResult:
+    return await UserImporter(db, **options).run(csv_file)
+
+
+def _spool_upload(upload: BinaryIO, max_rows: int) -> str:
+    """
+    Copy an upload to a temp file (the request's own file is gone once the
+    response is sent), checking its columns and row count on the way.
+    """
+    with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as out:
+        shutil.copyfileobj(upload, out)
+    try:
+        with open(out.name, encoding="utf-8-sig", newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            _check_columns(reader)
+            rows = sum(1 for _ in reader)
+    except (UnicodeDecodeError, csv.Error) as e:
+        os.remove(out.name)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unreadable CSV: {e}")
+    except BaseException:
+        os.remove(out.name)
+        raise
+    if rows > max_rows:
+        os.remove(out.name)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"CSV has {rows} rows; uploads are limited to {max_rows} (use scripts/import_users.py)",
+        )
+    return out.name
+
+
+class UserImportJobs:
+    """
+    CSV imports run in the background, one at a time per process.
+
+    Hashing every password takes minutes for a large file, far longer than a
+    request should stay open, so the upload is only checked and queued here
+    and the caller polls the job. The status (counts so far and the last
+    CSV line processed) is kept locally and, with a shared tier, published
+    there so any worker can answer the poll. Chunks are committed as they
+    go; a job stopped by shutdown reports where to resume.
+    """
+
+    key_prefix = "user-import:"
+
+    def __init__(self, shared: Optional[SharedCache] = None, ttl: int = 86400):
+        self.shared = shared
+        self.ttl = ttl
+        self._jobs = TTLCache(max_size=1000, ttl=ttl)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def submit(self, upload: BinaryIO) -> UserImportJob:
+        path = await asyncio.to_thread(_spool_upload, upload, settings.USER_IMPORT_MAX_ROWS)
+        job = UserImportJob(id=uuid.uuid4().hex, status="pending", total_rows=0, created=0, failed=0, errors=[])
+        await self._publish(job)
+        self._tasks[job.id] = asyncio.create_task(self._run(job, path), name=f"user-import-{job.id}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[UserImportJob]:
+        job = self._jobs.get(job_id)
+        if job is None and self.shared is not None:
+            raw = await self.shared.get(self.key_prefix + job_id)
+            if raw is not None:
+                job = UserImportJob.model_validate_json(raw)
+        return job
+
+    async def _publish(self, job: UserImportJob):
+        self._jobs.set(job.id, job)
+        if self.shared is not None:
+            await self.shared.set(self.key_prefix + job.id, job.model_dump_json().encode(), ex=self.ttl)
+
+    async def _progress(self, job: UserImportJob, importer: UserImporter):
+        job.total_rows = importer.total_rows
+        job.created = importer.created
+        job.failed = importer.failed
+        job.errors = list(importer.errors)
+        job.last_line = importer.last_line
+        await self._publish(job)
+
+    async def _run(self, job: UserImportJob, path: str):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        try:
+            async with self._lock:
+                job.status = "running"
+                await self._publish(job)
+                async with AsyncSessionLocal() as db:
+                    importer = UserImporter(db, on_chunk=lambda imp: self._progress(job, imp))
+                    with open(path, encoding="utf-8-sig", newline="") as csv_file:
+                        await importer.run(csv_file)
+                job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.detail = f"Stopped by server shutdown; re-upload the rows after line {job.last_line}"
+            raise
+        except Exception as e:
+            logger.exception("User import %s failed", job.id)
+            job.status = "failed"
+            job.detail = getattr(e, "detail", None) or str(e)
+        finally:
+            self._tasks.pop(job.id, None)
+            os.remove(path)
+            await self._publish(job)
+
+    async def stop(self):
+        """Cancel queued and running imports; their status says how far they got."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+user_import_jobs = UserImportJobs(shared_cache, ttl=settings.USER_IMPORT_JOB_TTL_SECONDS)
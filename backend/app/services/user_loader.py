@@ -0,0 +1,56 @@
+# File: backend/app/services/user_loader.py
+from typing import Any, Dict, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.dataloader import DataLoader
+from app.models.course import Course
+from app.models.user import User
+
+# Columns behind UserSummary; nothing else of the user is read for it
+SUMMARY_FIELDS = (User.id, User.username, User.full_name)
+
+
+def with_instructor():
+    """
+    Loader option for Course queries: instructors come in one extra
+    `SELECT ... WHERE id IN (...)` for the whole page.
+    """
+    return selectinload(Course.instructor).load_only(*SUMMARY_FIELDS)
+
+
+async def fetch_users(db: AsyncSession, ids: List[UUID]) -> Dict[UUID, User]:
+    result = await db.execute(select(User).options(load_only(*SUMMARY_FIELDS)).where(User.id.in_(ids)))
+    return {user.id: user for user in result.scalars()}
+
+
+def user_loader(db: AsyncSession) -> DataLoader[UUID, User]:
+    return DataLoader(lambda ids: fetch_users(db, ids))
+
+
+async def attach_instructors(loader: DataLoader[UUID, User], courses: Iterable[Any]) -> List[Any]:
+    """
+    Fill in `instructor` on courses that weren't loaded with_instructor():
+    ORM objects get the relationship set (without marking them dirty),
+    Core rows become dicts with an `instructor` key. One query for all of
+    them, none for instructors the loader already has.
+    """
+    courses = list(courses)
+    instructors = await loader.load_many(course.instructor_id for course in courses)
+    attached = []
+    for course, instructor in zip(courses, instructors):
+        if isinstance(course, Course):
+            set_committed_value(course, "instructor", instructor)
+            attached.append(course)
+        else:
+            row = dict(course._mapping)
+            row["instructor"] = (
+                {"id": instructor.id, "username": instructor.username, "full_name": instructor.full_name}
+                if instructor is not None else None
+            )
+            attached.append(row)
+    return attached
\ No newline at end of file
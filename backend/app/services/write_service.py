@@ -0,0 +1,100 @@
+# File: backend/app/services/write_service.py
+from typing import Any, Dict, Optional, Type
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Single-round-trip writes. Uniqueness is enforced by the database
+# (INSERT ... ON CONFLICT DO NOTHING / unique indexes) instead of a
+# SELECT-then-write check, and RETURNING hands back the full row so no
+# refresh() is needed after the write.
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def upsert(db: AsyncSession, model: Type[Any]):
+    """
+    Dialect INSERT supporting .on_conflict_do_update() (Postgres, SQLite).
+
+    Use `stmt.excluded` for the incoming row's values in the update.
+    """
+    dialect_insert = _DIALECT_INSERTS.get(_dialect_name(db))
+    if dialect_insert is None:
+        raise NotImplementedError(f"Upsert is not supported on {_dialect_name(db)}")
+    return dialect_insert(model)
+
+
+def insert_ignoring_conflicts(db: AsyncSession, model: Type[Any]):
+    """
+    INSERT that skips rows hitting a unique constraint (ON CONFLICT DO NOTHING).
+
+    Falls back to a plain INSERT on dialects without it; callers then get an
+    IntegrityError instead of a missing RETURNING row.
+    """
+    dialect_insert = _DIALECT_INSERTS.get(_dialect_name(db))
+    if dialect_insert is None:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+async def insert_returning(
+    db: AsyncSession,
+    model: Type[Any],
+    values: Dict[str, Any],
+    conflict_detail: str,
+):
+    """
+    INSERT a row and return it as an ORM object in one statement.
+
+    Raises a 400 with `conflict_detail` if a unique constraint is hit.
+    """
+    stmt = insert_ignoring_conflicts(db, model).values(**values)
+    try:
+        result = await db.execute(stmt.returning(model))
+        obj = result.scalars().first()
+    except IntegrityError:
+        await db.rollback()
+        obj = None
+
+    if obj is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=conflict_detail)
+    return obj
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: Type[Any],
+    where,
+    values: Dict[str, Any],
+    conflict_detail: Optional[str] = None,
+):
+    """
+    UPDATE matching rows and return the first updated row (or None).
+
+    If `conflict_detail` is given, a unique constraint violation becomes a 400.
+    """
+    stmt = (
+        update(model)
+        .where(where)
+        .values(**values)
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        result = await db.execute(stmt)
+    except IntegrityError:
+        await db.rollback()
+        if conflict_detail is None:
+            raise
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=conflict_detail)
+    return result.scalars().first()
@@ -0,0 +1,279 @@
+"""
+Latency/throughput benchmark for the auth, user, course and admin APIs.
+
+Boots `app.main:app` in-process (httpx + ASGI transport, no network noise),
+seeds N users and M courses, then drives each endpoint at a fixed
+concurrency and reports p50/p95/p99 latency, throughput and DB queries per
+request as JSON. Keep the JSON from a known-good commit and pass it as
+--compare to flag regressions.
+
+    python benchmarks/api_benchmark.py --users 1000 --courses 5000 \
+        --concurrency 20 --requests 500 --output results.json
+
+Uses SQLite (aiosqlite) by default. Point --database-url at an empty
+Postgres database to benchmark against the real thing (the schema is
+created with Alembic there, so search indexes exist). Seeding drops every
+table first, so any database other than the default throwaway SQLite file
+also needs --reset-schema.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (
+    BACKEND_DIR,
+    DEFAULT_DATABASE_URL,
+    compare_reports,
+    latency_summary,
+    run_metadata,
+    setup_environment,
+    write_report,
+)
+
+PASSWORD = "benchmark-password"
+WORDS = (
+    "python data science machine learning web development design marketing "
+    "finance statistics cloud security networks algorithms databases ai "
+    "writing music photography business leadership"
+).split()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--endpoints", default="login,me,courses,course_detail,admin_search")
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the HTTP response cache")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse data from a previous run")
+    parser.add_argument(
+        "--reset-schema", action="store_true",
+        help="allow dropping and recreating every table in --database-url before seeding",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="previous JSON report to compare p95 against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold for --compare")
+    return parser.parse_args()
+
+
+def create_schema(database_url: str):
+    """Fresh schema: Alembic on Postgres, metadata.create_all elsewhere."""
+    if not database_url.startswith("postgresql"):
+        return False
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.downgrade(config, "base")
+    command.upgrade(config, "head")
+    return True
+
+
+async def seed(n_users: int, n_courses: int, rng: random.Random, schema_ready: bool):
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine
+    from app.core.security import get_password_hash
+    from app.models.course import Course
+    from app.models.user import User
+
+    if not schema_ready:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    # bcrypt once; every seeded user shares the password
+    hashed = get_password_hash(PASSWORD)
+    users = [
+        {
+            "email": "admin@bench.example.com",
+            "username": "admin",
+            "hashed_password": hashed,
+            "full_name": "Bench Admin",
+            "role": "admin",
+            "is_active": True,
+            "is_verified": True,
+        }
+    ]
+    for i in range(n_users):
+        users.append({
+            "email": f"user{i}@bench.example.com",
+            "username": f"user{i}",
+            "hashed_password": hashed,
+            "full_name": f"Bench User {i}",
+            "role": "instructor" if i % 20 == 0 else "student",
+            "is_active": True,
+            "is_verified": True,
+        })
+
+    async with engine.begin() as conn:
+        for start in range(0, len(users), 1000):
+            await conn.execute(insert(User), users[start:start + 1000])
+        result = await conn.execute(User.__table__.select().where(User.role == "instructor"))
+        instructor_ids = [row.id for row in result]
+
+        courses = []
+        for i in range(n_courses):
+            topic = rng.sample(WORDS, 3)
+            courses.append({
+                "title": f"{' '.join(topic).title()} {i}",
+                "slug": f"course-{i}",
+                "description": " ".join(rng.choices(WORDS, k=40)),
+                "price": round(rng.uniform(0, 200), 2),
+                "is_published": i % 10 != 0,
+                "instructor_id": rng.choice(instructor_ids),
+            })
+        for start in range(0, len(courses), 1000):
+            await conn.execute(insert(Course), courses[start:start + 1000])
+
+
+class QueryCounter:
+    """Counts statements on the primary engine (and replica, if configured)."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        for engine in engines:
+            event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+async def run_endpoint(client, name, make_request, args, rng, counter):
+    async def one():
+        started = time.perf_counter()
+        response = await make_request(client, rng)
+        return time.perf_counter() - started, response.status_code
+
+    async def run(total):
+        latencies, statuses = [], {}
+        remaining = [total]
+
+        async def worker():
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                latency, code = await one()
+                latencies.append(latency)
+                statuses[code] = statuses.get(code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return latencies, statuses, time.perf_counter() - started
+
+    await run(args.warmup)
+    queries_before = counter.count
+    latencies, statuses, elapsed = await run(args.requests)
+    result = latency_summary(latencies, elapsed)
+    result["status_codes"] = {str(code): n for code, n in sorted(statuses.items())}
+    result["db_queries_per_request"] = round((counter.count - queries_before) / max(1, len(latencies)), 3)
+    print(
+        f"  {name:<15} p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+        f"p99={result['p99_ms']}ms {result['throughput_rps']} req/s "
+        f"{result['db_queries_per_request']} queries/req {result['status_codes']}"
+    )
+    return result
+
+
+async def main(args):
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import select
+
+    from app.core.config import settings
+    from app.core.database import engine, read_engine
+    from app.main import app
+    from app.models.user import User
+
+    rng = random.Random(args.seed)
+    prefix = settings.API_V1_PREFIX
+
+    if not args.skip_seed:
+        print(f"🌱 Seeding {args.users} users and {args.courses} courses...")
+        await seed(args.users, args.courses, rng, args.schema_ready)
+
+    counter = QueryCounter([e for e in (engine, read_engine) if e is not None])
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        async def login(email):
+            response = await client.post(f"{prefix}/auth/login", data={"username": email, "password": PASSWORD})
+            response.raise_for_status()
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        admin_headers = await login("admin@bench.example.com")
+        async with engine.connect() as conn:
+            instructor_rows = (await conn.execute(select(User.id).where(User.role == "instructor").order_by(User.id))).all()
+        user_headers = [await login(f"user{i}@bench.example.com") for i in range(min(args.users, 50))]
+
+        def published_slug(r):
+            # Every 10th seeded course is unpublished (404 on detail)
+            i = r.randrange(args.courses)
+            return f"course-{i if i % 10 else i + 1}"
+
+        instructor_ids = ",".join(str(row.id) for row in instructor_rows[:20])
+
+        endpoints = {
+            "login": lambda c, r: c.post(
+                f"{prefix}/auth/login",
+                data={"username": f"user{r.randrange(args.users)}@bench.example.com", "password": PASSWORD},
+            ),
+            "me": lambda c, r: c.get(f"{prefix}/users/me", headers=r.choice(user_headers)),
+            "courses": lambda c, r: c.get(f"{prefix}/courses/", params={"limit": 20}),
+            "course_detail": lambda c, r: c.get(f"{prefix}/courses/{published_slug(r)}"),
+            "users_batch": lambda c, r: c.get(f"{prefix}/users/batch", params={"ids": instructor_ids}),
+            "admin_search": lambda c, r: c.get(
+                f"{prefix}/admin/users", params={"search": f"user{r.randrange(args.users)}", "limit": 20},
+                headers=admin_headers,
+            ),
+        }
+
+        results = {}
+        print(f"🏁 Running at concurrency {args.concurrency}, {args.requests} requests per endpoint")
+        for name in args.endpoints.split(","):
+            results[name] = await run_endpoint(client, name, endpoints[name], args, rng, counter)
+
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not (args.skip_seed or args.reset_schema or args.database_url == DEFAULT_DATABASE_URL):
+        sys.exit(
+            f"Refusing to wipe {args.database_url.split(':')[0].split('+')[0]} database: seeding drops every table. "
+            "Pass --reset-schema if it's a scratch database, or --skip-seed to reuse existing data."
+        )
+    overrides = {"RESPONSE_CACHE_ENABLED": "False"} if args.no_response_cache else {}
+    setup_environment(args.database_url, **overrides)
+    args.schema_ready = False if args.skip_seed else create_schema(args.database_url)
+
+    results = asyncio.run(main(args))
+    report = {
+        "benchmark": "api",
+        "meta": run_metadata(
+            database=args.database_url.split("://")[0],
+            users=args.users,
+            courses=args.courses,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            response_cache=not args.no_response_cache,
+        ),
+        "results": results,
+    }
+    write_report(report, args.output)
+
+    if args.compare:
+        regressions = compare_reports(report, args.compare, "p95_ms", args.threshold)
+        for line in regressions:
+            print(f"⚠️  Regression: {line}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,107 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./benchmark.db"
+
+# Settings the app refuses to start without; benchmarks never send mail or
+# need real secrets, so fill in harmless values unless the caller set them
+BENCHMARK_ENV = {
+    "SECRET_KEY": "benchmark-secret",
+    "JWT_SECRET_KEY": "benchmark-jwt-secret",
+    "MAIL_USERNAME": "benchmark",
+    "MAIL_PASSWORD": "benchmark",
+    "MAIL_FROM": "benchmark@example.com",
+    "MAIL_SERVER": "localhost",
+    "EMAIL_TRANSPORT": "memory",
+    "EMAIL_WORKER_ENABLED": "False",
+}
+
+
+def setup_environment(database_url: Optional[str] = None, **overrides: str):
+    """Must run before anything under `app` is imported (settings load at import)."""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+    else:
+        os.environ.setdefault("DATABASE_URL", DEFAULT_DATABASE_URL)
+    os.environ.update(overrides)
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: Sequence[float], elapsed: float) -> dict:
+    """p50/p95/p99 (ms) and throughput for a list of per-request latencies in seconds."""
+    values = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(values),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed > 0 else None,
+        "mean_ms": ms(statistics.fmean(values)) if values else None,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1]) if values else None,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**params) -> dict:
+    return {
+        "git_revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+    }
+
+
+def write_report(report: dict, output: Optional[str]):
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        print(f"📄 Results written to {output}")
+    else:
+        print(text)
+
+
+def compare_reports(current: dict, baseline_path: str, key: str, threshold: float) -> list[str]:
+    """
+    Compare `key` (e.g. "p95_ms") per endpoint against a previous report and
+    return human-readable regressions larger than `threshold` (0.1 = 10%).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name, {}).get(key)
+        new = result.get(key)
+        if old and new and new > old * (1 + threshold):
+            regressions.append(f"{name}: {key} {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
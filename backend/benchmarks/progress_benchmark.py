@@ -0,0 +1,201 @@
+"""
+Lesson progress heartbeat ingestion: request latency and database writes.
+
+Boots `app.main:app` in-process (httpx + ASGI transport), seeds VIEWERS
+students and LESSONS lessons, and has every viewer POST a heartbeat for its
+lesson every INTERVAL seconds for DURATION seconds while the progress
+buffer flushes in the background, as it does in a worker. Reports:
+
+* heartbeats      - p50/p95/p99 latency and heartbeats/sec accepted
+* writes          - flushes, rows upserted, SQL statements issued and
+                    heartbeats per row written (the coalescing factor)
+* final_flush     - seconds to write out what was left at the end
+
+    python benchmarks/progress_benchmark.py --viewers 500 --interval 1 --duration 20 --output progress.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_DATABASE_URL, latency_summary, run_metadata, setup_environment, write_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--viewers", type=int, default=500, help="students watching at the same time")
+    parser.add_argument("--lessons", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between a viewer's heartbeats")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to keep sending")
+    parser.add_argument("--flush-seconds", type=float, default=None, help="override PROGRESS_FLUSH_SECONDS")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+
+async def seed(n_viewers: int, n_lessons: int):
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment
+    from app.models.lesson import Lesson
+    from app.models.user import User
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        users = [
+            {
+                "email": f"viewer{i}@bench.example.com",
+                "username": f"viewer{i}",
+                "hashed_password": "x",  # never logged in with; tokens are minted directly
+                "role": "instructor" if i == 0 else "student",
+                "is_active": True,
+            }
+            for i in range(n_viewers)
+        ]
+        user_rows = []
+        for start in range(0, len(users), 1000):
+            result = await conn.execute(insert(User).returning(User.id, User.email, User.role), users[start:start + 1000])
+            user_rows.extend(result.all())
+        course_id = (await conn.execute(
+            insert(Course).returning(Course.id),
+            [{"title": "Bench Course", "slug": "bench-course", "is_published": True, "instructor_id": user_rows[0].id}],
+        )).scalar()
+        lesson_ids = (await conn.execute(
+            insert(Lesson).returning(Lesson.id),
+            [{"course_id": course_id, "title": f"Lesson {i}", "position": i, "duration_seconds": 600} for i in range(n_lessons)],
+        )).scalars().all()
+        # Heartbeats are only accepted from students enrolled in the course
+        enrollments = [{"user_id": row.id, "course_id": course_id} for row in user_rows[1:]]
+        for start in range(0, len(enrollments), 1000):
+            await conn.execute(insert(Enrollment), enrollments[start:start + 1000])
+    return user_rows, lesson_ids
+
+
+async def main(args):
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from app.core.config import settings
+    from app.core.database import engine
+    from app.core.security import create_token_pair
+    from app.main import app
+    from app.services.progress_buffer import progress_buffer, progress_flushes, progress_rows_written
+
+    rng = random.Random(args.seed)
+    prefix = settings.API_V1_PREFIX
+
+    print(f"🌱 Seeding {args.viewers} viewers and {args.lessons} lessons...")
+    user_rows, lesson_ids = await seed(args.viewers, args.lessons)
+
+    class Subject:
+        def __init__(self, row):
+            self.id, self.email, self.role = row.id, row.email, row.role
+            self.token_version, self.is_active = 0, True
+
+    viewers = [
+        ({"Authorization": f"Bearer {create_token_pair(Subject(row))['access_token']}"}, rng.choice(lesson_ids))
+        for row in user_rows
+    ]
+
+    statements = [0]
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.__setitem__(0, statements[0] + 1))
+
+    latencies, statuses = [], {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        # Warm the lesson lookup cache like a worker that has been up a while
+        for headers, lesson_id in viewers[:1] + [(viewers[0][0], lesson_id) for lesson_id in lesson_ids]:
+            await client.post(f"{prefix}/lessons/{lesson_id}/progress", json={"position_seconds": 0}, headers=headers)
+        await progress_buffer.flush()
+
+        statements_before = statements[0]
+        flushes_before = sum(progress_flushes._values.values())
+        rows_before = sum(progress_rows_written._values.values())
+        progress_buffer.start()
+
+        async def viewer(headers, lesson_id, offset):
+            await asyncio.sleep(offset)  # spread viewers over the interval
+            position = 0.0
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{prefix}/lessons/{lesson_id}/progress",
+                    json={"position_seconds": position, "completed": position >= 600},
+                    headers=headers,
+                )
+                latency = time.perf_counter() - started
+                latencies.append(latency)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                position += args.interval
+                await asyncio.sleep(max(0.0, args.interval - latency))
+
+        print(f"🎬 {args.viewers} viewers, one heartbeat every {args.interval}s each, for {args.duration}s...")
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            viewer(headers, lesson_id, rng.uniform(0, args.interval)) for headers, lesson_id in viewers
+        ))
+        elapsed = time.perf_counter() - started
+
+        task, progress_buffer._task = progress_buffer._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        final_started = time.perf_counter()
+        final_rows = await progress_buffer.flush()
+        final_seconds = time.perf_counter() - final_started
+
+    rows = sum(progress_rows_written._values.values()) - rows_before
+    heartbeats = sum(n for code, n in statuses.items() if code == 202)
+    result = {
+        "heartbeats": {
+            **latency_summary(latencies, elapsed),
+            "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        },
+        "writes": {
+            "flushes": sum(progress_flushes._values.values()) - flushes_before,
+            "rows_written": rows,
+            "sql_statements": statements[0] - statements_before,
+            "heartbeats_per_row": round(heartbeats / rows, 1) if rows else None,
+        },
+        "final_flush": {"rows": final_rows, "seconds": round(final_seconds, 4)},
+    }
+    print(
+        f"  heartbeats p50={result['heartbeats']['p50_ms']}ms p95={result['heartbeats']['p95_ms']}ms "
+        f"{result['heartbeats']['throughput_rps']}/s {result['heartbeats']['status_codes']}\n"
+        f"  writes: {result['writes']['flushes']} flushes, {rows} rows, "
+        f"{result['writes']['sql_statements']} statements, {result['writes']['heartbeats_per_row']} heartbeats/row"
+    )
+    await engine.dispose()
+    return result
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    overrides = {"RESPONSE_CACHE_ENABLED": "False"}
+    if args.flush_seconds is not None:
+        overrides["PROGRESS_FLUSH_SECONDS"] = str(args.flush_seconds)
+    setup_environment(args.database_url, **overrides)
+    results = asyncio.run(main(args))
+    report = {
+        "benchmark": "progress",
+        "meta": run_metadata(
+            database=args.database_url.split("://")[0],
+            viewers=args.viewers,
+            lessons=args.lessons,
+            interval=args.interval,
+            duration=args.duration,
+            flush_seconds=args.flush_seconds,
+        ),
+        "results": results,
+    }
+    write_report(report, args.output)
@@ -0,0 +1,147 @@
+"""
+Build time, size and query latency of the semantic course index.
+
+For each catalogue size a synthetic catalogue is indexed into a temporary
+directory (no database needed), then:
+
+* build     - seconds and courses/sec to embed and write the memory-mapped index
+* query     - p50/p95/p99 of single free-text queries (embed + scan + top-k)
+* batched   - queries/sec when BATCH queries share one scan of the matrix
+* top_k     - argpartition top-k vs a full argsort over the same scores
+
+    python benchmarks/semantic_search_benchmark.py --sizes 10000,100000,1000000 --output semantic.json
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import latency_summary, run_metadata, setup_environment, write_report
+
+TOPICS = [
+    "python", "javascript", "machine learning", "deep learning", "data science", "statistics",
+    "web development", "databases", "sql", "cloud computing", "kubernetes", "security",
+    "painting", "photography", "music theory", "guitar", "marketing", "finance", "accounting",
+    "leadership", "public speaking", "writing", "spanish", "bengali", "mathematics", "physics",
+]
+LEVELS = ["Introduction to", "Beginner", "Intermediate", "Advanced", "Mastering", "Practical", "Applied"]
+WORDS = (
+    "learn build project hands on course students fundamentals techniques real world "
+    "examples exercises skills career professional guide complete modern tools theory "
+    "practice analysis design create understand explore step by step"
+).split()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated catalogue sizes")
+    parser.add_argument("--dim", type=int, default=None, help="embedding dimensions (default: SEMANTIC_INDEX_DIM)")
+    parser.add_argument("--queries", type=int, default=100, help="single queries timed per size")
+    parser.add_argument("--batch", type=int, default=64, help="queries per batched scan")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+
+def synthetic_courses(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    for course_id in range(1, n + 1):
+        topic = rng.choice(TOPICS)
+        other = rng.choice(TOPICS)
+        title = f"{rng.choice(LEVELS)} {topic.title()} {course_id}"
+        description = f"{topic} and {other}: " + " ".join(rng.choices(WORDS, k=rng.randint(12, 30)))
+        yield course_id, title, description
+
+
+def measure(n: int, args) -> dict:
+    import numpy as np
+
+    from app.core.config import settings
+    from app.services.semantic_search import SemanticIndex, top_k
+
+    directory = tempfile.mkdtemp(prefix="semantic-bench-")
+    try:
+        index = SemanticIndex(directory, args.dim or settings.SEMANTIC_INDEX_DIM)
+        rows = list(synthetic_courses(n))
+
+        started = time.perf_counter()
+        index.build(rows)
+        build_seconds = time.perf_counter() - started
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2**20
+        del rows
+
+        rng = random.Random(7)
+        texts = [f"{rng.choice(TOPICS)} {rng.choice(WORDS)}" for _ in range(args.queries)]
+        index.search(texts[0], args.k)  # warm-up: fault the pages in
+
+        latencies = []
+        for text in texts:
+            started = time.perf_counter()
+            index.search(text, args.k)
+            latencies.append(time.perf_counter() - started)
+        single = latency_summary(latencies, sum(latencies))
+
+        batch = np.stack([index.embed_query(text) for text in (texts * (args.batch // len(texts) + 1))[:args.batch]])
+        started = time.perf_counter()
+        index.search_vectors(batch, args.k)
+        batched_seconds = time.perf_counter() - started
+
+        # Same scores, two ways of picking the top k
+        snapshot = index.refresh()
+        vectors = snapshot.vectors[:snapshot.count]
+        timings = {}
+        for name, pick in (
+            ("argpartition", lambda: top_k(vectors, batch[:1], args.k)),
+            ("argsort", lambda: np.argsort(-(vectors @ batch[0]))[:args.k]),
+        ):
+            pick()
+            started = time.perf_counter()
+            for _ in range(5):
+                pick()
+            timings[name] = (time.perf_counter() - started) / 5
+
+        return {
+            "build": {"seconds": round(build_seconds, 2), "courses_per_sec": round(n / build_seconds)},
+            "index_mb": round(size_mb, 1),
+            "query": single,
+            "batched": {
+                "batch": args.batch,
+                "seconds": round(batched_seconds, 4),
+                "queries_per_sec": round(args.batch / batched_seconds, 1),
+            },
+            "top_k_ms": {name: round(seconds * 1000, 2) for name, seconds in timings.items()},
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(args) -> dict:
+    results = {}
+    for n in [int(size) for size in args.sizes.split(",")]:
+        print(f"🧠 Indexing {n} courses...")
+        result = measure(n, args)
+        results[str(n)] = result
+        print(
+            f"  {n:>8} courses: build {result['build']['seconds']}s ({result['index_mb']} MB), "
+            f"query p50={result['query']['p50_ms']}ms p95={result['query']['p95_ms']}ms, "
+            f"batched {result['batched']['queries_per_sec']} q/s, "
+            f"top-k argpartition={result['top_k_ms']['argpartition']}ms argsort={result['top_k_ms']['argsort']}ms"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    setup_environment()
+    results = main(args)
+    report = {
+        "benchmark": "semantic_search",
+        "meta": run_metadata(sizes=args.sizes, dim=args.dim, queries=args.queries, batch=args.batch, k=args.k),
+        "results": results,
+    }
+    write_report(report, args.output)
@@ -0,0 +1,168 @@
+"""
+Rows/sec of the default vs fast (FAST_JSON_RESPONSES) JSON path for course lists.
+
+Two measurements per page size:
+
+* serialize - rows already fetched; FastAPI's own response_model
+  validation + JSONResponse encoding of ORM objects, against orjson
+  encoding of Core rows (FastJSONResponse).
+* endpoint  - GET /courses/?limit=N end to end (fetch + serialize + ASGI)
+  with the setting off and on.
+
+    python benchmarks/serialization_benchmark.py --sizes 1000,10000 --output serialization.json
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import DEFAULT_DATABASE_URL, run_metadata, setup_environment, write_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per measurement (best is kept)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+
+async def seed(n_courses: int):
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine
+    from app.models.course import Course
+    from app.models.user import User
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        result = await conn.execute(
+            insert(User).returning(User.id),
+            [{"email": "instructor@bench.example.com", "username": "instructor", "hashed_password": "x", "role": "instructor"}],
+        )
+        instructor_id = result.scalar_one()
+        courses = [
+            {
+                "title": f"Benchmark Course {i}",
+                "slug": f"course-{i}",
+                "description": "A course used to benchmark JSON serialization. " * 4,
+                "price": i % 200 + 0.99,
+                "is_published": True,
+                "instructor_id": instructor_id,
+            }
+            for i in range(n_courses)
+        ]
+        for start in range(0, len(courses), 1000):
+            await conn.execute(insert(Course), courses[start:start + 1000])
+
+
+async def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def rate(rows: int, seconds: float) -> dict:
+    return {"seconds": round(seconds, 5), "rows_per_sec": round(rows / seconds)}
+
+
+async def measure_serialize(size: int, repeat: int) -> dict:
+    from typing import List
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.core.serialization import FastJSONResponse, select_response_columns
+    from app.models.course import Course
+    from app.schemas.course import CourseResponse
+
+    query = select(Course).order_by(Course.id).limit(size)
+    async with AsyncSessionLocal() as db:
+        orm_rows = (await db.execute(query)).scalars().all()
+        core_rows = (await db.execute(select_response_columns(query, Course, CourseResponse))).all()
+
+    field = create_response_field(name="benchmark_response", type_=List[CourseResponse])
+
+    async def default_path():
+        content = await serialize_response(field=field, response_content=orm_rows, is_coroutine=True)
+        return JSONResponse(content).body
+
+    async def fast_path():
+        return FastJSONResponse(core_rows).body
+
+    assert len(await default_path()) > 0 and len(await fast_path()) > 0
+    return {
+        "default": rate(size, await best_of(repeat, default_path)),
+        "fast": rate(size, await best_of(repeat, fast_path)),
+    }
+
+
+async def measure_endpoint(client, size: int, repeat: int) -> dict:
+    from app.core.config import settings
+
+    async def get_page():
+        response = await client.get(f"{settings.API_V1_PREFIX}/courses/", params={"limit": size})
+        response.raise_for_status()
+        assert len(response.json()) == size
+
+    results = {}
+    for name, enabled in (("default", False), ("fast", True)):
+        settings.FAST_JSON_RESPONSES = enabled
+        await get_page()  # warm-up
+        results[name] = rate(size, await best_of(repeat, get_page))
+    return results
+
+
+async def main(args):
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.database import engine
+    from app.main import app
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"🌱 Seeding {max(sizes)} courses...")
+    await seed(max(sizes))
+
+    results = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        for size in sizes:
+            serialize = await measure_serialize(size, args.repeat)
+            endpoint = await measure_endpoint(client, size, args.repeat)
+            results[str(size)] = {"serialize": serialize, "endpoint": endpoint}
+            for stage, numbers in (("serialize", serialize), ("endpoint", endpoint)):
+                speedup = numbers["fast"]["rows_per_sec"] / numbers["default"]["rows_per_sec"]
+                print(
+                    f"  {size:>6} rows {stage:<9} default={numbers['default']['rows_per_sec']:>9} rows/s "
+                    f"fast={numbers['fast']['rows_per_sec']:>9} rows/s  x{speedup:.1f}"
+                )
+
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Response cache off so every request actually serializes
+    setup_environment(args.database_url, RESPONSE_CACHE_ENABLED="False")
+    results = asyncio.run(main(args))
+    report = {
+        "benchmark": "serialization",
+        "meta": run_metadata(
+            database=args.database_url.split("://")[0],
+            sizes=args.sizes,
+            repeat=args.repeat,
+        ),
+        "results": results,
+    }
+    write_report(report, args.output)
@@ -0,0 +1,176 @@
+"""
+Startup cost and memory of `python -m app` for a few worker counts.
+
+For each worker count the server is launched on a free port and measured:
+
+* time_to_first_request - launch until GET /health first answers 200
+* rss / pss per process  - VmRSS and (where available) proportional set
+  size of the supervisor and each worker. PSS splits shared pages between
+  the processes sharing them, so with preload the per-worker PSS is well
+  below the RSS.
+* shutdown              - SIGTERM until the supervisor exits
+
+    python benchmarks/startup_benchmark.py --workers 1,2,4 --output startup.json
+    python benchmarks/startup_benchmark.py --workers 4 --no-preload
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import BACKEND_DIR, DEFAULT_DATABASE_URL, run_metadata, setup_environment, write_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--no-preload", dest="preload", action="store_false",
+                        help="import the app in each worker instead of once before forking")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the first 200")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+
+async def create_schema():
+    from app.core.database import Base, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode} before answering")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"no 200 from {url} within {timeout}s")
+
+
+def children_of(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # comm may contain spaces; ppid is the 2nd field after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def _read_kb(path: str, key: str):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def memory(pid: int) -> dict:
+    mb = lambda kb: round(kb / 1024, 1) if kb is not None else None
+    return {
+        "pid": pid,
+        "rss_mb": mb(_read_kb(f"/proc/{pid}/status", "VmRSS")),
+        "pss_mb": mb(_read_kb(f"/proc/{pid}/smaps_rollup", "Pss")),
+    }
+
+
+def measure(workers: int, preload: bool, timeout: float) -> dict:
+    port = free_port()
+    command = [sys.executable, "-m", "app", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    if not preload:
+        command.append("--no-preload")
+
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_until_ready(f"http://127.0.0.1:{port}/health", process, timeout)
+        # Let every worker finish its startup hooks before sampling memory
+        deadline = time.perf_counter() + timeout
+        while workers > 1 and len(children_of(process.pid)) < workers and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        time.sleep(1.0)
+        supervisor = memory(process.pid)
+        worker_memory = [memory(pid) for pid in children_of(process.pid)] if workers > 1 else []
+
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=timeout)
+        shutdown = time.perf_counter() - stopping
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+    processes = [supervisor, *worker_memory]
+    total = lambda key: round(sum(p[key] for p in processes), 1) if all(p[key] is not None for p in processes) else None
+    return {
+        "time_to_first_request_s": round(ready, 3),
+        "shutdown_s": round(shutdown, 3),
+        "exit_code": process.returncode,
+        "supervisor": supervisor,
+        "workers": worker_memory,
+        "total_rss_mb": total("rss_mb"),
+        "total_pss_mb": total("pss_mb"),
+    }
+
+
+def main(args) -> dict:
+    asyncio.run(create_schema())
+    results = {}
+    for workers in [int(n) for n in args.workers.split(",")]:
+        result = measure(workers, args.preload, args.timeout)
+        results[str(workers)] = result
+        per_worker = [w["pss_mb"] or w["rss_mb"] for w in result["workers"]] or [result["supervisor"]["rss_mb"]]
+        print(
+            f"  {workers} worker(s): first request {result['time_to_first_request_s']:.2f}s, "
+            f"total RSS {result['total_rss_mb']} MB, PSS {result['total_pss_mb']} MB, "
+            f"per worker {per_worker} MB, shutdown {result['shutdown_s']:.2f}s"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # The server subprocesses inherit this environment
+    setup_environment(args.database_url)
+    results = main(args)
+    report = {
+        "benchmark": "startup",
+        "meta": run_metadata(
+            database=args.database_url.split("://")[0],
+            workers=args.workers,
+            preload=args.preload,
+        ),
+        "results": results,
+    }
+    write_report(report, args.output)
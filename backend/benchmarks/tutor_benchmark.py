@@ -0,0 +1,232 @@
+"""
+Streaming AI tutor under concurrent load.
+
+Launches `python -m app` on a free port (so responses really stream over
+TCP), seeds one course, and for each concurrency level has that many
+clients ask questions over SSE back to back for DURATION seconds:
+
+* ttft            - p50/p95/p99 from sending the question to the first token
+* stream_tps      - tokens/sec within each answer (p50 / p5), as the client sees it
+* aggregate_tps   - tokens/sec across all clients together
+* answer          - p50/p95 of the full answer
+* rejected        - 503s once the worker's generation slots and queue are full
+
+`--slow-readers` adds clients that stop reading after the first token, to
+check they're cut off without holding up everyone else.
+
+    python benchmarks/tutor_benchmark.py --concurrency 1,4,16,64 --duration 10
+    python benchmarks/tutor_benchmark.py --max-concurrent 8 --token-delay 0.005 --output tutor.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import BACKEND_DIR, DEFAULT_DATABASE_URL, percentile, run_metadata, setup_environment, write_report
+from benchmarks.startup_benchmark import free_port, wait_until_ready
+
+QUESTIONS = [
+    "How do I merge two pandas dataframes?",
+    "What is the difference between a list and a numpy array?",
+    "Which lesson covers plotting?",
+    "Can you explain broadcasting?",
+    "How should I clean missing data?",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated numbers of clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="override TUTOR_MAX_CONCURRENT")
+    parser.add_argument("--token-delay", type=float, default=None, help="override TUTOR_STUB_TOKEN_DELAY")
+    parser.add_argument("--slow-readers", type=int, default=0, help="extra clients that stop reading mid-answer")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args()
+
+
+async def seed():
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine
+    from app.models.course import Course
+    from app.models.lesson import Lesson
+    from app.models.user import User
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        user = (await conn.execute(
+            insert(User).returning(User.id, User.email, User.role),
+            [{"email": "student@bench.example.com", "username": "student", "hashed_password": "x", "role": "student", "is_active": True}],
+        )).one()
+        course_id = (await conn.execute(insert(Course).returning(Course.id), [{
+            "title": "Python for Data Science",
+            "slug": "python-data-science",
+            "description": "Learn pandas dataframes, numpy arrays and plotting with matplotlib.",
+            "is_published": True,
+            "instructor_id": user.id,
+        }])).scalar()
+        await conn.execute(insert(Lesson), [
+            {"course_id": course_id, "title": title, "position": i}
+            for i, title in enumerate(["Numpy arrays and broadcasting", "Pandas dataframes", "Cleaning missing data", "Plotting"])
+        ])
+    await engine.dispose()
+    return user
+
+
+async def ask(client, url: str, headers: dict, question: str, stop_after: int = 0) -> dict:
+    started = time.perf_counter()
+    first = None
+    tokens = 0
+    async with client.stream("POST", url, json={"question": question}, headers=headers) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return {"status": response.status_code}
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "token":
+                if first is None:
+                    first = time.perf_counter()
+                tokens += 1
+                if stop_after and tokens >= stop_after:
+                    # Stop reading but keep the connection open
+                    await asyncio.sleep(3600)
+            elif line.startswith("data:") and event == "error":
+                return {"status": "error", "detail": json.loads(line[5:])["detail"]}
+    finished = time.perf_counter()
+    return {
+        "status": 200,
+        "ttft": first - started if first else None,
+        "answer": finished - started,
+        "tokens": tokens,
+        "tps": (tokens - 1) / (finished - first) if first and tokens > 1 and finished > first else None,
+    }
+
+
+async def run_level(base: str, headers: dict, clients: int, args) -> dict:
+    import httpx
+
+    url = f"{base}/api/v1/courses/python-data-science/tutor"
+    deadline = time.perf_counter() + args.duration
+    results = []
+
+    async def client_loop(index: int):
+        async with httpx.AsyncClient(timeout=args.timeout) as client:
+            i = index
+            while time.perf_counter() < deadline:
+                results.append(await ask(client, url, headers, QUESTIONS[i % len(QUESTIONS)]))
+                i += 1
+
+    async def slow_reader():
+        async with httpx.AsyncClient(timeout=args.timeout) as client:
+            try:
+                await asyncio.wait_for(ask(client, url, headers, QUESTIONS[0], stop_after=1), args.duration)
+            except (asyncio.TimeoutError, httpx.HTTPError):
+                pass
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client_loop(i) for i in range(clients)),
+        *(slow_reader() for _ in range(args.slow_readers)),
+    )
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if r["status"] == 200]
+    ms = lambda values, p: round(percentile(sorted(values), p) * 1000, 1) if values else None
+    ttfts = [r["ttft"] for r in ok if r["ttft"] is not None]
+    rates = sorted(r["tps"] for r in ok if r["tps"] is not None)
+    return {
+        "answers": len(ok),
+        "rejected": sum(1 for r in results if r["status"] == 503),
+        "errors": sum(1 for r in results if r["status"] not in (200, 503)),
+        "ttft_ms": {"p50": ms(ttfts, 50), "p95": ms(ttfts, 95), "p99": ms(ttfts, 99)},
+        "answer_ms": {"p50": ms([r["answer"] for r in ok], 50), "p95": ms([r["answer"] for r in ok], 95)},
+        "stream_tps": {
+            "p50": round(percentile(rates, 50), 1) if rates else None,
+            "p5": round(percentile(rates, 5), 1) if rates else None,
+        },
+        "aggregate_tps": round(sum(r["tokens"] for r in ok) / elapsed, 1),
+    }
+
+
+async def server_metrics(base: str) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        text = (await client.get(f"{base}/metrics")).text
+    return {
+        line.split(" ")[0]: float(line.split(" ")[1])
+        for line in text.splitlines()
+        if line.startswith("tutor_generations_total") or line.startswith('admission_in_flight{budget="tutor"}')
+    }
+
+
+def main(args) -> dict:
+    from app.core.security import create_token_pair
+
+    class Subject:
+        def __init__(self, row):
+            self.id, self.email, self.role = row.id, row.email, row.role
+            self.token_version, self.is_active = 0, True
+
+    user = asyncio.run(seed())
+    headers = {"Authorization": f"Bearer {create_token_pair(Subject(user))['access_token']}"}
+
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    results = {}
+    try:
+        wait_until_ready(f"{base}/health", process, args.timeout)
+        for clients in [int(n) for n in args.concurrency.split(",")]:
+            result = asyncio.run(run_level(base, headers, clients, args))
+            result["server"] = asyncio.run(server_metrics(base))
+            results[str(clients)] = result
+            print(
+                f"  {clients:>4} clients: {result['answers']} answers, {result['rejected']} rejected, "
+                f"TTFT p50={result['ttft_ms']['p50']}ms p95={result['ttft_ms']['p95']}ms, "
+                f"{result['stream_tps']['p50']} tok/s per stream, {result['aggregate_tps']} tok/s total"
+            )
+    finally:
+        process.terminate()
+        process.wait(timeout=args.timeout)
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    overrides = {"TUTOR_BACKEND": "stub"}
+    if args.max_concurrent is not None:
+        overrides["TUTOR_MAX_CONCURRENT"] = str(args.max_concurrent)
+    if args.token_delay is not None:
+        overrides["TUTOR_STUB_TOKEN_DELAY"] = str(args.token_delay)
+    # The server subprocess inherits this environment
+    setup_environment(args.database_url, **overrides)
+    print(f"🎓 Tutor benchmark, {args.duration}s per level...")
+    results = main(args)
+    report = {
+        "benchmark": "tutor",
+        "meta": run_metadata(
+            database=args.database_url.split("://")[0],
+            concurrency=args.concurrency,
+            duration=args.duration,
+            max_concurrent=args.max_concurrent,
+            token_delay=args.token_delay,
+            slow_readers=args.slow_readers,
+        ),
+        "results": results,
+    }
+    write_report(report, args.output)
@@ -0,0 +1,37 @@
+import asyncio
+import sys
+import os
+import time
+
+# পাইথন পাথ সেট করা হচ্ছে যাতে 'app' মডিউল খুঁজে পায়
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.course import Course
+from app.services.semantic_search import semantic_index
+
+# Rebuilds the semantic search index from the courses table. The API builds
+# it at startup when it's missing and appends new courses itself; run this after bulk loads,
+# after changing SEMANTIC_INDEX_DIM, or now and then so IDF weights reflect
+# the whole catalogue again. Running servers switch to the new index on
+# their next query.
+async def build_index():
+    print(f"🧠 Building semantic index in {settings.SEMANTIC_INDEX_DIR} ...")
+    started = time.perf_counter()
+    rows = []
+    async with AsyncSessionLocal() as db:
+        query = select(Course.id, Course.title, Course.description).order_by(Course.id)
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            rows.extend(tuple(row) for row in partition)
+    loaded = time.perf_counter()
+
+    await asyncio.to_thread(semantic_index.build, rows)
+    print(f"✅ Indexed {len(rows)} courses (load {loaded - started:.1f}s, build {time.perf_counter() - loaded:.1f}s)")
+
+if __name__ == "__main__":
+    asyncio.run(build_index())
\ No newline at end of file
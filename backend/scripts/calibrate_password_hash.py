@@ -0,0 +1,111 @@
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+# পাইথন পাথ সেট করা হচ্ছে যাতে 'app' মডিউল খুঁজে পায়
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.hash import argon2, bcrypt
+
+# Measures password hashing on this host and suggests the strongest cost
+# that fits a latency budget. Run it on the production hardware; the
+# suggested settings go into .env.
+#
+#   python scripts/calibrate_password_hash.py --target-ms 250
+#   python scripts/calibrate_password_hash.py --target-ms 250 --scheme argon2 --parallelism 2
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def median_ms(handler, samples: int) -> float:
+    handler.hash(SAMPLE_PASSWORD)  # warm-up
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int):
+    best = None
+    for rounds in range(10, 20):
+        elapsed = median_ms(bcrypt.using(rounds=rounds), samples)
+        print(f"   bcrypt rounds={rounds:<2} {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = (rounds, elapsed)
+    if best is None:
+        print("⚠️  Even rounds=10 is over budget; using 10 (don't go lower)")
+        best = (10, elapsed)
+    rounds, elapsed = best
+    return elapsed, [
+        "PASSWORD_HASH_SCHEME=bcrypt",
+        f"BCRYPT_ROUNDS={rounds}",
+    ]
+
+
+def calibrate_argon2(target_ms: float, samples: int, parallelism: int, max_memory_mib: int):
+    if importlib.util.find_spec("argon2") is None:
+        sys.exit("❌ argon2 needs the argon2-cffi package: pip install argon2-cffi")
+
+    # Spend the budget on memory first (what makes GPU attacks expensive),
+    # then on passes
+    best = None
+    memory_kib, time_cost = 16 * 1024, 2
+    while memory_kib <= max_memory_mib * 1024:
+        elapsed = median_ms(argon2.using(memory_cost=memory_kib, time_cost=time_cost, parallelism=parallelism), samples)
+        print(f"   argon2 m={memory_kib // 1024:>4} MiB t={time_cost} p={parallelism} {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = (memory_kib, time_cost, elapsed)
+        memory_kib *= 2
+    if best is None:
+        sys.exit("❌ Even 16 MiB / 2 passes is over budget; raise --target-ms")
+
+    memory_kib, time_cost, elapsed = best
+    while True:
+        candidate = median_ms(argon2.using(memory_cost=memory_kib, time_cost=time_cost + 1, parallelism=parallelism), samples)
+        print(f"   argon2 m={memory_kib // 1024:>4} MiB t={time_cost + 1} p={parallelism} {candidate:8.1f} ms")
+        if candidate > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+
+    return elapsed, [
+        "PASSWORD_HASH_SCHEME=argon2",
+        f"ARGON2_MEMORY_COST={memory_kib}",
+        f"ARGON2_TIME_COST={time_cost}",
+        f"ARGON2_PARALLELISM={parallelism}",
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick a password hashing cost for a latency budget")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="max time for one hash on this host")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--samples", type=int, default=5, help="hashes timed per candidate (median is used)")
+    parser.add_argument("--parallelism", type=int, default=2, help="argon2 lanes (threads) per hash")
+    parser.add_argument("--max-memory-mib", type=int, default=256, help="argon2 memory ceiling per hash")
+    parser.add_argument("--workers", type=int, default=None, help="hashing workers, for the throughput estimate")
+    args = parser.parse_args()
+
+    print(f"⏱️  Calibrating {args.scheme} for <= {args.target_ms:.0f} ms per hash ({os.cpu_count()} CPUs)")
+    if args.scheme == "bcrypt":
+        elapsed, env = calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        elapsed, env = calibrate_argon2(args.target_ms, args.samples, args.parallelism, args.max_memory_mib)
+
+    # Each login/registration costs one hash; workers beyond the core count don't add throughput
+    workers = args.workers or os.cpu_count() or 1
+    lanes = args.parallelism if args.scheme == "argon2" else 1
+    busy_cores = min(workers * lanes, os.cpu_count() or 1)
+    per_second = busy_cores / lanes / (elapsed / 1000)
+    print("--------------------------------------------------")
+    print(f"✅ {elapsed:.1f} ms per hash -> about {per_second:.0f} logins/sec with {workers} hashing worker(s)")
+    print("   Add to .env:")
+    for line in env:
+        print(f"   {line}")
+    print(f"   PASSWORD_HASH_WORKERS={min(workers, os.cpu_count() or 1)}")
+    print("--------------------------------------------------")
@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# পাইথন পাথ সেট করা হচ্ছে যাতে 'app' মডিউল খুঁজে পায়
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import AsyncSessionLocal
+from app.core.hashing import password_hasher
+from app.models.user import User
+from app.models.course import Course
+from app.services.user_import import import_users
+
+# Bulk-create users from a CSV (email, username, password[, full_name, role, is_verified]).
+# Same pipeline as POST /admin/users/import, without the upload.
+async def run_import(path: str, chunk_size: int):
+    print(f"🚀 Importing users from {path} ...")
+    # No logins to leave hashing workers for here
+    password_hasher.bulk_workers = password_hasher.workers
+    async with AsyncSessionLocal() as db:
+        with open(path, encoding="utf-8-sig", newline="") as csv_file:
+            result = await import_users(db, csv_file, chunk_size=chunk_size)
+
+    print("--------------------------------------------------")
+    print(f"✅ Created: {result.created} / {result.total_rows}")
+    print(f"❌ Failed:  {result.failed}")
+    for error in result.errors:
+        print(f"   line {error.row} ({error.email}): {error.error}")
+    print("--------------------------------------------------")
+    password_hasher.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV file")
+    parser.add_argument("csv_path")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(run_import(args.csv_path, args.chunk_size))
\ No newline at end of file
@@ -0,0 +1,23 @@
+import asyncio
+import sys
+import os
+
+# পাইথন পাথ সেট করা হচ্ছে যাতে 'app' মডিউল খুঁজে পায়
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.course import Course
+from app.services.enrollment_counter import recount
+
+# Course.enrollment_count is updated in batches from memory, so a process
+# killed mid-interval can leave it slightly off. This resets every course's
+# count from the enrollments table.
+async def run_recount():
+    print("🔢 Recounting enrollments...")
+    async with AsyncSessionLocal() as db:
+        await recount(db)
+    print("✅ Done")
+
+if __name__ == "__main__":
+    asyncio.run(run_recount())
\ No newline at end of file
@@ -0,0 +1,26 @@
+import asyncio
+import sys
+import os
+
+# পাইথন পাথ সেট করা হচ্ছে যাতে 'app' মডিউল খুঁজে পায়
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.user import User
+from app.models.course import Course
+from app.services.email_queue import email_dispatcher
+
+# Standalone outbound email worker. Run this (and set EMAIL_WORKER_ENABLED=False
+# on the API) to keep SMTP work out of the web processes entirely.
+async def run_worker():
+    print("📮 Email worker started. Press Ctrl+C to stop.")
+    email_dispatcher.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await email_dispatcher.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        print("👋 Email worker stopped.")
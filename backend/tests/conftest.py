@@ -0,0 +1,21 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Settings load when `app` is first imported; tests never send mail or need
+# real secrets, and each test builds its own database
+for key, value in {
+    "SECRET_KEY": "test-secret",
+    "JWT_SECRET_KEY": "test-jwt-secret",
+    "MAIL_USERNAME": "test",
+    "MAIL_PASSWORD": "test",
+    "MAIL_FROM": "test@example.com",
+    "MAIL_SERVER": "localhost",
+    "EMAIL_TRANSPORT": "memory",
+    "EMAIL_WORKER_ENABLED": "False",
+    "DATABASE_URL": "sqlite+aiosqlite://",
+}.items():
+    os.environ.setdefault(key, value)
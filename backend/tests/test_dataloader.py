@@ -0,0 +1,41 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.core.dataloader import DataLoader
+
+
+def test_cancelled_batch_fails_waiters_instead_of_hanging():
+    async def run():
+        async def batch_fn(keys):
+            raise asyncio.CancelledError
+
+        loader = DataLoader(batch_fn)
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(loader.load_many([1, 2]), timeout=1)
+        # Nothing stranded in the cache: the next load asks again
+        assert loader._cache == {}
+
+    asyncio.run(run())
+
+
+def test_dispatch_survives_garbage_collection_and_picks_up_late_keys():
+    async def run():
+        seen = []
+
+        async def batch_fn(keys):
+            seen.append(list(keys))
+            gc.collect()
+            await asyncio.sleep(0.01)
+            return {key: key * 10 for key in keys}
+
+        loader = DataLoader(batch_fn)
+        first = loader.load(1)
+        await asyncio.sleep(0)
+        # Queued while the first batch is in flight
+        second = loader.load(2)
+        assert await asyncio.wait_for(asyncio.gather(first, second), timeout=1) == [10, 20]
+        return seen
+
+    assert asyncio.run(run()) == [[1], [2]]
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.pagination import keyset_page, paginate_keyset
+from app.models.course import Course
+from app.models.user import User  # noqa: F401  (courses.instructor_id -> users)
+
+
+def walk(n_courses: int, limit: int, tie_ids) -> list:
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        try:
+            return await paginate(engine)
+        finally:
+            await engine.dispose()
+
+    async def paginate(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            # created_at left to the column default, as the API does
+            await conn.execute(
+                insert(Course),
+                [{"title": f"c{i}", "slug": f"c{i}", "is_published": True} for i in range(n_courses)],
+            )
+            # Several rows sharing one timestamp, like a bulk seed within a second
+            await conn.execute(
+                update(Course).where(Course.id.in_(tie_ids)).values(created_at=datetime(2026, 1, 1, 12))
+            )
+
+            pages, cursor = [], None
+            while True:
+                query = paginate_keyset(select(Course.id, Course.created_at), Course.created_at, Course.id, cursor, limit)
+                page = keyset_page((await conn.execute(query)).all(), limit)
+                pages.append([row.id for row in page["items"]])
+                cursor = page["next_cursor"]
+                if cursor is None or len(pages) > n_courses:
+                    break
+        return pages
+
+    return asyncio.run(run())
+
+
+def test_keyset_walk_visits_every_row_once_across_timestamp_ties():
+    pages = walk(n_courses=9, limit=2, tie_ids=range(1, 8))
+    seen = [course_id for page in pages for course_id in page]
+    # 3 distinct timestamps, 5 pages
+    assert len(pages) == 5
+    assert sorted(seen) == list(range(1, 10))
+    assert len(seen) == len(set(seen))
+